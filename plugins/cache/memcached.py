@@ -49,12 +49,15 @@ options:
 
 import collections
 import os
+import threading
 import time
-from multiprocessing import Lock
+import zlib
+from contextlib import contextmanager
 from itertools import chain
 
 from ansible.errors import AnsibleError
 from ansible.module_utils.common._collections_compat import MutableSet
+from ansible.module_utils.common.text.converters import to_bytes
 from ansible.plugins.cache import BaseCacheModule
 from ansible.utils.display import Display
 
@@ -86,24 +89,25 @@ class ProxyClientPool(object):
         self._num_connections = 0
         self._available_connections = collections.deque(maxlen=self.max_connections)
         self._locked_connections = set()
-        self._lock = Lock()
+        # a lock of this process only; a lock shared with the parent process could be
+        # held by a thread of the parent, and would serialize unrelated processes
+        self._lock = threading.Lock()
 
     def _check_safe(self):
         if self.pid != os.getpid():
-            with self._lock:
-                if self.pid == os.getpid():
-                    # bail out - another thread already acquired the lock
-                    return
-                self.disconnect_all()
-                self.reset()
+            # forked: the connections were opened by the parent process, and the lock
+            # may have been copied while held by another thread of the parent
+            self.disconnect_all()
+            self.reset()
 
     def get_connection(self):
         self._check_safe()
-        try:
-            connection = self._available_connections.popleft()
-        except IndexError:
-            connection = self.create_connection()
-        self._locked_connections.add(connection)
+        with self._lock:
+            try:
+                connection = self._available_connections.popleft()
+            except IndexError:
+                connection = self.create_connection()
+            self._locked_connections.add(connection)
         return connection
 
     def create_connection(self):
@@ -114,37 +118,56 @@ class ProxyClientPool(object):
 
     def release_connection(self, connection):
         self._check_safe()
-        self._locked_connections.remove(connection)
-        self._available_connections.append(connection)
+        with self._lock:
+            if connection in self._locked_connections:
+                self._locked_connections.remove(connection)
+                self._available_connections.append(connection)
+                return
+        # the connection was taken before the process forked
+        connection.disconnect_all()
 
     def disconnect_all(self):
         for conn in chain(self._available_connections, self._locked_connections):
             conn.disconnect_all()
 
+    @contextmanager
+    def reserve(self):
+        """ Hold a connection for several commands, for instance gets and cas """
+        conn = self.get_connection()
+        try:
+            yield conn
+        finally:
+            self.release_connection(conn)
+
     def __getattr__(self, name):
         def wrapped(*args, **kwargs):
             return self._proxy_client(name, *args, **kwargs)
         return wrapped
 
     def _proxy_client(self, name, *args, **kwargs):
-        conn = self.get_connection()
-
-        try:
+        with self.reserve() as conn:
             return getattr(conn, name)(*args, **kwargs)
-        finally:
-            self.release_connection(conn)
 
 
 class CacheModuleKeys(MutableSet):
     """
     A set subclass that keeps track of insertion time and persists
     the set in memcached.
+
+    The set is spread over SHARDS append-only logs, so that adding or
+    discarding a key appends one line to one log instead of rewriting the
+    whole set, and the logs stay below the item size limit of memcached.
+    Logs that grew over MAX_LOG_SIZE are compacted when the set is loaded.
     """
     PREFIX = 'ansible_cache_keys'
+    SHARDS = 16
+    MAX_LOG_SIZE = 256 * 1024
 
-    def __init__(self, cache, *args, **kwargs):
+    def __init__(self, cache, timeout=0):
         self._cache = cache
-        self._keyset = dict(*args, **kwargs)
+        self._timeout = timeout
+        self._keyset = {}
+        self.load()
 
     def __contains__(self, key):
         return key in self._keyset
@@ -155,20 +178,85 @@ class CacheModuleKeys(MutableSet):
     def __len__(self):
         return len(self._keyset)
 
+    def _shard(self, key):
+        return '%s_%d' % (self.PREFIX, zlib.crc32(to_bytes(key)) % self.SHARDS)
+
+    def _shards(self):
+        return ['%s_%d' % (self.PREFIX, i) for i in range(self.SHARDS)]
+
+    @staticmethod
+    def _replay(log, keyset):
+        # lines are '+ <timestamp> <key>' or '- <timestamp> <key>', the last one for a key wins
+        for line in log.splitlines():
+            try:
+                op, timestamp, key = line.split(' ', 2)
+                timestamp = float(timestamp)
+            except ValueError:
+                continue
+            if op == '+':
+                keyset[key] = timestamp
+            else:
+                keyset.pop(key, None)
+
+    def _expire(self, keyset):
+        if self._timeout > 0:
+            expiry_age = time.time() - self._timeout
+            for k in [k for k, t in keyset.items() if t < expiry_age]:
+                del keyset[k]
+
+    def _append(self, op, key, timestamp):
+        line = '%s %f %s\n' % (op, timestamp, key)
+        shard = self._shard(key)
+        # append fails if the log does not exist yet, and add if another process created it meanwhile
+        if not self._cache.append(shard, line) and not self._cache.add(shard, line):
+            self._cache.append(shard, line)
+
+    def _compact(self, shard):
+        with self._cache.reserve() as conn:
+            log = conn.gets(shard)
+            if not log:
+                return
+            keyset = {}
+            self._replay(log, keyset)
+            self._expire(keyset)
+            # cas fails if a line was appended since gets; the log is compacted next time then
+            conn.cas(shard, ''.join('+ %f %s\n' % (t, k) for k, t in keyset.items()))
+
+    def load(self):
+        shards = self._shards()
+        logs = self._cache.get_multi(shards + [self.PREFIX])
+        keyset = {}
+        for shard in shards:
+            log = logs.get(shard)
+            if log:
+                self._replay(log, keyset)
+                if len(log) > self.MAX_LOG_SIZE:
+                    self._compact(shard)
+
+        # migrate the keyset written as a single item by older versions
+        legacy = logs.get(self.PREFIX)
+        if isinstance(legacy, dict):
+            for key, timestamp in legacy.items():
+                if key not in keyset:
+                    keyset[key] = timestamp
+                    self._append('+', key, timestamp)
+            self._cache.delete(self.PREFIX)
+
+        self._expire(keyset)
+        self._keyset = keyset
+
     def add(self, value):
-        self._keyset[value] = time.time()
-        self._cache.set(self.PREFIX, self._keyset)
+        timestamp = time.time()
+        self._keyset[value] = timestamp
+        self._append('+', value, timestamp)
 
     def discard(self, value):
-        del self._keyset[value]
-        self._cache.set(self.PREFIX, self._keyset)
+        self._keyset.pop(value, None)
+        self._append('-', value, time.time())
 
-    def remove_by_timerange(self, s_min, s_max):
-        for k in list(self._keyset.keys()):
-            t = self._keyset[k]
-            if s_min < t < s_max:
-                del self._keyset[k]
-        self._cache.set(self.PREFIX, self._keyset)
+    def clear(self):
+        self._keyset = {}
+        self._cache.set_multi(dict.fromkeys(self._shards(), ''))
 
 
 class CacheModule(BaseCacheModule):
@@ -186,17 +274,12 @@ class CacheModule(BaseCacheModule):
             raise AnsibleError("python-memcached is required for the memcached fact cache")
 
         self._cache = {}
-        self._db = ProxyClientPool(connection, debug=0)
-        self._keys = CacheModuleKeys(self._db, self._db.get(CacheModuleKeys.PREFIX) or [])
+        self._db = ProxyClientPool(connection, debug=0, cache_cas=True)
+        self._keys = CacheModuleKeys(self._db, self._timeout)
 
     def _make_key(self, key):
         return f"{self._prefix}{key}"
 
-    def _expire_keys(self):
-        if self._timeout > 0:
-            expiry_age = time.time() - self._timeout
-            self._keys.remove_by_timerange(0, expiry_age)
-
     def get(self, key):
         if key not in self._cache:
             value = self._db.get(self._make_key(key))
@@ -216,24 +299,42 @@ class CacheModule(BaseCacheModule):
         self._keys.add(key)
 
     def keys(self):
-        self._expire_keys()
+        # pick up the keys written by other processes, and drop the expired ones
+        self._keys.load()
         return list(iter(self._keys))
 
     def contains(self, key):
-        self._expire_keys()
-        return key in self._keys
+        # the records expire in memcached, so their existence is authoritative
+        if key in self._cache:
+            return True
+        value = self._db.get(self._make_key(key))
+        if value is None:
+            return False
+        self._cache[key] = value
+        return True
 
     def delete(self, key):
-        del self._cache[key]
+        self._cache.pop(key, None)
         self._db.delete(self._make_key(key))
         self._keys.discard(key)
 
     def flush(self):
-        for key in self.keys():
-            self.delete(key)
+        keys = self.keys()
+        self._db.delete_multi(keys, key_prefix=self._prefix)
+        self._cache = {}
+        self._keys.clear()
 
     def copy(self):
-        return self._keys.copy()
+        keys = self.keys()
+        missing = [k for k in keys if k not in self._cache]
+        if missing:
+            values = self._db.get_multi(missing, key_prefix=self._prefix)
+            for key in missing:
+                if key in values:
+                    self._cache[key] = values[key]
+                else:
+                    self._keys.discard(key)
+        return {k: self._cache[k] for k in keys if k in self._cache}
 
     def __getstate__(self):
         return dict()
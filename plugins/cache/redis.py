@@ -11,8 +11,12 @@ name: redis
 short_description: Use Redis DB for cache
 description:
   - This cache uses JSON formatted, per host records saved in Redis.
+  - Alternatively, the records can be stored as minified JSON or as msgpack, optionally compressed with zlib, see O(_serializer)
+    and O(_compress). Records in any of these formats can be read whatever these options are set to.
 requirements:
   - redis>=2.4.5 (python lib)
+  - msgpack (python lib), if O(_serializer=msgpack)
+  - redis>=4.1.0 (python lib), if O(_cluster=true)
 options:
   _uri:
     description:
@@ -20,6 +24,8 @@ options:
       - The format is V(host:port:db:password), for example V(localhost:6379:0:changeme).
       - To use encryption in transit, prefix the connection with V(tls://), as in V(tls://localhost:6379:0:changeme).
       - To use redis sentinel, use separator V(;), for example V(localhost:26379;localhost:26379;0:changeme). Requires redis>=2.9.0.
+      - To use Redis Cluster, set O(_cluster=true) and give the connection information of one of the nodes. The database number
+        must be V(0).
     type: string
     required: true
     env:
@@ -55,6 +61,58 @@ options:
       - key: fact_caching_redis_sentinel
         section: defaults
     version_added: 1.3.0
+  _cluster:
+    description:
+      - Connect to a Redis Cluster.
+      - The names of the keyset and of all records are prefixed with the hash tag V({<_keyset_name>}), so that they are stored
+        in the same hash slot and can be written together.
+    type: boolean
+    default: false
+    env:
+      - name: ANSIBLE_CACHE_REDIS_CLUSTER
+    ini:
+      - key: fact_caching_redis_cluster
+        section: defaults
+    version_added: 10.5.0
+  _serializer:
+    description:
+      - How the records are encoded.
+      - V(json) is indented JSON with sorted keys, easy to read with C(redis-cli).
+      - V(compact_json) is JSON without whitespace.
+      - V(msgpack) is the binary msgpack format, which is smaller and faster to encode and decode. Requires the msgpack Python library.
+    type: string
+    choices: [json, compact_json, msgpack]
+    default: json
+    env:
+      - name: ANSIBLE_CACHE_REDIS_SERIALIZER
+    ini:
+      - key: fact_caching_redis_serializer
+        section: defaults
+    version_added: 10.5.0
+  _compress:
+    description:
+      - Compress the records with zlib.
+    type: boolean
+    default: false
+    env:
+      - name: ANSIBLE_CACHE_REDIS_COMPRESS
+    ini:
+      - key: fact_caching_redis_compress
+        section: defaults
+    version_added: 10.5.0
+  _sweep_interval:
+    description:
+      - The records expire in Redis after O(_timeout) seconds, but their names remain in the keyset until it is swept.
+      - The keyset is swept when the cached keys are listed, at most once every this many seconds.
+      - Set to V(0) to sweep the keyset every time the keys are listed.
+    type: integer
+    default: 60
+    env:
+      - name: ANSIBLE_CACHE_REDIS_SWEEP_INTERVAL
+    ini:
+      - key: fact_caching_redis_sweep_interval
+        section: defaults
+    version_added: 10.5.0
   _timeout:
     default: 86400
     type: integer
@@ -70,8 +128,10 @@ options:
 import re
 import time
 import json
+import zlib
 
 from ansible.errors import AnsibleError
+from ansible.module_utils.common.text.converters import to_text
 from ansible.parsing.ajson import AnsibleJSONEncoder, AnsibleJSONDecoder
 from ansible.plugins.cache import BaseCacheModule
 from ansible.utils.display import Display
@@ -82,8 +142,22 @@ try:
 except ImportError:
     HAS_REDIS = False
 
+try:
+    import msgpack
+    HAS_MSGPACK = True
+except ImportError:
+    HAS_MSGPACK = False
+
 display = Display()
 
+# Records that are not plain JSON start with a NUL byte, which JSON text cannot start with,
+# followed by one byte for the serializer and one for the compression
+RECORD_MARKER = b'\x00'
+SERIALIZER_MARKERS = {'compact_json': b'j', 'msgpack': b'm'}
+COMPRESSION_MARKERS = {False: b'-', True: b'z'}
+# Number of records read with a single MGET
+MGET_BATCH_SIZE = 1000
+
 
 class CacheModule(BaseCacheModule):
     """
@@ -108,9 +182,16 @@ class CacheModule(BaseCacheModule):
         self._prefix = self.get_option('_prefix')
         self._keys_set = self.get_option('_keyset_name')
         self._sentinel_service_name = self.get_option('_sentinel_service_name')
+        self._cluster = self.get_option('_cluster')
+        self._serializer = self.get_option('_serializer')
+        self._compress = self.get_option('_compress')
+        self._sweep_interval = self.get_option('_sweep_interval')
+        self._last_sweep = None
 
         if not HAS_REDIS:
             raise AnsibleError("The 'redis' python module (version 2.4.5 or newer) is required for the redis fact cache, 'pip install redis'")
+        if self._serializer == 'msgpack' and not HAS_MSGPACK:
+            raise AnsibleError("The 'msgpack' python module is required for the msgpack serializer of the redis fact cache, 'pip install msgpack'")
 
         self._cache = {}
         kw = {}
@@ -124,6 +205,13 @@ class CacheModule(BaseCacheModule):
         # redis sentinel connection
         if self._sentinel_service_name:
             self._db = self._get_sentinel_connection(uri, kw)
+        # redis cluster connection
+        elif self._cluster:
+            self._db = self._get_cluster_connection(uri, kw)
+            # keep the keyset and all records in the hash slot of the keyset
+            tag = '{%s}' % self._keys_set
+            self._prefix = tag + self._prefix
+            self._keys_set = tag + self._keys_set
         # normal connection
         else:
             connection = self._parse_connection(self.re_url_conn, uri)
@@ -138,6 +226,25 @@ class CacheModule(BaseCacheModule):
             raise AnsibleError("Unable to parse connection string")
         return match.groups()
 
+    def _get_cluster_connection(self, uri, kw):
+        """
+        get redis cluster connection details from _uri
+        """
+        try:
+            from redis.cluster import RedisCluster
+        except ImportError:
+            raise AnsibleError("The 'redis' python module (version 4.1.0 or newer) is required to use redis cluster.")
+
+        host, port, db, password = self._parse_connection(self.re_url_conn, uri)
+        if int(db) != 0:
+            raise AnsibleError('Redis cluster only supports the database 0.')
+        if host.startswith('['):
+            host = host[1:-1]
+        try:
+            return RedisCluster(host=host, port=int(port), password=password, **kw)
+        except Exception as exc:
+            raise AnsibleError(f'Could not connect to redis cluster: {exc}')
+
     def _get_sentinel_connection(self, uri, kw):
         """
         get sentinel connection details from _uri
@@ -172,6 +279,40 @@ class CacheModule(BaseCacheModule):
     def _make_key(self, key):
         return self._prefix + key
 
+    def _pipeline(self):
+        # MULTI/EXEC in a single round trip; the cluster client only pipelines without transactions,
+        # which is still a single round trip as all keys share the same hash slot
+        return self._db.pipeline(transaction=not self._cluster)
+
+    def _encode(self, value):
+        if self._serializer == 'msgpack':
+            data = msgpack.packb(value, default=AnsibleJSONEncoder().default, use_bin_type=True)
+        elif self._serializer == 'compact_json':
+            data = json.dumps(value, cls=AnsibleJSONEncoder, separators=(',', ':')).encode('utf-8')
+        else:
+            data = json.dumps(value, cls=AnsibleJSONEncoder, sort_keys=True, indent=4).encode('utf-8')
+
+        if self._compress:
+            data = zlib.compress(data)
+        elif self._serializer != 'msgpack':
+            # plain JSON, readable without a marker
+            return data
+        return RECORD_MARKER + SERIALIZER_MARKERS.get(self._serializer, b'j') + COMPRESSION_MARKERS[self._compress] + data
+
+    @staticmethod
+    def _decode(data):
+        if not data.startswith(RECORD_MARKER):
+            return json.loads(data, cls=AnsibleJSONDecoder)
+
+        serializer, compression, data = data[1:2], data[2:3], data[3:]
+        if compression == COMPRESSION_MARKERS[True]:
+            data = zlib.decompress(data)
+        if serializer == SERIALIZER_MARKERS['msgpack']:
+            if not HAS_MSGPACK:
+                raise AnsibleError("The 'msgpack' python module is required to read msgpack records from the redis fact cache, 'pip install msgpack'")
+            return msgpack.unpackb(data, raw=False, strict_map_key=False, object_hook=AnsibleJSONDecoder().object_hook)
+        return json.loads(data, cls=AnsibleJSONDecoder)
+
     def get(self, key):
 
         if key not in self._cache:
@@ -182,51 +323,73 @@ class CacheModule(BaseCacheModule):
             if value is None:
                 self.delete(key)
                 raise KeyError
-            self._cache[key] = json.loads(value, cls=AnsibleJSONDecoder)
+            self._cache[key] = self._decode(value)
 
         return self._cache.get(key)
 
     def set(self, key, value):
 
-        value2 = json.dumps(value, cls=AnsibleJSONEncoder, sort_keys=True, indent=4)
+        value2 = self._encode(value)
+        pipe = self._pipeline()
         if self._timeout > 0:  # a timeout of 0 is handled as meaning 'never expire'
-            self._db.setex(self._make_key(key), int(self._timeout), value2)
+            pipe.setex(self._make_key(key), int(self._timeout), value2)
         else:
-            self._db.set(self._make_key(key), value2)
+            pipe.set(self._make_key(key), value2)
 
         if VERSION[0] == 2:
-            self._db.zadd(self._keys_set, time.time(), key)
+            pipe.zadd(self._keys_set, time.time(), key)
         else:
-            self._db.zadd(self._keys_set, {key: time.time()})
+            pipe.zadd(self._keys_set, {key: time.time()})
+        pipe.execute()
         self._cache[key] = value
 
     def _expire_keys(self):
         if self._timeout > 0:
-            expiry_age = time.time() - self._timeout
+            now = time.time()
+            if self._last_sweep is not None and now - self._last_sweep < self._sweep_interval:
+                return
+            expiry_age = now - self._timeout
             self._db.zremrangebyscore(self._keys_set, 0, expiry_age)
+            self._last_sweep = now
 
     def keys(self):
         self._expire_keys()
-        return self._db.zrange(self._keys_set, 0, -1)
+        return [to_text(key) for key in self._db.zrange(self._keys_set, 0, -1)]
 
     def contains(self, key):
-        self._expire_keys()
-        return (self._db.zrank(self._keys_set, key) is not None)
+        # the records expire in redis, so their existence is authoritative
+        return bool(self._db.exists(self._make_key(key)))
 
     def delete(self, key):
-        if key in self._cache:
-            del self._cache[key]
-        self._db.delete(self._make_key(key))
-        self._db.zrem(self._keys_set, key)
+        self._delete([key])
+
+    def _delete(self, keys):
+        if not keys:
+            return
+        pipe = self._pipeline()
+        for key in keys:
+            self._cache.pop(key, None)
+            pipe.delete(self._make_key(key))
+        pipe.zrem(self._keys_set, *keys)
+        pipe.execute()
 
     def flush(self):
-        for key in list(self.keys()):
-            self.delete(key)
+        self._delete(self.keys())
 
     def copy(self):
-        # TODO: there is probably a better way to do this in redis
-        ret = {k: self.get(k) for k in self.keys()}
-        return ret
+        keys = self.keys()
+        missing = [k for k in keys if k not in self._cache]
+        for i in range(0, len(missing), MGET_BATCH_SIZE):
+            batch = missing[i:i + MGET_BATCH_SIZE]
+            values = self._db.mget([self._make_key(k) for k in batch])
+            expired = []
+            for key, value in zip(batch, values):
+                if value is None:
+                    expired.append(key)
+                else:
+                    self._cache[key] = self._decode(value)
+            self._delete(expired)
+        return {k: self._cache[k] for k in keys if k in self._cache}
 
     def __getstate__(self):
         return dict()
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2025 Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+from __future__ import annotations
+
+DOCUMENTATION = r"""
+author: agent (!UNKNOWN)
+name: sqlite
+short_description: Use a SQLite database for cache
+version_added: 10.5.0
+description:
+  - This cache uses JSON formatted, per host records saved in a single local SQLite database.
+  - The database is opened in write-ahead logging mode and read through a memory map, so that reading the facts of many
+    hosts does not require to open, read and parse one file per host, and so that several C(ansible-playbook) processes
+    can read the database while another one writes to it.
+  - Expired records are skipped when reading, and deleted using an index on their timestamp when the keys are listed.
+options:
+  _uri:
+    required: true
+    description:
+      - Path of the SQLite database file. It is created if it does not exist.
+    env:
+      - name: ANSIBLE_CACHE_PLUGIN_CONNECTION
+    ini:
+      - key: fact_caching_connection
+        section: defaults
+    type: path
+  _prefix:
+    description:
+      - User defined prefix to use when storing the records.
+      - Several caches with different prefixes can share the same database.
+    default: ansible_facts
+    env:
+      - name: ANSIBLE_CACHE_PLUGIN_PREFIX
+    ini:
+      - key: fact_caching_prefix
+        section: defaults
+    type: string
+  _timeout:
+    default: 86400
+    description: Expiration timeout in seconds for the cache plugin data. Set to 0 to never expire.
+    env:
+      - name: ANSIBLE_CACHE_PLUGIN_TIMEOUT
+    ini:
+      - key: fact_caching_timeout
+        section: defaults
+    type: float
+"""
+
+import json
+import os
+import sqlite3
+import time
+
+from ansible.errors import AnsibleError
+from ansible.module_utils.common.text.converters import to_native
+from ansible.parsing.ajson import AnsibleJSONEncoder, AnsibleJSONDecoder
+from ansible.plugins.cache import BaseCacheModule
+
+
+class CacheModule(BaseCacheModule):
+    """
+    A caching module backed by a SQLite database.
+
+    Each process opens its own connection, since SQLite connections must not be
+    used across a fork.
+    """
+    # how long to wait for another process holding the write lock
+    BUSY_TIMEOUT = 30
+    # how much of the database file is read through a memory map
+    MMAP_SIZE = 256 * 1024 * 1024
+
+    def __init__(self, *args, **kwargs):
+        super(CacheModule, self).__init__(*args, **kwargs)
+        self._path = self.get_option('_uri')
+        self._prefix = self.get_option('_prefix')
+        self._timeout = float(self.get_option('_timeout'))
+
+        self._cache = {}
+        self._pid = None
+        self._db = None
+        self._connection()
+
+    def _connection(self):
+        if self._db is not None and self._pid == os.getpid():
+            return self._db
+
+        try:
+            db = sqlite3.connect(self._path, timeout=self.BUSY_TIMEOUT, isolation_level=None)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            db.execute('PRAGMA mmap_size=%d' % self.MMAP_SIZE)
+            db.execute('CREATE TABLE IF NOT EXISTS cache ('
+                       'prefix TEXT NOT NULL, key TEXT NOT NULL, timestamp REAL NOT NULL, value TEXT NOT NULL, '
+                       'PRIMARY KEY (prefix, key))')
+            db.execute('CREATE INDEX IF NOT EXISTS cache_timestamp ON cache (prefix, timestamp)')
+        except sqlite3.Error as e:
+            raise AnsibleError("Error while opening the cache database %s: %s" % (self._path, to_native(e)))
+
+        # a connection inherited from the parent process is dropped without being closed,
+        # closing it could discard the locks of the parent
+        self._db = db
+        self._pid = os.getpid()
+        return db
+
+    def _expiry_age(self):
+        if self._timeout > 0:
+            return time.time() - self._timeout
+        return 0
+
+    def _execute(self, query, *params):
+        try:
+            return self._connection().execute(query, params)
+        except sqlite3.Error as e:
+            raise AnsibleError("Error while accessing the cache database %s: %s" % (self._path, to_native(e)))
+
+    def get(self, key):
+        if key not in self._cache:
+            row = self._execute('SELECT value FROM cache WHERE prefix = ? AND key = ? AND timestamp >= ?',
+                                self._prefix, key, self._expiry_age()).fetchone()
+            if row is None:
+                raise KeyError
+            self._cache[key] = json.loads(row[0], cls=AnsibleJSONDecoder)
+
+        return self._cache.get(key)
+
+    def set(self, key, value):
+        data = json.dumps(value, cls=AnsibleJSONEncoder, separators=(',', ':'))
+        self._execute('INSERT OR REPLACE INTO cache (prefix, key, timestamp, value) VALUES (?, ?, ?, ?)',
+                      self._prefix, key, time.time(), data)
+        self._cache[key] = value
+
+    def _expire_keys(self):
+        if self._timeout > 0:
+            self._execute('DELETE FROM cache WHERE prefix = ? AND timestamp < ?', self._prefix, self._expiry_age())
+
+    def keys(self):
+        self._expire_keys()
+        return [row[0] for row in self._execute('SELECT key FROM cache WHERE prefix = ?', self._prefix)]
+
+    def contains(self, key):
+        if key in self._cache:
+            return True
+        row = self._execute('SELECT 1 FROM cache WHERE prefix = ? AND key = ? AND timestamp >= ?',
+                            self._prefix, key, self._expiry_age()).fetchone()
+        return row is not None
+
+    def delete(self, key):
+        self._cache.pop(key, None)
+        self._execute('DELETE FROM cache WHERE prefix = ? AND key = ?', self._prefix, key)
+
+    def flush(self):
+        self._cache = {}
+        self._execute('DELETE FROM cache WHERE prefix = ?', self._prefix)
+
+    def copy(self):
+        self._expire_keys()
+        # read all the records in a single query, and only decode those not read yet
+        ret = dict()
+        for key, data in self._execute('SELECT key, value FROM cache WHERE prefix = ?', self._prefix):
+            if key not in self._cache:
+                self._cache[key] = json.loads(data, cls=AnsibleJSONDecoder)
+            ret[key] = self._cache[key]
+        return ret
+
+    def __getstate__(self):
+        return dict()
+
+    def __setstate__(self, data):
+        self.__init__()
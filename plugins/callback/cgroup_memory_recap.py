@@ -21,10 +21,14 @@ notes:
   - Requires ansible to be run from within a C(cgroup), such as with C(cgexec -g memory:ansible_profile ansible-playbook ...).
   - This C(cgroup) should only be used by Ansible to get accurate results.
   - To create the C(cgroup), first use a command such as C(sudo cgcreate -a ec2-user:ec2-user -t ec2-user:ec2-user -g memory:ansible_profile).
+  - Both cgroup v1 and cgroup v2 are supported. With cgroup v2, the C(memory.peak) file can only be reset on Linux 6.12 or newer.
+    On older kernels, the execution maximum includes the memory used before the playbook started.
 options:
   max_mem_file:
     required: true
-    description: Path to cgroups C(memory.max_usage_in_bytes) file. Example V(/sys/fs/cgroup/memory/ansible_profile/memory.max_usage_in_bytes).
+    description:
+      - Path to cgroups C(memory.max_usage_in_bytes) file. Example V(/sys/fs/cgroup/memory/ansible_profile/memory.max_usage_in_bytes).
+      - For cgroup v2, the path to the C(memory.peak) file. Example V(/sys/fs/cgroup/ansible_profile/memory.peak).
     type: str
     env:
       - name: CGROUP_MAX_MEM_FILE
@@ -33,36 +37,164 @@ options:
         key: max_mem_file
   cur_mem_file:
     required: true
-    description: Path to C(memory.usage_in_bytes) file. Example V(/sys/fs/cgroup/memory/ansible_profile/memory.usage_in_bytes).
+    description:
+      - Path to C(memory.usage_in_bytes) file. Example V(/sys/fs/cgroup/memory/ansible_profile/memory.usage_in_bytes).
+      - For cgroup v2, the path to the C(memory.current) file. Example V(/sys/fs/cgroup/ansible_profile/memory.current).
     type: str
     env:
       - name: CGROUP_CUR_MEM_FILE
     ini:
       - section: callback_cgroupmemrecap
         key: cur_mem_file
+  pressure_file:
+    description:
+      - Path to the cgroup v2 C(memory.pressure) file. Example V(/sys/fs/cgroup/ansible_profile/memory.pressure).
+      - If set, the time the processes of the cgroup were stalled waiting for memory is recorded for every task.
+    type: str
+    env:
+      - name: CGROUP_PRESSURE_FILE
+    ini:
+      - section: callback_cgroupmemrecap
+        key: pressure_file
+    version_added: 10.5.0
+  interval:
+    description:
+      - Number of seconds between two samples of the current memory usage.
+    type: float
+    default: 0.001
+    env:
+      - name: CGROUP_SAMPLE_INTERVAL
+    ini:
+      - section: callback_cgroupmemrecap
+        key: interval
+    version_added: 10.5.0
+  per_host:
+    description:
+      - Whether to display, for every host, the highest task maximum that was reached while a task was running for that host.
+    type: bool
+    default: false
+    env:
+      - name: CGROUP_PER_HOST
+    ini:
+      - section: callback_cgroupmemrecap
+        key: per_host
+    version_added: 10.5.0
+  timeline_file:
+    description:
+      - Path to a file the per-task memory timeline is written to at the end of the playbook.
+      - Every task is recorded with its start and end time, the minimum, maximum and mean memory usage, the number of samples,
+        the memory pressure stall time, and the hosts that were running when the maximum was reached.
+    type: path
+    env:
+      - name: CGROUP_TIMELINE_FILE
+    ini:
+      - section: callback_cgroupmemrecap
+        key: timeline_file
+    version_added: 10.5.0
+  timeline_format:
+    description:
+      - Format of O(timeline_file).
+    type: str
+    choices: [json, csv]
+    default: json
+    env:
+      - name: CGROUP_TIMELINE_FORMAT
+    ini:
+      - section: callback_cgroupmemrecap
+        key: timeline_format
+    version_added: 10.5.0
 """
 
+import csv
+import json
+import os
 import time
 import threading
 
 from ansible.plugins.callback import CallbackBase
 
 
+def read_int(fd):
+    """Read an integer from the start of an open cgroup file"""
+    return int(os.pread(fd, 64, 0).strip())
+
+
+def read_pressure_stall(path):
+    """Return the total time in microseconds some processes were stalled, from a PSI file"""
+    with open(path) as f:
+        for line in f:
+            fields = line.split()
+            if fields and fields[0] == 'some':
+                for field in fields[1:]:
+                    key, value = field.split('=', 1)
+                    if key == 'total':
+                        return int(value)
+    return 0
+
+
 class MemProf(threading.Thread):
     """Python thread for recording memory usage"""
-    def __init__(self, path, obj=None):
+    def __init__(self, path, obj=None, interval=0.001, pressure_path=None):
         threading.Thread.__init__(self)
+        self.daemon = True
         self.obj = obj
         self.path = path
-        self.results = []
+        self.interval = interval
+        self.pressure_path = pressure_path
         self.running = True
+        self.lock = threading.Lock()
+        self.active_hosts = set()
+
+        self.start_time = time.time()
+        self.end_time = None
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        self.max_hosts = ()
+        self.pressure = None
+        self._pressure_start = read_pressure_stall(pressure_path) if pressure_path else None
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def record(self, value):
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+            with self.lock:
+                self.max_hosts = tuple(sorted(self.active_hosts))
+
+    def add_host(self, host):
+        with self.lock:
+            self.active_hosts.add(host)
+
+    def remove_host(self, host):
+        with self.lock:
+            self.active_hosts.discard(host)
 
     def run(self):
-        while self.running:
-            with open(self.path) as f:
-                val = f.read()
-            self.results.append(int(val.strip()) / 1024 / 1024)
-            time.sleep(0.001)
+        fd = os.open(self.path, os.O_RDONLY)
+        try:
+            # always take at least one sample, even if the thread is stopped right away
+            while True:
+                self.record(read_int(fd) / 1024 / 1024)
+                if not self.running:
+                    break
+                time.sleep(self.interval)
+        finally:
+            os.close(fd)
+
+    def stop(self):
+        self.running = False
+        self.join()
+        self.end_time = time.time()
+        if self.pressure_path:
+            self.pressure = read_pressure_stall(self.pressure_path) - self._pressure_start
 
 
 class CallbackModule(CallbackBase):
@@ -75,6 +207,7 @@ class CallbackModule(CallbackBase):
         super(CallbackModule, self).__init__(display)
 
         self._task_memprof = None
+        self._max_fd = None
 
         self.task_results = []
 
@@ -83,38 +216,106 @@ class CallbackModule(CallbackBase):
 
         self.cgroup_max_file = self.get_option('max_mem_file')
         self.cgroup_current_file = self.get_option('cur_mem_file')
+        self.cgroup_pressure_file = self.get_option('pressure_file')
+        self.interval = self.get_option('interval')
+        self.per_host = self.get_option('per_host')
+        self.timeline_file = self.get_option('timeline_file')
+        self.timeline_format = self.get_option('timeline_format')
 
-        with open(self.cgroup_max_file, 'w+') as f:
-            f.write('0')
+        # cgroup v2 only resets memory.peak for reads through the file descriptor that was written to
+        try:
+            self._max_fd = os.open(self.cgroup_max_file, os.O_RDWR)
+            os.write(self._max_fd, b'0')
+        except OSError as e:
+            # memory.peak is read-only before Linux 6.12
+            self._display.warning(f'Could not reset {self.cgroup_max_file}, the execution maximum can include earlier memory usage: {e}')
+            if self._max_fd is None:
+                self._max_fd = os.open(self.cgroup_max_file, os.O_RDONLY)
 
     def _profile_memory(self, obj=None):
-        prev_task = None
-        results = None
-        try:
-            self._task_memprof.running = False
-            results = self._task_memprof.results
-            prev_task = self._task_memprof.obj
-        except AttributeError:
-            pass
+        prev_memprof = self._task_memprof
+        self._task_memprof = None
+
+        if prev_memprof is not None:
+            prev_memprof.stop()
+            self.task_results.append((prev_memprof.obj, prev_memprof))
 
         if obj is not None:
-            self._task_memprof = MemProf(self.cgroup_current_file, obj=obj)
+            self._task_memprof = MemProf(self.cgroup_current_file, obj=obj, interval=self.interval, pressure_path=self.cgroup_pressure_file)
             self._task_memprof.start()
 
-        if results is not None:
-            self.task_results.append((prev_task, max(results)))
+    def _host_done(self, result):
+        if self._task_memprof is not None:
+            self._task_memprof.remove_host(result._host.get_name())
 
     def v2_playbook_on_task_start(self, task, is_conditional):
         self._profile_memory(task)
 
+    def v2_runner_on_start(self, host, task):
+        if self._task_memprof is not None:
+            self._task_memprof.add_host(host.get_name())
+
+    def v2_runner_on_ok(self, result):
+        self._host_done(result)
+
+    def v2_runner_on_failed(self, result, ignore_errors=False):
+        self._host_done(result)
+
+    def v2_runner_on_skipped(self, result):
+        self._host_done(result)
+
+    def v2_runner_on_unreachable(self, result):
+        self._host_done(result)
+
+    def _write_timeline(self):
+        rows = []
+        for task, memprof in self.task_results:
+            rows.append({
+                'task': task.get_name(),
+                'uuid': task._uuid,
+                'start': memprof.start_time,
+                'end': memprof.end_time,
+                'min_mb': memprof.min,
+                'max_mb': memprof.max,
+                'mean_mb': memprof.mean,
+                'samples': memprof.count,
+                'pressure_stall_us': memprof.pressure,
+                'max_hosts': list(memprof.max_hosts),
+            })
+
+        with open(self.timeline_file, 'w') as f:
+            if self.timeline_format == 'csv':
+                writer = csv.DictWriter(f, fieldnames=['task', 'uuid', 'start', 'end', 'min_mb', 'max_mb', 'mean_mb', 'samples',
+                                                       'pressure_stall_us', 'max_hosts'])
+                writer.writeheader()
+                for row in rows:
+                    row['max_hosts'] = ' '.join(row['max_hosts'])
+                    writer.writerow(row)
+            else:
+                json.dump({'tasks': rows}, f, indent=2)
+
     def v2_playbook_on_stats(self, stats):
         self._profile_memory()
 
-        with open(self.cgroup_max_file) as f:
-            max_results = int(f.read().strip()) / 1024 / 1024
+        max_results = read_int(self._max_fd) / 1024 / 1024
+        os.close(self._max_fd)
 
         self._display.banner('CGROUP MEMORY RECAP')
         self._display.display(f'Execution Maximum: {max_results:0.2f}MB\n\n')
 
-        for task, memory in self.task_results:
-            self._display.display(f'{task.get_name()} ({task._uuid}): {memory:0.2f}MB')
+        host_results = {}
+        for task, memprof in self.task_results:
+            line = f'{task.get_name()} ({task._uuid}): {memprof.max:0.2f}MB'
+            if memprof.pressure is not None:
+                line = f'{line} (memory pressure stall: {memprof.pressure / 1000:0.2f}ms)'
+            self._display.display(line)
+            for host in memprof.max_hosts:
+                host_results[host] = max(host_results.get(host, 0), memprof.max)
+
+        if self.per_host and host_results:
+            self._display.display('\n')
+            for host, memory in sorted(host_results.items()):
+                self._display.display(f'{host}: {memory:0.2f}MB')
+
+        if self.timeline_file:
+            self._write_timeline()
@@ -594,6 +594,22 @@ options:
     vars:
       - name: ansible_callback_diy_playbook_on_setup_msg_color
     type: str
+
+  skip_vars_without_msg:
+    description:
+      - Pass events whose C(msg) option is not set on to the default callback without merging the variables, which saves
+        a variable merge per event when only some events have a custom message.
+      - A C(msg) option set through its variable is then only detected when the variable is an extra variable, a play, block,
+        or task variable, or an inventory variable. When it comes from another source, for example a C(vars_files) file,
+        a C(group_vars) directory, or C(set_fact), the option also has to be set in the configuration file or in the environment.
+    ini:
+      - section: callback_diy
+        key: skip_vars_without_msg
+    env:
+      - name: ANSIBLE_CALLBACK_DIY_SKIP_VARS_WITHOUT_MSG
+    type: bool
+    default: false
+    version_added: 10.5.0
 """
 
 EXAMPLES = r"""
@@ -780,10 +796,12 @@ playbook.yml: >-
 
 import sys
 from contextlib import contextmanager
+from functools import partial
 from ansible.template import Templar
 from ansible.vars.manager import VariableManager
 from ansible.plugins.callback.default import CallbackModule as Default
 from ansible.module_utils.common.text.converters import to_text
+from ansible.module_utils.common._collections_compat import Mapping
 
 
 class DummyStdout(object):
@@ -797,6 +815,55 @@ class DummyStdout(object):
         pass
 
 
+class CallbackDIYDict(dict):
+    def __deepcopy__(self, memo):
+        return self
+
+
+class LazyAttributeDict(Mapping):
+    """
+    Read-only mapping that looks up each value on first access and remembers it.
+
+    ``attributes`` is either the list of keys, or a callable returning it, so that
+    expensive filtering of the keys is only done when the mapping is iterated.
+    """
+    def __init__(self, getter, attributes):
+        self._getter = getter
+        self._attributes = attributes
+        self._extra = {}
+        self._values = {}
+
+    def add(self, key, getter):
+        self._extra[key] = getter
+
+    def _keys(self):
+        if callable(self._attributes):
+            self._attributes = self._attributes()
+        return list(self._attributes) + [key for key in self._extra if key not in self._attributes]
+
+    def __getitem__(self, key):
+        if key not in self._values:
+            if key in self._extra:
+                self._values[key] = self._extra[key]()
+            elif key in self._keys():
+                self._values[key] = self._getter(key)
+            else:
+                raise KeyError(key)
+        return self._values[key]
+
+    def __iter__(self):
+        return iter(self._keys())
+
+    def __len__(self):
+        return len(self._keys())
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    def __deepcopy__(self, memo):
+        return self
+
+
 class CallbackModule(Default):
     """
     Callback plugin that allows you to supply your own custom callback templates to be output.
@@ -807,6 +874,16 @@ class CallbackModule(Default):
 
     DIY_NS = 'ansible_callback_diy'
 
+    def __init__(self):
+        super(CallbackModule, self).__init__()
+
+        self._diy_variable_manager = None
+        self._diy_vars_cache = {}
+        self._diy_spec = None
+        self._diy_play = None
+        self._diy_task = None
+        self._diy_host = None
+
     @contextmanager
     def _suppress_stdout(self, enabled):
         saved_stdout = sys.stdout
@@ -821,7 +898,14 @@ class CallbackModule(Default):
         _callback_type = (_calling_method[3:] if _calling_method[:3] == "v2_" else _calling_method)
         _callback_options = ['msg', 'msg_color']
 
+        _ret.update({'vars': variables})
+
         for option in _callback_options:
+            if option != 'msg' and not self._using_diy(spec=_ret):
+                # nothing is displayed for this event, so skip templating the remaining options
+                _ret.update({option: None})
+                continue
+
             _option_name = f'{_callback_type}_{option}'
             _option_template = variables.get(
                 f"{self.DIY_NS}_{_option_name}",
@@ -833,10 +917,40 @@ class CallbackModule(Default):
                 variables=variables
             )})
 
-        _ret.update({'vars': variables})
-
         return _ret
 
+    def _msg_unset(self, task=None, host=None):
+        """
+        Return whether the message option of the calling event is neither configured nor set
+        in the extra, play, task, or inventory variables, so that the event can be passed on
+        to the default callback without merging the variables. Always False unless the
+        skip_vars_without_msg option is enabled.
+        """
+        _calling_method = sys._getframe(1).f_code.co_name
+        _callback_type = (_calling_method[3:] if _calling_method[:3] == "v2_" else _calling_method)
+        _option_name = f'{_callback_type}_msg'
+
+        if not self.get_option('skip_vars_without_msg'):
+            return False
+        if self.get_option(_option_name) is not None or self._diy_play is None:
+            return False
+
+        _var_name = f'{self.DIY_NS}_{_option_name}'
+        _sources = [self._diy_play.get_variable_manager().extra_vars, self._diy_play.get_vars()]
+        if task is not None:
+            _sources.append(task.get_vars())
+        if host is not None:
+            _sources.append(host.get_vars())
+            _sources.extend(group.get_vars() for group in host.get_groups())
+
+        return not any(_var_name in _source for _source in _sources)
+
+    def _previous_vars(self):
+        # the previous event did not merge the variables since it had no message
+        if self._diy_spec is None:
+            return self._get_vars(playbook=self._diy_playbook, play=self._diy_play)
+        return self._diy_spec['vars']
+
     def _using_diy(self, spec):
         return (spec['msg'] is not None) and (spec['msg'] != spec['vars']['omit'])
 
@@ -858,7 +972,7 @@ class CallbackModule(Default):
             self._display.display(msg=_msg, color=spec['msg_color'], stderr=stderr)
 
     def _get_vars(self, playbook, play=None, host=None, task=None, included_file=None,
-                  handler=None, result=None, stats=None, remove_attr_ref_loop=True):
+                  handler=None, result=None, stats=None, remove_attr_ref_loop=True, use_cache=False):
         def _get_value(obj, attr=None, method=None):
             if attr:
                 return getattr(obj, attr, getattr(obj, f"_{attr}", None))
@@ -877,33 +991,32 @@ class CallbackModule(Default):
 
             return attributes
 
-        class CallbackDIYDict(dict):
-            def __deepcopy__(self, memo):
-                return self
+        def _lazy_attributes(obj, attributes, remove_loop_refs=False):
+            if remove_loop_refs:
+                return LazyAttributeDict(
+                    lambda attr: _get_value(obj=obj, attr=attr),
+                    lambda: _remove_attr_ref_loop(obj=obj, attributes=attributes)
+                )
+            return LazyAttributeDict(lambda attr: _get_value(obj=obj, attr=attr), attributes)
 
         _ret = {}
 
-        _variable_manager = VariableManager(loader=playbook.get_loader())
-
-        _all = _variable_manager.get_vars()
         if play:
-            _all = play.get_variable_manager().get_vars(
-                play=play,
-                host=(host if host else getattr(result, '_host', None)),
-                task=(handler if handler else task)
-            )
+            _host = (host if host else getattr(result, '_host', None))
+            _task = (handler if handler else task)
+            _all = self._get_play_vars(play=play, host=_host, task=_task, use_cache=use_cache)
+        else:
+            if self._diy_variable_manager is None:
+                self._diy_variable_manager = VariableManager(loader=playbook.get_loader())
+            _all = self._diy_variable_manager.get_vars()
         _ret.update(_all)
 
         _ret.update(_ret.get(self.DIY_NS, {self.DIY_NS: CallbackDIYDict()}))
 
-        _ret[self.DIY_NS].update({'playbook': {}})
         _playbook_attributes = ['entries', 'file_name', 'basedir']
-
-        for attr in _playbook_attributes:
-            _ret[self.DIY_NS]['playbook'].update({attr: _get_value(obj=playbook, attr=attr)})
+        _ret[self.DIY_NS].update({'playbook': _lazy_attributes(playbook, _playbook_attributes)})
 
         if play:
-            _ret[self.DIY_NS].update({'play': {}})
             _play_attributes = ['any_errors_fatal', 'become', 'become_flags', 'become_method',
                                 'become_user', 'check_mode', 'collections', 'connection',
                                 'debugger', 'diff', 'environment', 'fact_path', 'finalized',
@@ -916,18 +1029,14 @@ class CallbackModule(Default):
                                 'skip_tags', 'squashed', 'strategy', 'tags', 'tasks', 'uuid',
                                 'validated', 'vars_files', 'vars_prompt']
 
-            for attr in _play_attributes:
-                _ret[self.DIY_NS]['play'].update({attr: _get_value(obj=play, attr=attr)})
+            _ret[self.DIY_NS].update({'play': _lazy_attributes(play, _play_attributes)})
 
         if host:
-            _ret[self.DIY_NS].update({'host': {}})
             _host_attributes = ['name', 'uuid', 'address', 'implicit']
 
-            for attr in _host_attributes:
-                _ret[self.DIY_NS]['host'].update({attr: _get_value(obj=host, attr=attr)})
+            _ret[self.DIY_NS].update({'host': _lazy_attributes(host, _host_attributes)})
 
         if task:
-            _ret[self.DIY_NS].update({'task': {}})
             _task_attributes = ['action', 'any_errors_fatal', 'args', 'async', 'async_val',
                                 'become', 'become_flags', 'become_method', 'become_user',
                                 'changed_when', 'check_mode', 'collections', 'connection',
@@ -941,24 +1050,18 @@ class CallbackModule(Default):
 
             # remove arguments that reference a loop var because they cause templating issues in
             # callbacks that do not have the loop context(e.g. playbook_on_task_start)
-            if task.loop and remove_attr_ref_loop:
-                _task_attributes = _remove_attr_ref_loop(obj=task, attributes=_task_attributes)
-
-            for attr in _task_attributes:
-                _ret[self.DIY_NS]['task'].update({attr: _get_value(obj=task, attr=attr)})
+            _ret[self.DIY_NS].update({'task': _lazy_attributes(
+                task,
+                _task_attributes,
+                remove_loop_refs=(task.loop and remove_attr_ref_loop)
+            )})
 
         if included_file:
-            _ret[self.DIY_NS].update({'included_file': {}})
             _included_file_attributes = ['args', 'filename', 'hosts', 'is_role', 'task']
 
-            for attr in _included_file_attributes:
-                _ret[self.DIY_NS]['included_file'].update({attr: _get_value(
-                    obj=included_file,
-                    attr=attr
-                )})
+            _ret[self.DIY_NS].update({'included_file': _lazy_attributes(included_file, _included_file_attributes)})
 
         if handler:
-            _ret[self.DIY_NS].update({'handler': {}})
             _handler_attributes = ['action', 'any_errors_fatal', 'args', 'async', 'async_val',
                                    'become', 'become_flags', 'become_method', 'become_user',
                                    'changed_when', 'check_mode', 'collections', 'connection',
@@ -971,47 +1074,74 @@ class CallbackModule(Default):
                                    'squashed', 'tags', 'untagged', 'until', 'uuid', 'validated',
                                    'when']
 
-            if handler.loop and remove_attr_ref_loop:
-                _handler_attributes = _remove_attr_ref_loop(obj=handler,
-                                                            attributes=_handler_attributes)
-
-            for attr in _handler_attributes:
-                _ret[self.DIY_NS]['handler'].update({attr: _get_value(obj=handler, attr=attr)})
+            _handler_values = _lazy_attributes(
+                handler,
+                _handler_attributes,
+                remove_loop_refs=(handler.loop and remove_attr_ref_loop)
+            )
+            _handler_values.add('is_host_notified', lambda: handler.is_host_notified(host))
 
-            _ret[self.DIY_NS]['handler'].update({'is_host_notified': handler.is_host_notified(host)})
+            _ret[self.DIY_NS].update({'handler': _handler_values})
 
         if result:
-            _ret[self.DIY_NS].update({'result': {}})
             _result_attributes = ['host', 'task', 'task_name']
-
-            for attr in _result_attributes:
-                _ret[self.DIY_NS]['result'].update({attr: _get_value(obj=result, attr=attr)})
-
             _result_methods = ['is_changed', 'is_failed', 'is_skipped', 'is_unreachable']
 
+            _result_values = _lazy_attributes(result, _result_attributes)
             for method in _result_methods:
-                _ret[self.DIY_NS]['result'].update({method: _get_value(obj=result, method=method)})
+                _result_values.add(method, partial(_get_value, obj=result, method=method))
+            _result_values.add('output', lambda: getattr(result, '_result', None))
 
-            _ret[self.DIY_NS]['result'].update({'output': getattr(result, '_result', None)})
+            _ret[self.DIY_NS].update({'result': _result_values})
 
             _ret.update(result._result)
 
         if stats:
-            _ret[self.DIY_NS].update({'stats': {}})
             _stats_attributes = ['changed', 'custom', 'dark', 'failures', 'ignored',
                                  'ok', 'processed', 'rescued', 'skipped']
 
-            for attr in _stats_attributes:
-                _ret[self.DIY_NS]['stats'].update({attr: _get_value(obj=stats, attr=attr)})
+            _ret[self.DIY_NS].update({'stats': _lazy_attributes(stats, _stats_attributes)})
 
         _ret[self.DIY_NS].update({'top_level_var_names': list(_ret.keys())})
 
         return _ret
 
+    def _get_play_vars(self, play, host=None, task=None, use_cache=False):
+        """
+        Run the variable merge for a play, host and task.
+
+        Events that are sent while a task is running on a host (start, loop items, retries)
+        reuse the merged variables. The final result of a task has to see the facts and
+        registered variables of that task, so it always merges again and drops the cached entry.
+        """
+        _key = (
+            getattr(play, '_uuid', None),
+            (host.get_name() if host else None),
+            getattr(task, '_uuid', None)
+        )
+
+        if use_cache and _key in self._diy_vars_cache:
+            return self._diy_vars_cache[_key]
+
+        _all = play.get_variable_manager().get_vars(play=play, host=host, task=task)
+
+        if use_cache:
+            self._diy_vars_cache[_key] = _all
+        else:
+            self._diy_vars_cache.pop(_key, None)
+
+        return _all
+
     def v2_on_any(self, *args, **kwargs):
+        if self._msg_unset(task=self._diy_task, host=self._diy_host):
+            self._diy_spec = None
+            if self._parent_has_callback():
+                super(CallbackModule, self).v2_on_any(*args, **kwargs)
+            return
+
         self._diy_spec = self._get_output_specification(
             loader=self._diy_loader,
-            variables=self._diy_spec['vars']
+            variables=self._previous_vars()
         )
 
         if self._using_diy(spec=self._diy_spec):
@@ -1022,6 +1152,12 @@ class CallbackModule(Default):
                 super(CallbackModule, self).v2_on_any(*args, **kwargs)
 
     def v2_runner_on_failed(self, result, ignore_errors=False):
+        if self._msg_unset(task=self._diy_task, host=result._host):
+            self._diy_spec = None
+            if self._parent_has_callback():
+                super(CallbackModule, self).v2_runner_on_failed(result, ignore_errors)
+            return
+
         self._diy_spec = self._get_output_specification(
             loader=self._diy_loader,
             variables=self._get_vars(
@@ -1040,6 +1176,12 @@ class CallbackModule(Default):
                 super(CallbackModule, self).v2_runner_on_failed(result, ignore_errors)
 
     def v2_runner_on_ok(self, result):
+        if self._msg_unset(task=self._diy_task, host=result._host):
+            self._diy_spec = None
+            if self._parent_has_callback():
+                super(CallbackModule, self).v2_runner_on_ok(result)
+            return
+
         self._diy_spec = self._get_output_specification(
             loader=self._diy_loader,
             variables=self._get_vars(
@@ -1058,6 +1200,12 @@ class CallbackModule(Default):
                 super(CallbackModule, self).v2_runner_on_ok(result)
 
     def v2_runner_on_skipped(self, result):
+        if self._msg_unset(task=self._diy_task, host=result._host):
+            self._diy_spec = None
+            if self._parent_has_callback():
+                super(CallbackModule, self).v2_runner_on_skipped(result)
+            return
+
         self._diy_spec = self._get_output_specification(
             loader=self._diy_loader,
             variables=self._get_vars(
@@ -1076,6 +1224,12 @@ class CallbackModule(Default):
                 super(CallbackModule, self).v2_runner_on_skipped(result)
 
     def v2_runner_on_unreachable(self, result):
+        if self._msg_unset(task=self._diy_task, host=result._host):
+            self._diy_spec = None
+            if self._parent_has_callback():
+                super(CallbackModule, self).v2_runner_on_unreachable(result)
+            return
+
         self._diy_spec = self._get_output_specification(
             loader=self._diy_loader,
             variables=self._get_vars(
@@ -1106,6 +1260,12 @@ class CallbackModule(Default):
         pass
 
     def v2_runner_item_on_ok(self, result):
+        if self._msg_unset(task=self._diy_task, host=result._host):
+            self._diy_spec = None
+            if self._parent_has_callback():
+                super(CallbackModule, self).v2_runner_item_on_ok(result)
+            return
+
         self._diy_spec = self._get_output_specification(
             loader=self._diy_loader,
             variables=self._get_vars(
@@ -1113,7 +1273,8 @@ class CallbackModule(Default):
                 play=self._diy_play,
                 task=self._diy_task,
                 result=result,
-                remove_attr_ref_loop=False
+                remove_attr_ref_loop=False,
+                use_cache=True
             )
         )
 
@@ -1125,6 +1286,12 @@ class CallbackModule(Default):
                 super(CallbackModule, self).v2_runner_item_on_ok(result)
 
     def v2_runner_item_on_failed(self, result):
+        if self._msg_unset(task=self._diy_task, host=result._host):
+            self._diy_spec = None
+            if self._parent_has_callback():
+                super(CallbackModule, self).v2_runner_item_on_failed(result)
+            return
+
         self._diy_spec = self._get_output_specification(
             loader=self._diy_loader,
             variables=self._get_vars(
@@ -1132,7 +1299,8 @@ class CallbackModule(Default):
                 play=self._diy_play,
                 task=self._diy_task,
                 result=result,
-                remove_attr_ref_loop=False
+                remove_attr_ref_loop=False,
+                use_cache=True
             )
         )
 
@@ -1144,6 +1312,12 @@ class CallbackModule(Default):
                 super(CallbackModule, self).v2_runner_item_on_failed(result)
 
     def v2_runner_item_on_skipped(self, result):
+        if self._msg_unset(task=self._diy_task, host=result._host):
+            self._diy_spec = None
+            if self._parent_has_callback():
+                super(CallbackModule, self).v2_runner_item_on_skipped(result)
+            return
+
         self._diy_spec = self._get_output_specification(
             loader=self._diy_loader,
             variables=self._get_vars(
@@ -1151,7 +1325,8 @@ class CallbackModule(Default):
                 play=self._diy_play,
                 task=self._diy_task,
                 result=result,
-                remove_attr_ref_loop=False
+                remove_attr_ref_loop=False,
+                use_cache=True
             )
         )
 
@@ -1163,13 +1338,20 @@ class CallbackModule(Default):
                 super(CallbackModule, self).v2_runner_item_on_skipped(result)
 
     def v2_runner_retry(self, result):
+        if self._msg_unset(task=self._diy_task, host=result._host):
+            self._diy_spec = None
+            if self._parent_has_callback():
+                super(CallbackModule, self).v2_runner_retry(result)
+            return
+
         self._diy_spec = self._get_output_specification(
             loader=self._diy_loader,
             variables=self._get_vars(
                 playbook=self._diy_playbook,
                 play=self._diy_play,
                 task=self._diy_task,
-                result=result
+                result=result,
+                use_cache=True
             )
         )
 
@@ -1184,13 +1366,20 @@ class CallbackModule(Default):
         self._diy_host = host
         self._diy_task = task
 
+        if self._msg_unset(task=self._diy_task, host=self._diy_host):
+            self._diy_spec = None
+            if self._parent_has_callback():
+                super(CallbackModule, self).v2_runner_on_start(host, task)
+            return
+
         self._diy_spec = self._get_output_specification(
             loader=self._diy_loader,
             variables=self._get_vars(
                 playbook=self._diy_playbook,
                 play=self._diy_play,
                 host=self._diy_host,
-                task=self._diy_task
+                task=self._diy_task,
+                use_cache=True
             )
         )
 
@@ -1205,6 +1394,12 @@ class CallbackModule(Default):
         self._diy_playbook = playbook
         self._diy_loader = self._diy_playbook.get_loader()
 
+        if self._msg_unset():
+            self._diy_spec = None
+            if self._parent_has_callback():
+                super(CallbackModule, self).v2_playbook_on_start(playbook)
+            return
+
         self._diy_spec = self._get_output_specification(
             loader=self._diy_loader,
             variables=self._get_vars(
@@ -1223,6 +1418,12 @@ class CallbackModule(Default):
         self._diy_handler = handler
         self._diy_host = host
 
+        if self._msg_unset(task=handler, host=host):
+            self._diy_spec = None
+            if self._parent_has_callback():
+                super(CallbackModule, self).v2_playbook_on_notify(handler, host)
+            return
+
         self._diy_spec = self._get_output_specification(
             loader=self._diy_loader,
             variables=self._get_vars(
@@ -1241,9 +1442,15 @@ class CallbackModule(Default):
                 super(CallbackModule, self).v2_playbook_on_notify(handler, host)
 
     def v2_playbook_on_no_hosts_matched(self):
+        if self._msg_unset():
+            self._diy_spec = None
+            if self._parent_has_callback():
+                super(CallbackModule, self).v2_playbook_on_no_hosts_matched()
+            return
+
         self._diy_spec = self._get_output_specification(
             loader=self._diy_loader,
-            variables=self._diy_spec['vars']
+            variables=self._previous_vars()
         )
 
         if self._using_diy(spec=self._diy_spec):
@@ -1254,9 +1461,15 @@ class CallbackModule(Default):
                 super(CallbackModule, self).v2_playbook_on_no_hosts_matched()
 
     def v2_playbook_on_no_hosts_remaining(self):
+        if self._msg_unset():
+            self._diy_spec = None
+            if self._parent_has_callback():
+                super(CallbackModule, self).v2_playbook_on_no_hosts_remaining()
+            return
+
         self._diy_spec = self._get_output_specification(
             loader=self._diy_loader,
-            variables=self._diy_spec['vars']
+            variables=self._previous_vars()
         )
 
         if self._using_diy(spec=self._diy_spec):
@@ -1267,8 +1480,15 @@ class CallbackModule(Default):
                 super(CallbackModule, self).v2_playbook_on_no_hosts_remaining()
 
     def v2_playbook_on_task_start(self, task, is_conditional):
+        self._diy_vars_cache = {}
         self._diy_task = task
 
+        if self._msg_unset(task=self._diy_task):
+            self._diy_spec = None
+            if self._parent_has_callback():
+                super(CallbackModule, self).v2_playbook_on_task_start(task, is_conditional)
+            return
+
         self._diy_spec = self._get_output_specification(
             loader=self._diy_loader,
             variables=self._get_vars(
@@ -1290,8 +1510,15 @@ class CallbackModule(Default):
         pass
 
     def v2_playbook_on_handler_task_start(self, task):
+        self._diy_vars_cache = {}
         self._diy_task = task
 
+        if self._msg_unset(task=self._diy_task):
+            self._diy_spec = None
+            if self._parent_has_callback():
+                super(CallbackModule, self).v2_playbook_on_handler_task_start(task)
+            return
+
         self._diy_spec = self._get_output_specification(
             loader=self._diy_loader,
             variables=self._get_vars(
@@ -1311,9 +1538,19 @@ class CallbackModule(Default):
     def v2_playbook_on_vars_prompt(self, varname, private=True, prompt=None, encrypt=None,
                                    confirm=False, salt_size=None, salt=None, default=None,
                                    unsafe=None):
+        if self._msg_unset():
+            self._diy_spec = None
+            if self._parent_has_callback():
+                super(CallbackModule, self).v2_playbook_on_vars_prompt(
+                    varname, private, prompt, encrypt,
+                    confirm, salt_size, salt, default,
+                    unsafe
+                )
+            return
+
         self._diy_spec = self._get_output_specification(
             loader=self._diy_loader,
-            variables=self._diy_spec['vars']
+            variables=self._previous_vars()
         )
 
         if self._using_diy(spec=self._diy_spec):
@@ -1336,8 +1573,15 @@ class CallbackModule(Default):
         pass
 
     def v2_playbook_on_play_start(self, play):
+        self._diy_vars_cache = {}
         self._diy_play = play
 
+        if self._msg_unset():
+            self._diy_spec = None
+            if self._parent_has_callback():
+                super(CallbackModule, self).v2_playbook_on_play_start(play)
+            return
+
         self._diy_spec = self._get_output_specification(
             loader=self._diy_loader,
             variables=self._get_vars(
@@ -1356,6 +1600,12 @@ class CallbackModule(Default):
     def v2_playbook_on_stats(self, stats):
         self._diy_stats = stats
 
+        if self._msg_unset():
+            self._diy_spec = None
+            if self._parent_has_callback():
+                super(CallbackModule, self).v2_playbook_on_stats(stats)
+            return
+
         self._diy_spec = self._get_output_specification(
             loader=self._diy_loader,
             variables=self._get_vars(
@@ -1375,6 +1625,12 @@ class CallbackModule(Default):
     def v2_playbook_on_include(self, included_file):
         self._diy_included_file = included_file
 
+        if self._msg_unset(task=included_file._task):
+            self._diy_spec = None
+            if self._parent_has_callback():
+                super(CallbackModule, self).v2_playbook_on_include(included_file)
+            return
+
         self._diy_spec = self._get_output_specification(
             loader=self._diy_loader,
             variables=self._get_vars(
@@ -1393,6 +1649,12 @@ class CallbackModule(Default):
                 super(CallbackModule, self).v2_playbook_on_include(included_file)
 
     def v2_on_file_diff(self, result):
+        if self._msg_unset(task=self._diy_task, host=result._host):
+            self._diy_spec = None
+            if self._parent_has_callback():
+                super(CallbackModule, self).v2_on_file_diff(result)
+            return
+
         self._diy_spec = self._get_output_specification(
             loader=self._diy_loader,
             variables=self._get_vars(
@@ -36,6 +36,78 @@ options:
     ini:
       - section: callback_loganalytics
         key: shared_key
+  background_send:
+    description:
+      - Send the events from a background thread instead of sending every event synchronously when a task result is received.
+      - The events are collected in batches of O(batch_size) events which are sent at the latest O(flush_interval) seconds after
+        the first event of the batch has been queued. All events of a batch are sent as a JSON array in one request.
+      - Remaining events are flushed at the end of the playbook, and the number of sent and dropped events is reported.
+    type: bool
+    default: false
+    env:
+      - name: WORKSPACE_BACKGROUND_SEND
+    ini:
+      - section: callback_loganalytics
+        key: background_send
+    version_added: 10.5.0
+  batch_size:
+    description:
+      - Maximum number of events sent in a single request if O(background_send=true).
+    type: int
+    default: 100
+    env:
+      - name: WORKSPACE_BATCH_SIZE
+    ini:
+      - section: callback_loganalytics
+        key: batch_size
+    version_added: 10.5.0
+  flush_interval:
+    description:
+      - Maximum number of seconds an event is kept back to batch it with further events if O(background_send=true).
+    type: float
+    default: 5
+    env:
+      - name: WORKSPACE_FLUSH_INTERVAL
+    ini:
+      - section: callback_loganalytics
+        key: flush_interval
+    version_added: 10.5.0
+  queue_size:
+    description:
+      - Maximum number of events waiting to be sent if O(background_send=true). Must be at least V(1).
+      - When the queue is full, further events are dropped instead of slowing down the playbook.
+    type: int
+    default: 10000
+    env:
+      - name: WORKSPACE_QUEUE_SIZE
+    ini:
+      - section: callback_loganalytics
+        key: queue_size
+    version_added: 10.5.0
+  retries:
+    description:
+      - Number of times a failed request is retried with exponential backoff if O(background_send=true).
+      - The events of a request that still fails are dropped.
+    type: int
+    default: 3
+    env:
+      - name: WORKSPACE_RETRIES
+    ini:
+      - section: callback_loganalytics
+        key: retries
+    version_added: 10.5.0
+  close_timeout:
+    description:
+      - Maximum number of seconds to wait at the end of the playbook for the remaining events to be sent if O(background_send=true).
+      - Failed requests are no longer retried once the timeout has passed, and the events not sent by then are dropped.
+    type: float
+    default: 30
+    env:
+      - name: WORKSPACE_CLOSE_TIMEOUT
+    ini:
+      - section: callback_loganalytics
+        key: close_timeout
+    version_added: 10.5.0
 """
 
 EXAMPLES = r"""
@@ -60,6 +132,7 @@ import uuid
 import socket
 import getpass
 
+from functools import partial
 from os.path import basename
 
 from ansible.module_utils.urls import open_url
@@ -69,6 +142,7 @@ from ansible.plugins.callback import CallbackBase
 from ansible_collections.community.general.plugins.module_utils.datetime import (
     now,
 )
+from ansible_collections.community.general.plugins.plugin_utils.event_sender import BatchEventSender
 
 
 class AzureLogAnalyticsSource(object):
@@ -80,6 +154,7 @@ class AzureLogAnalyticsSource(object):
         self.host = socket.gethostname()
         self.user = getpass.getuser()
         self.extra_vars = ""
+        self.sender = None
 
     def __build_signature(self, date, workspace_id, shared_key, content_length):
         # Build authorisation signature for Azure log analytics API call
@@ -137,6 +212,11 @@ class AzureLogAnalyticsSource(object):
 
         # Preparing the playbook logs as JSON format and send to Azure log analytics
         jsondata = json.dumps({'event': data}, cls=AnsibleJSONEncoder, sort_keys=True)
+
+        if self.sender is not None:
+            self.sender.submit(jsondata)
+            return
+
         content_length = len(jsondata)
         rfc1123date = self.__rfc1123date()
         signature = self.__build_signature(rfc1123date, workspace_id, shared_key, content_length)
@@ -154,6 +234,25 @@ class AzureLogAnalyticsSource(object):
             method='POST'
         )
 
+    def send_batch(self, workspace_id, shared_key, group, events):
+        # the Data Collector API accepts a JSON array of records
+        body = f"[{','.join(events)}]".encode('utf-8')
+        rfc1123date = self.__rfc1123date()
+        signature = self.__build_signature(rfc1123date, workspace_id, shared_key, len(body))
+        workspace_url = self.__build_workspace_url(workspace_id)
+
+        open_url(
+            workspace_url,
+            body,
+            headers={
+                'content-type': 'application/json',
+                'Authorization': signature,
+                'Log-Type': 'ansible_playbook',
+                'x-ms-date': rfc1123date
+            },
+            method='POST'
+        )
+
 
 class CallbackModule(CallbackBase):
     CALLBACK_VERSION = 2.0
@@ -179,6 +278,19 @@ class CallbackModule(CallbackBase):
         self.workspace_id = self.get_option('workspace_id')
         self.shared_key = self.get_option('shared_key')
 
+        if self.get_option('background_send'):
+            try:
+                self.loganalytics.sender = BatchEventSender(
+                    partial(self.loganalytics.send_batch, self.workspace_id, self.shared_key),
+                    batch_size=self.get_option('batch_size'),
+                    flush_interval=self.get_option('flush_interval'),
+                    queue_size=self.get_option('queue_size'),
+                    retries=self.get_option('retries'),
+                )
+            except ValueError as e:
+                self.disabled = True
+                self._display.warning(f'Azure Log Analytics background sending is misconfigured: {e}')
+
     def v2_playbook_on_play_start(self, play):
         vm = play.get_variable_manager()
         extra_vars = vm.extra_vars
@@ -237,3 +349,12 @@ class CallbackModule(CallbackBase):
             result,
             self._seconds_since_start(result)
         )
+
+    def v2_playbook_on_stats(self, stats):
+        sender = self.loganalytics.sender
+        if sender is None:
+            return
+        sender.close(self.get_option('close_timeout'))
+        self._display.vv(f'Azure Log Analytics: sent {sender.sent} events, dropped {sender.dropped} events')
+        if sender.dropped:
+            self._display.warning(f'Azure Log Analytics: {sender.drop_summary()}')
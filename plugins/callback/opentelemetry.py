@@ -110,6 +110,34 @@ options:
       - section: callback_opentelemetry
         key: otel_exporter_otlp_traces_protocol
     version_added: 9.0.0
+  stream_spans:
+    default: false
+    type: bool
+    description:
+      - Whether to create the tracer provider when the playbook starts and emit the span of every task and host as soon as
+        the host's result for the task is received, instead of keeping all task results in memory and emitting all spans
+        at the end of the playbook.
+      - The spans are exported in batches while the playbook runs, so a trace is not lost completely if the run is aborted.
+      - When a task includes a file for a host multiple times, one span is emitted for every include instead of a single span
+        with the concatenated output.
+    env:
+      - name: ANSIBLE_OPENTELEMETRY_STREAM_SPANS
+    ini:
+      - section: callback_opentelemetry
+        key: stream_spans
+    version_added: 10.5.0
+  result_max_length:
+    default: 0
+    type: int
+    description:
+      - Maximum number of characters of the task result that are kept for a span and sent in its log.
+      - Longer results are truncated. V(0) means no limit.
+    env:
+      - name: ANSIBLE_OPENTELEMETRY_RESULT_MAX_LENGTH
+    ini:
+      - section: callback_opentelemetry
+        key: result_max_length
+    version_added: 10.5.0
 requirements:
   - opentelemetry-api (Python library)
   - opentelemetry-exporter-otlp (Python library)
@@ -184,6 +212,7 @@ class TaskData:
         self.action = action
         self.args = args
         self.dump = None
+        self.finished_hosts = set()
 
     def add_host(self, host):
         if host.uuid in self.host_data:
@@ -246,10 +275,8 @@ class OpenTelemetrySource(object):
 
         tasks_data[uuid] = TaskData(uuid, name, path, play_name, action, args)
 
-    def finish_task(self, tasks_data, status, result, dump):
-        """ record the results of a task for a single host """
-
-        task_uuid = result._task._uuid
+    def _host_data(self, status, result):
+        """ create the HostData of a result and record the Ansible version """
 
         if hasattr(result, '_host') and result._host is not None:
             host_uuid = result._host._uuid
@@ -258,32 +285,37 @@ class OpenTelemetrySource(object):
             host_uuid = 'include'
             host_name = 'include'
 
-        task = tasks_data[task_uuid]
-
         if self.ansible_version is None and hasattr(result, '_task_fields') and result._task_fields['args'].get('_ansible_version'):
             self.ansible_version = result._task_fields['args'].get('_ansible_version')
 
+        return HostData(host_uuid, host_name, status, result)
+
+    def finish_task(self, tasks_data, status, result, dump):
+        """ record the results of a task for a single host """
+
+        task = tasks_data[result._task._uuid]
+        host_data = self._host_data(status, result)
+
         task.dump = dump
-        task.add_host(HostData(host_uuid, host_name, status, result))
+        task.add_host(host_data)
 
-    def generate_distributed_traces(self,
-                                    otel_service_name,
-                                    ansible_playbook,
-                                    tasks_data,
-                                    status,
-                                    traceparent,
-                                    disable_logs,
-                                    disable_attributes_in_logs,
-                                    otel_exporter_otlp_traces_protocol,
-                                    store_spans_in_file):
-        """ generate distributed traces from the collected TaskData and HostData """
+    def finish_task_span(self, tracer, parent, tasks_data, status, result, dump, disable_logs, disable_attributes_in_logs):
+        """ emit the span of a task for a single host right away, without keeping its results """
 
-        tasks = []
-        parent_start_time = None
-        for task_uuid, task in tasks_data.items():
-            if parent_start_time is None:
-                parent_start_time = task.start
-            tasks.append(task)
+        task = tasks_data[result._task._uuid]
+        host_data = self._host_data(status, result)
+
+        if host_data.uuid in task.finished_hosts and status != 'included':
+            return
+        task.finished_hosts.add(host_data.uuid)
+
+        task.dump = dump
+        span = tracer.start_span(task.name, context=trace.set_span_in_context(parent), start_time=task.start)
+        self.update_span_data(task, host_data, span, disable_logs, disable_attributes_in_logs)
+        task.dump = None
+
+    def init_tracer(self, otel_service_name, otel_exporter_otlp_traces_protocol, store_spans_in_file):
+        """ set up the tracer provider, return the tracer and the span exporter """
 
         trace.set_tracer_provider(
             TracerProvider(
@@ -304,19 +336,51 @@ class OpenTelemetrySource(object):
 
         trace.get_tracer_provider().add_span_processor(processor)
 
-        tracer = trace.get_tracer(__name__)
+        return trace.get_tracer(__name__), otel_exporter
+
+    def start_playbook_span(self, tracer, ansible_playbook, traceparent):
+        """ start the parent span of the trace """
+
+        return tracer.start_span(ansible_playbook, context=self.traceparent_context(traceparent),
+                                 start_time=time_ns(), kind=SpanKind.SERVER)
+
+    def set_trace_metadata(self, parent, status):
+        """ populate the trace metadata attributes of the parent span """
+
+        parent.set_status(status)
+        if self.ansible_version is not None:
+            parent.set_attribute("ansible.version", self.ansible_version)
+        parent.set_attribute("ansible.session", self.session)
+        parent.set_attribute("ansible.host.name", self.host)
+        if self.ip_address is not None:
+            parent.set_attribute("ansible.host.ip", self.ip_address)
+        parent.set_attribute("ansible.host.user", self.user)
+
+    def generate_distributed_traces(self,
+                                    otel_service_name,
+                                    ansible_playbook,
+                                    tasks_data,
+                                    status,
+                                    traceparent,
+                                    disable_logs,
+                                    disable_attributes_in_logs,
+                                    otel_exporter_otlp_traces_protocol,
+                                    store_spans_in_file):
+        """ generate distributed traces from the collected TaskData and HostData """
+
+        tasks = []
+        parent_start_time = None
+        for task_uuid, task in tasks_data.items():
+            if parent_start_time is None:
+                parent_start_time = task.start
+            tasks.append(task)
+
+        tracer, otel_exporter = self.init_tracer(otel_service_name, otel_exporter_otlp_traces_protocol, store_spans_in_file)
 
         with tracer.start_as_current_span(ansible_playbook, context=self.traceparent_context(traceparent),
                                           start_time=parent_start_time, kind=SpanKind.SERVER) as parent:
-            parent.set_status(status)
             # Populate trace metadata attributes
-            if self.ansible_version is not None:
-                parent.set_attribute("ansible.version", self.ansible_version)
-            parent.set_attribute("ansible.session", self.session)
-            parent.set_attribute("ansible.host.name", self.host)
-            if self.ip_address is not None:
-                parent.set_attribute("ansible.host.ip", self.ip_address)
-            parent.set_attribute("ansible.host.user", self.user)
+            self.set_trace_metadata(parent, status)
             for task in tasks:
                 for host_uuid, host_data in task.host_data.items():
                     with tracer.start_as_current_span(task.name, start_time=task.start, end_on_exit=False) as span:
@@ -497,6 +561,11 @@ class CallbackModule(CallbackBase):
         self.traceparent = False
         self.store_spans_in_file = False
         self.otel_exporter_otlp_traces_protocol = None
+        self.stream_spans = False
+        self.result_max_length = 0
+        self.tracer = None
+        self.otel_exporter = None
+        self.parent_span = None
 
         if OTEL_LIBRARY_IMPORT_ERROR:
             raise_from(
@@ -537,6 +606,10 @@ class CallbackModule(CallbackBase):
 
         self.otel_exporter_otlp_traces_protocol = self.get_option('otel_exporter_otlp_traces_protocol')
 
+        self.stream_spans = self.get_option('stream_spans')
+
+        self.result_max_length = self.get_option('result_max_length')
+
     def dump_results(self, task, result):
         """ dump the results if disable_logs is not enabled """
         if self.disable_logs:
@@ -549,10 +622,41 @@ class CallbackModule(CallbackBase):
         # ansible.builtin.slurp contains the response in the content field
         if "content" in save and task.action in ("ansible.builtin.slurp", "ansible.legacy.slurp", "slurp"):
             save.pop("content")
-        return self._dump_results(save)
+        dump = self._dump_results(save)
+        if self.result_max_length and len(dump) > self.result_max_length:
+            dump = f"{dump[:self.result_max_length]}... (truncated)"
+        return dump
+
+    def finish_task(self, status, result, dump):
+        """ record the results of a task for a single host, or emit its span right away if streaming """
+        if self.parent_span is not None:
+            self.opentelemetry.finish_task_span(
+                self.tracer,
+                self.parent_span,
+                self.tasks_data,
+                status,
+                result,
+                dump,
+                self.disable_logs,
+                self.disable_attributes_in_logs
+            )
+        else:
+            self.opentelemetry.finish_task(
+                self.tasks_data,
+                status,
+                result,
+                dump
+            )
 
     def v2_playbook_on_start(self, playbook):
         self.ansible_playbook = basename(playbook._file_name)
+        if self.stream_spans:
+            self.tracer, self.otel_exporter = self.opentelemetry.init_tracer(
+                self.otel_service_name,
+                self.otel_exporter_otlp_traces_protocol,
+                self.store_spans_in_file
+            )
+            self.parent_span = self.opentelemetry.start_playbook_span(self.tracer, self.ansible_playbook, self.traceparent)
 
     def v2_playbook_on_play_start(self, play):
         self.play_name = play.get_name()
@@ -596,32 +700,28 @@ class CallbackModule(CallbackBase):
             status = 'failed'
             self.errors += 1
 
-        self.opentelemetry.finish_task(
-            self.tasks_data,
+        self.finish_task(
             status,
             result,
             self.dump_results(self.tasks_data[result._task._uuid], result)
         )
 
     def v2_runner_on_ok(self, result):
-        self.opentelemetry.finish_task(
-            self.tasks_data,
+        self.finish_task(
             'ok',
             result,
             self.dump_results(self.tasks_data[result._task._uuid], result)
         )
 
     def v2_runner_on_skipped(self, result):
-        self.opentelemetry.finish_task(
-            self.tasks_data,
+        self.finish_task(
             'skipped',
             result,
             self.dump_results(self.tasks_data[result._task._uuid], result)
         )
 
     def v2_playbook_on_include(self, included_file):
-        self.opentelemetry.finish_task(
-            self.tasks_data,
+        self.finish_task(
             'included',
             included_file,
             ""
@@ -632,17 +732,24 @@ class CallbackModule(CallbackBase):
             status = Status(status_code=StatusCode.OK)
         else:
             status = Status(status_code=StatusCode.ERROR)
-        otel_exporter = self.opentelemetry.generate_distributed_traces(
-            self.otel_service_name,
-            self.ansible_playbook,
-            self.tasks_data,
-            status,
-            self.traceparent,
-            self.disable_logs,
-            self.disable_attributes_in_logs,
-            self.otel_exporter_otlp_traces_protocol,
-            self.store_spans_in_file
-        )
+        if self.parent_span is not None:
+            self.opentelemetry.set_trace_metadata(self.parent_span, status)
+            self.parent_span.end()
+            self.parent_span = None
+            trace.get_tracer_provider().force_flush()
+            otel_exporter = self.otel_exporter
+        else:
+            otel_exporter = self.opentelemetry.generate_distributed_traces(
+                self.otel_service_name,
+                self.ansible_playbook,
+                self.tasks_data,
+                status,
+                self.traceparent,
+                self.disable_logs,
+                self.disable_attributes_in_logs,
+                self.otel_exporter_otlp_traces_protocol,
+                self.store_spans_in_file
+            )
 
         if self.store_spans_in_file:
             spans = [json.loads(span.to_json()) for span in otel_exporter.get_finished_spans()]
@@ -68,6 +68,89 @@ options:
         key: batch
     type: str
     version_added: 3.3.0
+  background_send:
+    description:
+      - Send the events from a background thread instead of sending every event synchronously when a task result is received.
+      - The events are collected in batches of O(batch_size) events which are sent at the latest O(flush_interval) seconds after
+        the first event of the batch has been queued. All events of a batch are sent as concatenated JSON objects in one request.
+      - Remaining events are flushed at the end of the playbook, and the number of sent and dropped events is reported.
+    type: bool
+    default: false
+    env:
+      - name: SPLUNK_BACKGROUND_SEND
+    ini:
+      - section: callback_splunk
+        key: background_send
+    version_added: 10.5.0
+  batch_size:
+    description:
+      - Maximum number of events sent in a single request if O(background_send=true).
+    type: int
+    default: 100
+    env:
+      - name: SPLUNK_BATCH_SIZE
+    ini:
+      - section: callback_splunk
+        key: batch_size
+    version_added: 10.5.0
+  flush_interval:
+    description:
+      - Maximum number of seconds an event is kept back to batch it with further events if O(background_send=true).
+    type: float
+    default: 5
+    env:
+      - name: SPLUNK_FLUSH_INTERVAL
+    ini:
+      - section: callback_splunk
+        key: flush_interval
+    version_added: 10.5.0
+  queue_size:
+    description:
+      - Maximum number of events waiting to be sent if O(background_send=true). Must be at least V(1).
+      - When the queue is full, further events are dropped instead of slowing down the playbook.
+    type: int
+    default: 10000
+    env:
+      - name: SPLUNK_QUEUE_SIZE
+    ini:
+      - section: callback_splunk
+        key: queue_size
+    version_added: 10.5.0
+  retries:
+    description:
+      - Number of times a failed request is retried with exponential backoff if O(background_send=true).
+      - The events of a request that still fails are dropped.
+    type: int
+    default: 3
+    env:
+      - name: SPLUNK_RETRIES
+    ini:
+      - section: callback_splunk
+        key: retries
+    version_added: 10.5.0
+  close_timeout:
+    description:
+      - Maximum number of seconds to wait at the end of the playbook for the remaining events to be sent if O(background_send=true).
+      - Failed requests are no longer retried once the timeout has passed, and the events not sent by then are dropped.
+    type: float
+    default: 30
+    env:
+      - name: SPLUNK_CLOSE_TIMEOUT
+    ini:
+      - section: callback_splunk
+        key: close_timeout
+    version_added: 10.5.0
+  compress:
+    description:
+      - Whether to compress the requests with gzip if O(background_send=true).
+    type: bool
+    default: false
+    env:
+      - name: SPLUNK_COMPRESS
+    ini:
+      - section: callback_splunk
+        key: compress
+    version_added: 10.5.0
 """
 
 EXAMPLES = r"""
@@ -89,6 +172,7 @@ import uuid
 import socket
 import getpass
 
+from functools import partial
 from os.path import basename
 
 from ansible.module_utils.urls import open_url
@@ -98,6 +182,7 @@ from ansible.plugins.callback import CallbackBase
 from ansible_collections.community.general.plugins.module_utils.datetime import (
     now,
 )
+from ansible_collections.community.general.plugins.plugin_utils.event_sender import BatchEventSender, gzip_body
 
 
 class SplunkHTTPCollectorSource(object):
@@ -109,6 +194,7 @@ class SplunkHTTPCollectorSource(object):
         self.host = socket.gethostname()
         self.ip_address = socket.gethostbyname(socket.gethostname())
         self.user = getpass.getuser()
+        self.sender = None
 
     def send_event(self, url, authtoken, validate_certs, include_milliseconds, batch, state, result, runtime):
         if result._task_fields['args'].get('_ansible_check_mode') is True:
@@ -154,6 +240,10 @@ class SplunkHTTPCollectorSource(object):
         # This wraps the json payload in and outer json event needed by Splunk
         jsondata = json.dumps({"event": data}, cls=AnsibleJSONEncoder, sort_keys=True)
 
+        if self.sender is not None:
+            self.sender.submit(jsondata)
+            return
+
         open_url(
             url,
             jsondata,
@@ -165,6 +255,25 @@ class SplunkHTTPCollectorSource(object):
             validate_certs=validate_certs
         )
 
+    def send_batch(self, url, authtoken, validate_certs, compress, group, events):
+        # HEC accepts multiple events in one request as concatenated JSON objects
+        body = ''.join(events)
+        headers = {
+            'Content-type': 'application/json',
+            'Authorization': f"Splunk {authtoken}"
+        }
+        if compress:
+            body, compress_headers = gzip_body(body)
+            headers.update(compress_headers)
+
+        open_url(
+            url,
+            body,
+            headers=headers,
+            method='POST',
+            validate_certs=validate_certs
+        )
+
 
 class CallbackModule(CallbackBase):
     CALLBACK_VERSION = 2.0
@@ -219,6 +328,19 @@ class CallbackModule(CallbackBase):
 
         self.batch = self.get_option('batch')
 
+        if self.get_option('background_send') and not self.disabled:
+            try:
+                self.splunk.sender = BatchEventSender(
+                    partial(self.splunk.send_batch, self.url, self.authtoken, self.validate_certs, self.get_option('compress')),
+                    batch_size=self.get_option('batch_size'),
+                    flush_interval=self.get_option('flush_interval'),
+                    queue_size=self.get_option('queue_size'),
+                    retries=self.get_option('retries'),
+                )
+            except ValueError as e:
+                self.disabled = True
+                self._display.warning(f'Splunk HTTP collector background sending is misconfigured: {e}')
+
     def v2_playbook_on_start(self, playbook):
         self.splunk.ansible_playbook = basename(playbook._file_name)
 
@@ -287,3 +409,12 @@ class CallbackModule(CallbackBase):
             result,
             self._runtime(result)
         )
+
+    def v2_playbook_on_stats(self, stats):
+        sender = self.splunk.sender
+        if sender is None:
+            return
+        sender.close(self.get_option('close_timeout'))
+        self._display.vv(f'Splunk HTTP collector: sent {sender.sent} events, dropped {sender.dropped} events')
+        if sender.dropped:
+            self._display.warning(f'Splunk HTTP collector: {sender.drop_summary()}')
@@ -25,6 +25,89 @@ options:
     ini:
       - section: callback_sumologic
         key: url
+  background_send:
+    description:
+      - Send the events from a background thread instead of sending every event synchronously when a task result is received.
+      - The events are collected in batches of O(batch_size) events which are sent at the latest O(flush_interval) seconds after
+        the first event of the batch has been queued. Events are batched per Ansible host, the events of a batch are sent as one JSON object per line.
+      - Remaining events are flushed at the end of the playbook, and the number of sent and dropped events is reported.
+    type: bool
+    default: false
+    env:
+      - name: SUMOLOGIC_BACKGROUND_SEND
+    ini:
+      - section: callback_sumologic
+        key: background_send
+    version_added: 10.5.0
+  batch_size:
+    description:
+      - Maximum number of events sent in a single request if O(background_send=true).
+    type: int
+    default: 100
+    env:
+      - name: SUMOLOGIC_BATCH_SIZE
+    ini:
+      - section: callback_sumologic
+        key: batch_size
+    version_added: 10.5.0
+  flush_interval:
+    description:
+      - Maximum number of seconds an event is kept back to batch it with further events if O(background_send=true).
+    type: float
+    default: 5
+    env:
+      - name: SUMOLOGIC_FLUSH_INTERVAL
+    ini:
+      - section: callback_sumologic
+        key: flush_interval
+    version_added: 10.5.0
+  queue_size:
+    description:
+      - Maximum number of events waiting to be sent if O(background_send=true). Must be at least V(1).
+      - When the queue is full, further events are dropped instead of slowing down the playbook.
+    type: int
+    default: 10000
+    env:
+      - name: SUMOLOGIC_QUEUE_SIZE
+    ini:
+      - section: callback_sumologic
+        key: queue_size
+    version_added: 10.5.0
+  retries:
+    description:
+      - Number of times a failed request is retried with exponential backoff if O(background_send=true).
+      - The events of a request that still fails are dropped.
+    type: int
+    default: 3
+    env:
+      - name: SUMOLOGIC_RETRIES
+    ini:
+      - section: callback_sumologic
+        key: retries
+    version_added: 10.5.0
+  close_timeout:
+    description:
+      - Maximum number of seconds to wait at the end of the playbook for the remaining events to be sent if O(background_send=true).
+      - Failed requests are no longer retried once the timeout has passed, and the events not sent by then are dropped.
+    type: float
+    default: 30
+    env:
+      - name: SUMOLOGIC_CLOSE_TIMEOUT
+    ini:
+      - section: callback_sumologic
+        key: close_timeout
+    version_added: 10.5.0
+  compress:
+    description:
+      - Whether to compress the requests with gzip if O(background_send=true).
+    type: bool
+    default: false
+    env:
+      - name: SUMOLOGIC_COMPRESS
+    ini:
+      - section: callback_sumologic
+        key: compress
+    version_added: 10.5.0
 """
 
 EXAMPLES = r"""
@@ -46,6 +129,7 @@ import uuid
 import socket
 import getpass
 
+from functools import partial
 from os.path import basename
 
 from ansible.module_utils.urls import open_url
@@ -55,6 +139,7 @@ from ansible.plugins.callback import CallbackBase
 from ansible_collections.community.general.plugins.module_utils.datetime import (
     now,
 )
+from ansible_collections.community.general.plugins.plugin_utils.event_sender import BatchEventSender, gzip_body
 
 
 class SumologicHTTPCollectorSource(object):
@@ -66,6 +151,7 @@ class SumologicHTTPCollectorSource(object):
         self.host = socket.gethostname()
         self.ip_address = socket.gethostbyname(socket.gethostname())
         self.user = getpass.getuser()
+        self.sender = None
 
     def send_event(self, url, state, result, runtime):
         if result._task_fields['args'].get('_ansible_check_mode') is True:
@@ -100,9 +186,16 @@ class SumologicHTTPCollectorSource(object):
         data['ansible_task'] = result._task_fields
         data['ansible_result'] = result._result
 
+        jsondata = json.dumps(data, cls=AnsibleJSONEncoder, sort_keys=True)
+
+        if self.sender is not None:
+            # events are batched per host, as the host is sent as a header
+            self.sender.submit(jsondata, group=data['ansible_host'])
+            return
+
         open_url(
             url,
-            data=json.dumps(data, cls=AnsibleJSONEncoder, sort_keys=True),
+            data=jsondata,
             headers={
                 'Content-type': 'application/json',
                 'X-Sumo-Host': data['ansible_host']
@@ -110,6 +203,24 @@ class SumologicHTTPCollectorSource(object):
             method='POST'
         )
 
+    def send_batch(self, url, compress, group, events):
+        # the HTTP collector source treats every line as a separate message
+        body = '\n'.join(events)
+        headers = {
+            'Content-type': 'application/json',
+            'X-Sumo-Host': group
+        }
+        if compress:
+            body, compress_headers = gzip_body(body)
+            headers.update(compress_headers)
+
+        open_url(
+            url,
+            data=body,
+            headers=headers,
+            method='POST'
+        )
+
 
 class CallbackModule(CallbackBase):
     CALLBACK_VERSION = 2.0
@@ -142,6 +253,19 @@ class CallbackModule(CallbackBase):
                                   '`SUMOLOGIC_URL` environment variable or '
                                   'in the ansible.cfg file.')
 
+        if self.get_option('background_send') and not self.disabled:
+            try:
+                self.sumologic.sender = BatchEventSender(
+                    partial(self.sumologic.send_batch, self.url, self.get_option('compress')),
+                    batch_size=self.get_option('batch_size'),
+                    flush_interval=self.get_option('flush_interval'),
+                    queue_size=self.get_option('queue_size'),
+                    retries=self.get_option('retries'),
+                )
+            except ValueError as e:
+                self.disabled = True
+                self._display.warning(f'Sumologic HTTP collector background sending is misconfigured: {e}')
+
     def v2_playbook_on_start(self, playbook):
         self.sumologic.ansible_playbook = basename(playbook._file_name)
 
@@ -190,3 +314,12 @@ class CallbackModule(CallbackBase):
             result,
             self._runtime(result)
         )
+
+    def v2_playbook_on_stats(self, stats):
+        sender = self.sumologic.sender
+        if sender is None:
+            return
+        sender.close(self.get_option('close_timeout'))
+        self._display.vv(f'Sumologic HTTP collector: sent {sender.sent} events, dropped {sender.dropped} events')
+        if sender.dropped:
+            self._display.warning(f'Sumologic HTTP collector: {sender.drop_summary()}')
@@ -61,6 +61,23 @@ options:
     default: false
     type: bool
     version_added: 7.3.0
+  direct_transfer:
+    description:
+      - Transfer files by reading and writing them in the chroot directory from the controller, instead of running C(dd)
+        in the chroot for each file.
+      - Symbolic links inside the chroot are resolved relative to the chroot directory, so they cannot lead to files outside
+        of it.
+      - Files are copied with C(copy_file_range) or C(sendfile) where the platform and the file systems support it.
+    ini:
+      - section: chroot_connection
+        key: direct_transfer
+    env:
+      - name: ANSIBLE_CHROOT_DIRECT_TRANSFER
+    vars:
+      - name: ansible_chroot_direct_transfer
+    default: false
+    type: bool
+    version_added: 10.5.0
 """
 
 EXAMPLES = r"""
@@ -84,6 +101,8 @@ from ansible.module_utils.common.text.converters import to_bytes
 from ansible.plugins.connection import ConnectionBase, BUFSIZE
 from ansible.utils.display import Display
 
+from ansible_collections.community.general.plugins.plugin_utils.rootfs import fetch_file_from_root, put_file_in_root
+
 display = Display()
 
 
@@ -183,6 +202,10 @@ class Connection(ConnectionBase):
         super(Connection, self).put_file(in_path, out_path)
         display.vvv(f"PUT {in_path} TO {out_path}", host=self.chroot)
 
+        if self.get_option('direct_transfer'):
+            put_file_in_root(self.chroot, in_path, self._prefix_login_path(out_path))
+            return
+
         out_path = shlex_quote(self._prefix_login_path(out_path))
         try:
             with open(to_bytes(in_path, errors='surrogate_or_strict'), 'rb') as in_file:
@@ -209,6 +232,10 @@ class Connection(ConnectionBase):
         super(Connection, self).fetch_file(in_path, out_path)
         display.vvv(f"FETCH {in_path} TO {out_path}", host=self.chroot)
 
+        if self.get_option('direct_transfer'):
+            fetch_file_from_root(self.chroot, self._prefix_login_path(in_path), out_path)
+            return
+
         in_path = shlex_quote(self._prefix_login_path(in_path))
         try:
             p = self._buffered_exec_command(f'dd if={in_path} bs={BUFSIZE}')
@@ -73,16 +73,41 @@ options:
     default: default
     vars:
       - name: ansible_incus_project
+  incus_transport:
+    description:
+      - How to run commands and transfer files.
+      - V(cli) runs the Incus CLI for every command and file transfer.
+      - V(api) sends requests to the REST API of the local Incus server over its unix domain socket, see O(url). The connection
+        to the server is kept open for the lifetime of the Ansible connection. O(remote) must be V(local).
+    type: str
+    choices: [cli, api]
+    default: cli
+    vars:
+      - name: ansible_incus_transport
+    version_added: 10.5.0
+  url:
+    description:
+      - The unix domain socket of the Incus server, used if O(incus_transport=api). It has to start with C(unix:).
+    type: str
+    default: unix:/var/lib/incus/unix.socket
+    vars:
+      - name: ansible_incus_url
+    version_added: 10.5.0
 """
 
 import os
+import uuid
 from subprocess import call, Popen, PIPE
 
 from ansible.errors import AnsibleError, AnsibleConnectionFailure, AnsibleFileNotFound
 from ansible.module_utils.common.process import get_bin_path
 from ansible.module_utils._text import to_bytes, to_text
+from ansible.module_utils.six.moves import shlex_quote
 from ansible.plugins.connection import ConnectionBase
 
+from ansible_collections.community.general.plugins.module_utils.lxd import LXDClient, LXDClientException
+from ansible_collections.community.general.plugins.plugin_utils.lxd_instance import LXDInstance
+
 
 class Connection(ConnectionBase):
     """ Incus based connections """
@@ -93,20 +118,50 @@ class Connection(ConnectionBase):
     def __init__(self, play_context, new_stdin, *args, **kwargs):
         super(Connection, self).__init__(play_context, new_stdin, *args, **kwargs)
 
-        self._incus_cmd = get_bin_path("incus")
-
-        if not self._incus_cmd:
-            raise AnsibleError("incus command not found in PATH")
+        try:
+            self._incus_cmd = get_bin_path("incus")
+        except ValueError:
+            # only needed with incus_transport=cli
+            self._incus_cmd = None
+        self._api_instance = None
+        self._remote_uid_gid = None
 
     def _connect(self):
         """connect to Incus (nothing to do here) """
         super(Connection, self)._connect()
 
+        if self.get_option("incus_transport") == "cli" and self._incus_cmd is None:
+            raise AnsibleError("incus command not found in PATH")
+
         if not self._connected:
             self._display.vvv(f"ESTABLISH Incus CONNECTION FOR USER: {self.get_option('remote_user')}",
                               host=self._instance())
             self._connected = True
 
+    def _api(self):
+        """ connect to the REST API of the Incus server, once per connection """
+        if self._api_instance is None:
+            if self.get_option("remote") != "local":
+                raise AnsibleError("incus_transport=api only supports the local Incus server, remote must be 'local'")
+            url = self.get_option("url")
+            if not url.startswith("unix:"):
+                raise AnsibleError(f"url must start with unix: with incus_transport=api, got {url}")
+            self._display.vvv(f"ESTABLISH Incus API CONNECTION TO {url}", host=self._instance())
+            try:
+                client = LXDClient(url)
+            except LXDClientException as e:
+                raise AnsibleConnectionFailure(f"cannot connect to Incus server at {url}: {e.msg}")
+            self._api_instance = LXDInstance(client, self._instance(), project=self.get_option("project"), header_prefix='X-Incus')
+        return self._api_instance
+
+    def _api_failure(self, e):
+        """ translate an API error to the errors raised with the CLI """
+        if "not running" in e.msg:
+            return AnsibleConnectionFailure(f"instance not running: {self._instance()}")
+        if "not found" in e.msg.lower():
+            return AnsibleConnectionFailure(f"instance not found: {self._instance()}")
+        return AnsibleConnectionFailure(f"Incus API request failed for {self._instance()}: {e.msg}")
+
     def _build_command(self, cmd) -> str:
         """build the command to execute on the incus host"""
 
@@ -116,6 +171,14 @@ class Connection(ConnectionBase):
             "exec",
             f"{self.get_option('remote')}:{self._instance()}",
             "--"]
+        exec_cmd.extend(self._build_instance_command(cmd))
+
+        return exec_cmd
+
+    def _build_instance_command(self, cmd) -> list[str]:
+        """build the command to run in the instance"""
+
+        instance_cmd = []
 
         if self.get_option("remote_user") != "root":
             self._display.vvv(
@@ -123,13 +186,13 @@ class Connection(ConnectionBase):
                 trying to run 'incus exec' with become method: {self.get_option('incus_become_method')}",
                 host=self._instance(),
             )
-            exec_cmd.extend(
+            instance_cmd.extend(
                 [self.get_option("incus_become_method"), self.get_option("remote_user"), "-c"]
             )
 
-        exec_cmd.extend([self.get_option("executable"), "-c", cmd])
+        instance_cmd.extend([self.get_option("executable"), "-c", cmd])
 
-        return exec_cmd
+        return instance_cmd
 
     def _instance(self):
         # Return only the leading part of the FQDN as the instance name
@@ -143,6 +206,9 @@ class Connection(ConnectionBase):
         self._display.vvv(f"EXEC {cmd}",
                           host=self._instance())
 
+        if self.get_option("incus_transport") == "api":
+            return self._exec_api_command(cmd, in_data=to_bytes(in_data, errors='surrogate_or_strict', nonstring='passthru'))
+
         local_cmd = self._build_command(cmd)
         self._display.vvvvv(f"EXEC {local_cmd}", host=self._instance())
 
@@ -163,8 +229,37 @@ class Connection(ConnectionBase):
 
         return process.returncode, stdout, stderr
 
+    def _exec_api_command(self, cmd, in_data=None):
+        """ execute a command on the Incus host through the REST API """
+        instance = self._api()
+        try:
+            if in_data is not None:
+                # commands run through the API with recorded output have no standard input,
+                # so the data is pushed to a file that the shell reads it from, and removes
+                stdin_path = f"/tmp/.ansible-stdin-{uuid.uuid4().hex}"
+                uid, gid = self._get_remote_uid_gid()
+                instance.put_data(in_data, stdin_path, uid=uid, gid=gid, mode=0o600)
+                stdin_path = shlex_quote(stdin_path)
+                cmd = f"exec <{stdin_path}; rm -f {stdin_path}; {cmd}"
+
+            instance_cmd = self._build_instance_command(cmd)
+            self._display.vvvvv(f"EXEC {instance_cmd}", host=self._instance())
+            returncode, stdout, stderr = instance.exec_command(instance_cmd)
+        except LXDClientException as e:
+            raise self._api_failure(e)
+
+        return returncode, to_text(stdout), to_text(stderr)
+
     def _get_remote_uid_gid(self) -> tuple[int, int]:
-        """Get the user and group ID of 'remote_user' from the instance."""
+        """Get the user and group ID of 'remote_user' from the instance, once per connection."""
+
+        if self._remote_uid_gid is None:
+            self._remote_uid_gid = self._query_remote_uid_gid()
+        return self._remote_uid_gid
+
+    def _query_remote_uid_gid(self) -> tuple[int, int]:
+        if self.get_option("remote_user") == "root":
+            return 0, 0
 
         rc, uid_out, err = self.exec_command("/bin/id -u")
         if rc != 0:
@@ -192,6 +287,16 @@ class Connection(ConnectionBase):
         if not os.path.isfile(to_bytes(in_path, errors='surrogate_or_strict')):
             raise AnsibleFileNotFound(f"input path is not a file: {in_path}")
 
+        if self.get_option("incus_transport") == "api":
+            uid = gid = None
+            if self.get_option("remote_user") != "root":
+                uid, gid = self._get_remote_uid_gid()
+            try:
+                self._api().put_file(in_path, out_path, uid=uid, gid=gid)
+            except LXDClientException as e:
+                raise AnsibleError(f"failed to transfer file {in_path} to {out_path}: {e.msg}")
+            return
+
         if self.get_option("remote_user") != "root":
             uid, gid = self._get_remote_uid_gid()
             local_cmd = [
@@ -233,6 +338,13 @@ class Connection(ConnectionBase):
         self._display.vvv(f"FETCH {in_path} TO {out_path}",
                           host=self._instance())
 
+        if self.get_option("incus_transport") == "api":
+            try:
+                self._api().fetch_file(in_path, out_path)
+            except LXDClientException as e:
+                raise AnsibleError(f"failed to transfer file {in_path} to {out_path}: {e.msg}")
+            return
+
         local_cmd = [
             self._incus_cmd,
             "--project", self.get_option("project"),
@@ -248,4 +360,8 @@ class Connection(ConnectionBase):
         """ close the connection (nothing to do here) """
         super(Connection, self).close()
 
+        if self._api_instance is not None:
+            self._api_instance.client.connection.close()
+            self._api_instance = None
+        self._remote_uid_gid = None
         self._connected = False
@@ -32,6 +32,21 @@ options:
     vars:
       - name: ansible_user
       - name: ansible_jail_user
+  direct_transfer:
+    description:
+      - Transfer files by reading and writing them in the root directory of the jail from the controller, instead of running
+        C(dd) in the jail for each file.
+      - Symbolic links inside the jail are resolved relative to its root directory, so they cannot lead to files outside
+        of it.
+      - Files created in the jail are owned by O(remote_user) if it is set.
+      - Files are copied with C(copy_file_range) or C(sendfile) where the platform and the file systems support it.
+    type: bool
+    default: false
+    env:
+      - name: ANSIBLE_JAIL_DIRECT_TRANSFER
+    vars:
+      - name: ansible_jail_direct_transfer
+    version_added: 10.5.0
 """
 
 import os
@@ -46,6 +61,8 @@ from ansible.module_utils.common.text.converters import to_bytes, to_native, to_
 from ansible.plugins.connection import ConnectionBase, BUFSIZE
 from ansible.utils.display import Display
 
+from ansible_collections.community.general.plugins.plugin_utils.rootfs import fetch_file_from_root, put_file_in_root, read_owner
+
 display = Display()
 
 
@@ -76,6 +93,9 @@ class Connection(ConnectionBase):
         if self.jail not in self.list_jails():
             raise AnsibleError(f"incorrect jail name {self.jail}")
 
+        # root directory of the jail and owner of the files created in it, for direct transfers
+        self._direct_transfer_root = None
+
     @staticmethod
     def _search_executable(executable):
         try:
@@ -92,6 +112,25 @@ class Connection(ConnectionBase):
 
         return to_text(stdout, errors='surrogate_or_strict').split()
 
+    def get_jail_path(self):
+        p = subprocess.Popen([self.jls_cmd, '-j', to_bytes(self.jail), '-q', 'path'],
+                             stdin=subprocess.PIPE,
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+        stdout, stderr = p.communicate()
+        if p.returncode != 0:
+            raise AnsibleError(f"failed to get the path of jail {self.jail}: {to_native(stderr)}")
+        return to_text(stdout, errors='surrogate_or_strict').rstrip('\n')
+
+    def _get_direct_transfer_root(self):
+        if self._direct_transfer_root is None:
+            root = self.get_jail_path()
+            owner = None
+            if self._play_context.remote_user is not None:
+                owner = read_owner(root, self._play_context.remote_user)
+            self._direct_transfer_root = (root, owner)
+        return self._direct_transfer_root
+
     def _connect(self):
         """ connect to the jail; nothing to do here """
         super(Connection, self)._connect()
@@ -154,6 +193,11 @@ class Connection(ConnectionBase):
         super(Connection, self).put_file(in_path, out_path)
         display.vvv(f"PUT {in_path} TO {out_path}", host=self.jail)
 
+        if self.get_option('direct_transfer'):
+            root, owner = self._get_direct_transfer_root()
+            put_file_in_root(root, in_path, self._prefix_login_path(out_path), owner=owner)
+            return
+
         out_path = shlex_quote(self._prefix_login_path(out_path))
         try:
             with open(to_bytes(in_path, errors='surrogate_or_strict'), 'rb') as in_file:
@@ -180,6 +224,10 @@ class Connection(ConnectionBase):
         super(Connection, self).fetch_file(in_path, out_path)
         display.vvv(f"FETCH {in_path} TO {out_path}", host=self.jail)
 
+        if self.get_option('direct_transfer'):
+            fetch_file_from_root(self._get_direct_transfer_root()[0], self._prefix_login_path(in_path), out_path)
+            return
+
         in_path = shlex_quote(self._prefix_login_path(in_path))
         try:
             p = self._buffered_exec_command(f'dd if={in_path} bs={BUFSIZE}')
@@ -72,16 +72,44 @@ options:
     vars:
       - name: ansible_lxd_project
     version_added: 2.0.0
+  lxd_transport:
+    description:
+      - How to run commands and transfer files.
+      - V(cli) runs the C(lxc) CLI for every command and file transfer.
+      - V(api) sends requests to the REST API of the local LXD server over its unix domain socket, see O(url). The connection
+        to the server is kept open for the lifetime of the Ansible connection. O(remote) must be V(local).
+    type: str
+    choices: [cli, api]
+    default: cli
+    vars:
+      - name: ansible_lxd_transport
+    version_added: 10.5.0
+  url:
+    description:
+      - The unix domain socket of the LXD server, used if O(lxd_transport=api). It has to start with C(unix:).
+      - Defaults to C(unix:/var/snap/lxd/common/lxd/unix.socket) if it exists, and to C(unix:/var/lib/lxd/unix.socket) otherwise.
+    type: str
+    vars:
+      - name: ansible_lxd_url
+    version_added: 10.5.0
 """
 
 import os
+import uuid
 from subprocess import Popen, PIPE
 
 from ansible.errors import AnsibleError, AnsibleConnectionFailure, AnsibleFileNotFound
 from ansible.module_utils.common.process import get_bin_path
 from ansible.module_utils.common.text.converters import to_bytes, to_text
+from ansible.module_utils.six.moves import shlex_quote
 from ansible.plugins.connection import ConnectionBase
 
+from ansible_collections.community.general.plugins.module_utils.lxd import LXDClient, LXDClientException
+from ansible_collections.community.general.plugins.plugin_utils.lxd_instance import LXDInstance
+
+SOCKET_URL = 'unix:/var/lib/lxd/unix.socket'
+SNAP_SOCKET_URL = 'unix:/var/snap/lxd/common/lxd/unix.socket'
+
 
 class Connection(ConnectionBase):
     """ lxd based connections """
@@ -95,7 +123,10 @@ class Connection(ConnectionBase):
         try:
             self._lxc_cmd = get_bin_path("lxc")
         except ValueError:
-            raise AnsibleError("lxc command not found in PATH")
+            # only needed with lxd_transport=cli
+            self._lxc_cmd = None
+        self._api_instance = None
+        self._remote_uid_gid = None
 
     def _host(self):
         """ translate remote_addr to lxd (short) hostname """
@@ -105,10 +136,39 @@ class Connection(ConnectionBase):
         """connect to lxd (nothing to do here) """
         super(Connection, self)._connect()
 
+        if self.get_option("lxd_transport") == "cli" and self._lxc_cmd is None:
+            raise AnsibleError("lxc command not found in PATH")
+
         if not self._connected:
             self._display.vvv(f"ESTABLISH LXD CONNECTION FOR USER: {self.get_option('remote_user')}", host=self._host())
             self._connected = True
 
+    def _api(self):
+        """ connect to the REST API of the LXD server, once per connection """
+        if self._api_instance is None:
+            if self.get_option("remote") != "local":
+                raise AnsibleError("lxd_transport=api only supports the local LXD server, remote must be 'local'")
+            url = self.get_option("url")
+            if url is None:
+                url = SNAP_SOCKET_URL if os.path.exists(SNAP_SOCKET_URL[len('unix:'):]) else SOCKET_URL
+            if not url.startswith("unix:"):
+                raise AnsibleError(f"url must start with unix: with lxd_transport=api, got {url}")
+            self._display.vvv(f"ESTABLISH LXD API CONNECTION TO {url}", host=self._host())
+            try:
+                client = LXDClient(url)
+            except LXDClientException as e:
+                raise AnsibleConnectionFailure(f"cannot connect to LXD server at {url}: {e.msg}")
+            self._api_instance = LXDInstance(client, self._host(), project=self.get_option("project"), header_prefix='X-LXD')
+        return self._api_instance
+
+    def _api_failure(self, e):
+        """ translate an API error to the errors raised with the CLI """
+        if "not running" in e.msg:
+            return AnsibleConnectionFailure(f"instance not running: {self._host()}")
+        if "not found" in e.msg.lower():
+            return AnsibleConnectionFailure(f"instance not found: {self._host()}")
+        return AnsibleConnectionFailure(f"LXD API request failed for {self._host()}: {e.msg}")
+
     def _build_command(self, cmd) -> str:
         """build the command to execute on the lxd host"""
 
@@ -118,6 +178,14 @@ class Connection(ConnectionBase):
             exec_cmd.extend(["--project", self.get_option("project")])
 
         exec_cmd.extend(["exec", f"{self.get_option('remote')}:{self._host()}", "--"])
+        exec_cmd.extend(self._build_instance_command(cmd))
+
+        return exec_cmd
+
+    def _build_instance_command(self, cmd) -> list[str]:
+        """build the command to run in the instance"""
+
+        instance_cmd = []
 
         if self.get_option("remote_user") != "root":
             self._display.vvv(
@@ -125,13 +193,34 @@ class Connection(ConnectionBase):
                 trying to run 'lxc exec' with become method: {self.get_option('lxd_become_method')}",
                 host=self._host(),
             )
-            exec_cmd.extend(
+            instance_cmd.extend(
                 [self.get_option("lxd_become_method"), self.get_option("remote_user"), "-c"]
             )
 
-        exec_cmd.extend([self.get_option("executable"), "-c", cmd])
+        instance_cmd.extend([self.get_option("executable"), "-c", cmd])
 
-        return exec_cmd
+        return instance_cmd
+
+    def _exec_api_command(self, cmd, in_data=None):
+        """ execute a command on the lxd host through the REST API """
+        instance = self._api()
+        try:
+            if in_data is not None:
+                # commands run through the API with recorded output have no standard input,
+                # so the data is pushed to a file that the shell reads it from, and removes
+                stdin_path = f"/tmp/.ansible-stdin-{uuid.uuid4().hex}"
+                uid, gid = self._get_remote_uid_gid()
+                instance.put_data(in_data, stdin_path, uid=uid, gid=gid, mode=0o600)
+                stdin_path = shlex_quote(stdin_path)
+                cmd = f"exec <{stdin_path}; rm -f {stdin_path}; {cmd}"
+
+            instance_cmd = self._build_instance_command(cmd)
+            self._display.vvvvv(f"EXEC {instance_cmd}", host=self._host())
+            returncode, stdout, stderr = instance.exec_command(instance_cmd)
+        except LXDClientException as e:
+            raise self._api_failure(e)
+
+        return returncode, to_text(stdout), to_text(stderr)
 
     def exec_command(self, cmd, in_data=None, sudoable=True):
         """ execute a command on the lxd host """
@@ -139,6 +228,9 @@ class Connection(ConnectionBase):
 
         self._display.vvv(f"EXEC {cmd}", host=self._host())
 
+        if self.get_option("lxd_transport") == "api":
+            return self._exec_api_command(cmd, in_data=to_bytes(in_data, errors='surrogate_or_strict', nonstring='passthru'))
+
         local_cmd = self._build_command(cmd)
         self._display.vvvvv(f"EXEC {local_cmd}", host=self._host())
 
@@ -162,7 +254,15 @@ class Connection(ConnectionBase):
         return process.returncode, stdout, stderr
 
     def _get_remote_uid_gid(self) -> tuple[int, int]:
-        """Get the user and group ID of 'remote_user' from the instance."""
+        """Get the user and group ID of 'remote_user' from the instance, once per connection."""
+
+        if self._remote_uid_gid is None:
+            self._remote_uid_gid = self._query_remote_uid_gid()
+        return self._remote_uid_gid
+
+    def _query_remote_uid_gid(self) -> tuple[int, int]:
+        if self.get_option("remote_user") == "root":
+            return 0, 0
 
         rc, uid_out, err = self.exec_command("/bin/id -u")
         if rc != 0:
@@ -189,6 +289,16 @@ class Connection(ConnectionBase):
         if not os.path.isfile(to_bytes(in_path, errors='surrogate_or_strict')):
             raise AnsibleFileNotFound(f"input path is not a file: {in_path}")
 
+        if self.get_option("lxd_transport") == "api":
+            uid = gid = None
+            if self.get_option("remote_user") != "root":
+                uid, gid = self._get_remote_uid_gid()
+            try:
+                self._api().put_file(in_path, out_path, uid=uid, gid=gid)
+            except LXDClientException as e:
+                raise AnsibleError(f"failed to transfer file {in_path} to {out_path}: {e.msg}")
+            return
+
         local_cmd = [self._lxc_cmd]
         if self.get_option("project"):
             local_cmd.extend(["--project", self.get_option("project")])
@@ -230,6 +340,13 @@ class Connection(ConnectionBase):
 
         self._display.vvv(f"FETCH {in_path} TO {out_path}", host=self._host())
 
+        if self.get_option("lxd_transport") == "api":
+            try:
+                self._api().fetch_file(in_path, out_path)
+            except LXDClientException as e:
+                raise AnsibleError(f"failed to transfer file {in_path} to {out_path}: {e.msg}")
+            return
+
         local_cmd = [self._lxc_cmd]
         if self.get_option("project"):
             local_cmd.extend(["--project", self.get_option("project")])
@@ -248,4 +365,8 @@ class Connection(ConnectionBase):
         """ close the connection (nothing to do here) """
         super(Connection, self).close()
 
+        if self._api_instance is not None:
+            self._api_instance.client.connection.close()
+            self._api_instance = None
+        self._remote_uid_gid = None
         self._connected = False
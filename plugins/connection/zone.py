@@ -25,6 +25,20 @@ options:
     vars:
       - name: ansible_host
       - name: ansible_zone_host
+  direct_transfer:
+    description:
+      - Transfer files by reading and writing them in the root directory of the zone from the controller, instead of running
+        C(dd) in the zone for each file.
+      - Symbolic links inside the zone are resolved relative to its root directory, so they cannot lead to files outside
+        of it.
+      - Files are copied with C(copy_file_range) or C(sendfile) where the platform and the file systems support it.
+    type: bool
+    default: false
+    env:
+      - name: ANSIBLE_ZONE_DIRECT_TRANSFER
+    vars:
+      - name: ansible_zone_direct_transfer
+    version_added: 10.5.0
 """
 
 import os
@@ -35,10 +49,12 @@ import traceback
 from ansible.errors import AnsibleError
 from ansible.module_utils.six.moves import shlex_quote
 from ansible.module_utils.common.process import get_bin_path
-from ansible.module_utils.common.text.converters import to_bytes
+from ansible.module_utils.common.text.converters import to_bytes, to_text
 from ansible.plugins.connection import ConnectionBase, BUFSIZE
 from ansible.utils.display import Display
 
+from ansible_collections.community.general.plugins.plugin_utils.rootfs import fetch_file_from_root, put_file_in_root
+
 display = Display()
 
 
@@ -63,6 +79,9 @@ class Connection(ConnectionBase):
         if self.zone not in self.list_zones():
             raise AnsibleError(f"incorrect zone name {self.zone}")
 
+        # root directory of the zone, for direct transfers
+        self._zone_path = None
+
     @staticmethod
     def _search_executable(executable):
         try:
@@ -92,9 +111,14 @@ class Connection(ConnectionBase):
                                    stdout=subprocess.PIPE, stderr=subprocess.PIPE)
 
         # stdout, stderr = p.communicate()
-        path = process.stdout.readlines()[0].split(':')[3]
+        path = to_text(process.stdout.readlines()[0], errors='surrogate_or_strict').split(':')[3]
         return f"{path}/root"
 
+    def _get_direct_transfer_root(self):
+        if self._zone_path is None:
+            self._zone_path = self.get_zone_path()
+        return self._zone_path
+
     def _connect(self):
         """ connect to the zone; nothing to do here """
         super(Connection, self)._connect()
@@ -150,6 +174,10 @@ class Connection(ConnectionBase):
         super(Connection, self).put_file(in_path, out_path)
         display.vvv(f"PUT {in_path} TO {out_path}", host=self.zone)
 
+        if self.get_option('direct_transfer'):
+            put_file_in_root(self._get_direct_transfer_root(), in_path, self._prefix_login_path(out_path))
+            return
+
         out_path = shlex_quote(self._prefix_login_path(out_path))
         try:
             with open(in_path, 'rb') as in_file:
@@ -176,6 +204,10 @@ class Connection(ConnectionBase):
         super(Connection, self).fetch_file(in_path, out_path)
         display.vvv(f"FETCH {in_path} TO {out_path}", host=self.zone)
 
+        if self.get_option('direct_transfer'):
+            fetch_file_from_root(self._get_direct_transfer_root(), self._prefix_login_path(in_path), out_path)
+            return
+
         in_path = shlex_quote(self._prefix_login_path(in_path))
         try:
             p = self._buffered_exec_command(f'dd if={in_path} bs={BUFSIZE}')
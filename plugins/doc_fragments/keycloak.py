@@ -63,6 +63,22 @@ options:
     type: str
     version_added: 10.3.0
 
+  token_cache:
+    description:
+      - Path of a file in which access and refresh tokens obtained with O(auth_username) and O(auth_password) are cached.
+      - Tasks that authenticate with the same O(auth_keycloak_url), O(auth_realm), O(auth_client_id), and O(auth_username)
+        reuse the cached access token until shortly before it expires, and then renew it with the cached refresh token.
+        They only send the credentials to Keycloak again if the refresh token has expired or was revoked.
+      - The file is created only readable by its owner. A companion file with the suffix V(.lock) is used to serialize
+        concurrent tasks.
+      - The task fails if the file or its companion file is a symbolic link, is not owned by the current user, or is accessible
+        by group or others, or if the directory containing them is not owned by the current user or is writable by group or others.
+      - If not set, the environment variable E(KEYCLOAK_TOKEN_CACHE) is used. If neither is set, tokens are not cached
+        and every task authenticates to Keycloak.
+      - This option is ignored if O(token) is set.
+    type: path
+    version_added: 10.5.0
+
   validate_certs:
     description:
       - Verify TLS certificates (do not disable this in production).
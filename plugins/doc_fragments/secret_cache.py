@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+    DOCUMENTATION = r"""
+options:
+  secret_cache:
+    description:
+      - Cache the values fetched from the secret store, so that following lookups do not have to run the command line utility again.
+      - V(none) disables the cache.
+      - V(memory) keeps the values in the memory of the current process only. Since every task runs in its own process,
+        this only helps lookups with many terms, or several lookups in the same task.
+      - V(file) shares the values between all tasks of the current C(ansible-playbook) run. The values are stored in
+        files in a directory of O(secret_cache_dir) that only the current user can access, encrypted with a key that is
+        only kept in the memory of the processes of the run.
+    type: str
+    choices: [none, memory, file]
+    default: none
+    env:
+      - name: ANSIBLE_LOOKUP_SECRET_CACHE
+    ini:
+      - section: secret_cache
+        key: cache
+    version_added: 10.5.0
+  secret_cache_ttl:
+    description:
+      - Number of seconds a cached value is used for.
+    type: int
+    default: 300
+    env:
+      - name: ANSIBLE_LOOKUP_SECRET_CACHE_TTL
+    ini:
+      - section: secret_cache
+        key: ttl
+    version_added: 10.5.0
+  secret_cache_dir:
+    description:
+      - Directory the cache files are stored in when O(secret_cache=file).
+      - This should be a directory on a C(tmpfs) file system.
+      - Defaults to V(/dev/shm) if it exists, and to the temporary directory of the system otherwise.
+    type: path
+    env:
+      - name: ANSIBLE_LOOKUP_SECRET_CACHE_DIR
+    ini:
+      - section: secret_cache
+        key: dir
+    version_added: 10.5.0
+  secret_cache_invalidate:
+    description:
+      - Remove all cached values of this lookup before fetching the values, for example after secrets have been changed.
+    type: bool
+    default: false
+    version_added: 10.5.0
+notes:
+  - The file cache requires the Python C(cryptography) library, which is also required by ansible-core.
+"""
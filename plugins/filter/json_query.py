@@ -106,35 +106,15 @@ _value:
   type: any
 """
 
-from ansible.errors import AnsibleError, AnsibleFilterError
-
-try:
-    import jmespath
-    HAS_LIB = True
-except ImportError:
-    HAS_LIB = False
+from ansible_collections.community.general.plugins.plugin_utils.jmespath_query import _check_lib, _search
 
 
 def json_query(data, expr):
     '''Query data using jmespath query language ( http://jmespath.org ). Example:
     - ansible.builtin.debug: msg="{{ instance | json_query(tagged_instances[*].block_device_mapping.*.volume_id') }}"
     '''
-    if not HAS_LIB:
-        raise AnsibleError('You need to install "jmespath" prior to running '
-                           'json_query filter')
-
-    # Hack to handle Ansible Unsafe text, AnsibleMapping and AnsibleSequence
-    # See issue: https://github.com/ansible-collections/community.general/issues/320
-    jmespath.functions.REVERSE_TYPES_MAP['string'] = jmespath.functions.REVERSE_TYPES_MAP['string'] + ('AnsibleUnicode', 'AnsibleUnsafeText', )
-    jmespath.functions.REVERSE_TYPES_MAP['array'] = jmespath.functions.REVERSE_TYPES_MAP['array'] + ('AnsibleSequence', )
-    jmespath.functions.REVERSE_TYPES_MAP['object'] = jmespath.functions.REVERSE_TYPES_MAP['object'] + ('AnsibleMapping', )
-    try:
-        return jmespath.search(expr, data)
-    except jmespath.exceptions.JMESPathError as e:
-        raise AnsibleFilterError('JMESPathError in json_query filter plugin:\n%s' % e)
-    except Exception as e:
-        # For older jmespath, we can get ValueError and TypeError without much info.
-        raise AnsibleFilterError('Error in jmespath.search in json_query filter plugin:\n%s' % e)
+    _check_lib('json_query')
+    return _search('json_query', expr, data)
 
 
 class FilterModule(object):
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+DOCUMENTATION = r"""
+name: json_query_many
+short_description: Select several elements or data subsets from a complex data structure at once
+version_added: 10.5.0
+author: agent (!UNKNOWN)
+description:
+  - This filter evaluates several JMESPath expressions against the same data structure.
+  - It returns the same results as calling P(community.general.json_query#filter) once per expression.
+positional: exprs
+options:
+  _input:
+    description:
+      - The JSON data to query.
+    type: any
+    required: true
+  exprs:
+    description:
+      - The query expressions.
+      - If a list is given, a list of results in the same order is returned.
+      - If a dictionary is given, a dictionary with the same keys and the results as values is returned.
+      - See U(http://jmespath.org/examples.html) for examples.
+    type: raw
+    required: true
+requirements:
+  - jmespath
+"""
+
+EXAMPLES = r"""
+- name: Get the cluster names and the ports of cluster1 at once
+  ansible.builtin.debug:
+    msg: "{{ domain_definition | community.general.json_query_many(queries) }}"
+  vars:
+    queries:
+      clusters: "domain.cluster[*].name"
+      ports: "domain.server[?cluster=='cluster1'].port"
+  # => {"clusters": ["cluster1", "cluster2"], "ports": ["8080", "8090"]}
+
+- name: Get the server and library names as a list of results
+  ansible.builtin.debug:
+    msg: "{{ domain_definition | community.general.json_query_many(['domain.server[*].name', 'domain.library[*].name']) }}"
+"""
+
+RETURN = r"""
+_value:
+  description: The results of the queries, as a list or a dictionary depending on O(exprs).
+  type: raw
+"""
+
+from ansible.errors import AnsibleFilterError
+from ansible.module_utils.common._collections_compat import Mapping, Sequence
+from ansible.module_utils.six import string_types
+
+from ansible_collections.community.general.plugins.plugin_utils.jmespath_query import _check_lib, _search
+
+
+def json_query_many(data, exprs):
+    '''Query data with several jmespath expressions at once. Example:
+    - ansible.builtin.debug: msg="{{ instance | json_query_many({'ids': 'instances[*].id', 'names': 'instances[*].name'}) }}"
+    '''
+    _check_lib('json_query_many')
+
+    if isinstance(exprs, Mapping):
+        return dict((name, _search('json_query_many', expr, data)) for name, expr in exprs.items())
+    if isinstance(exprs, Sequence) and not isinstance(exprs, string_types):
+        return [_search('json_query_many', expr, data) for expr in exprs]
+    raise AnsibleFilterError(f'json_query_many requires a list or a dictionary of expressions, got {type(exprs)}')
+
+
+class FilterModule(object):
+    ''' Query filter '''
+
+    def filters(self):
+        return {
+            'json_query_many': json_query_many
+        }
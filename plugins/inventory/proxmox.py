@@ -120,6 +120,42 @@ DOCUMENTATION = '''
         type: bool
         default: false
         version_added: 8.1.0
+      max_concurrency:
+        description:
+          - Maximum number of API requests that are run in parallel.
+          - When set to a value greater than V(1), the guest lists of all nodes and, if O(want_facts=true), the status,
+            configuration, snapshots and interfaces of all guests are fetched by a pool of worker threads sharing
+            a pooled HTTP connection adapter.
+          - Hosts are still added to the inventory in the order returned by the API, so the output does not depend on this setting.
+        type: int
+        default: 1
+        version_added: 10.5.0
+      source:
+        description:
+          - How guests and their basic facts are discovered.
+          - V(nodes) walks all nodes and queries the LXC containers and Qemu VMs of every node, and the members of every pool.
+          - V(cluster_resources) discovers nodes, guests, pool memberships and the C(status), C(node), C(vmid), C(vmtype),
+            C(tags) and C(tags_parsed) facts [prefixed with O(facts_prefix)] of every guest with a single C(/cluster/resources)
+            request. The facts of every guest are then always available.
+          - With V(cluster_resources), O(want_facts=true) only fetches the status, configuration and snapshots of the guests
+            if O(compose), O(groups), O(keyed_groups), or O(filters) reference a fact [prefixed with O(facts_prefix)] that is not
+            provided by C(/cluster/resources), or if O(qemu_extended_statuses=true). Otherwise these facts are not gathered.
+        type: str
+        choices: ['nodes', 'cluster_resources']
+        default: nodes
+        version_added: 10.5.0
+      incremental_refresh:
+        description:
+          - Requires O(cache=true) to function.
+          - If set to V(true), the guest lists are queried on every run, even if the cache is still valid. The cached status,
+            configuration, snapshots and interfaces of a guest are reused if its entry in the guest list did not change since the
+            last run, and are only fetched for new and changed guests. Guests that no longer exist are dropped from the cache.
+          - A guest is considered changed if its name, status, template flag, tags, lock, resource limits, pool or process ID changed.
+            Other changes, for example to its description or network configuration, are only picked up after the guest has
+            been restarted or the cache has been flushed.
+        type: bool
+        default: false
+        version_added: 10.5.0
       filters:
         version_added: 4.6.0
         description: A list of Jinja templates that allow filtering hosts.
@@ -188,6 +224,22 @@ compose:
 # an example where this is set to `false` and where ansible_host is set with `compose`.
 want_proxmox_nodes_ansible_host: true
 
+---
+# Discover all guests with a single request to /cluster/resources. Since the groups below
+# only use facts provided by that request, no per-guest requests are made at all.
+# my.proxmox.yml
+plugin: community.general.proxmox
+url: http://pve.domain.com:8006
+user: ansible@pve
+password: secure
+source: cluster_resources
+want_facts: true
+groups:
+  webservers: "'web' in (proxmox_tags_parsed|list)"
+keyed_groups:
+  - key: proxmox_node
+    prefix: node
+
 ---
 # Using the inventory to allow ansible to connect via the first IP address of the VM / Container
 # (Default is connection by name of QEMU/LXC guests)
@@ -222,6 +274,8 @@ want_proxmox_nodes_ansible_host: true
 import itertools
 import re
 
+from concurrent.futures import ThreadPoolExecutor
+
 from ansible.module_utils.common._collections_compat import MutableMapping
 
 from ansible.errors import AnsibleError
@@ -244,6 +298,13 @@ except ImportError:
 
 display = Display()
 
+# Fields of a guest list entry that are compared to decide whether the details of a guest
+# can be reused with incremental_refresh; volatile counters like cpu, mem or uptime are left out
+INCREMENTAL_REFRESH_KEYS = ('name', 'status', 'template', 'tags', 'lock', 'maxmem', 'maxdisk', 'maxcpu', 'cpus', 'pool', 'pid')
+
+GUEST_LIST_URL_RE = re.compile(r'/api2/json/nodes/(?P<node>[^/]+)/(?P<type>lxc|qemu)$')
+GUEST_URL_RE = re.compile(r'/api2/json/nodes/(?P<node>[^/]+)/(?P<type>lxc|qemu)/(?P<vmid>[^/]+)/')
+
 
 class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
     ''' Host inventory parser for ansible using Proxmox as source. '''
@@ -260,6 +321,9 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
         self.session = None
         self.cache_key = None
         self.use_cache = None
+        self.want_guest_details = False
+        self.incremental_refresh = False
+        self._reusable_results = {}
 
     def verify_file(self, path):
 
@@ -275,8 +339,27 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
         if not self.session:
             self.session = requests.session()
             self.session.verify = self.get_option('validate_certs')
+            max_concurrency = self._get_max_concurrency()
+            if max_concurrency > 1:
+                # size the connection pool so that no worker has to wait for or reopen a connection
+                adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+                self.session.mount('http://', adapter)
+                self.session.mount('https://', adapter)
         return self.session
 
+    def _get_max_concurrency(self):
+        return self.get_option('max_concurrency') or 1
+
+    def _map(self, func, args_list):
+        '''Call func for every tuple of arguments in args_list and return the results
+        in the same order. Calls run in a bounded thread pool if max_concurrency > 1.'''
+        args_list = list(args_list)
+        workers = min(self._get_max_concurrency(), len(args_list))
+        if workers <= 1:
+            return [func(*args) for args in args_list]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda args: func(*args), args_list))
+
     def _get_auth(self):
         validate_certs = self.get_option('validate_certs')
 
@@ -317,6 +400,9 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
                 has_data = True
             except KeyError:
                 self.update_cache = True
+        elif url in self._reusable_results:
+            data = self._reusable_results[url]
+            has_data = True
 
         if not has_data:
             s = self._get_session()
@@ -350,6 +436,9 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
     def _get_nodes(self):
         return self._get_json(f"{self.proxmox_url}/api2/json/nodes")
 
+    def _get_cluster_resources(self):
+        return self._get_json(f"{self.proxmox_url}/api2/json/cluster/resources")
+
     def _get_pools(self):
         return self._get_json(f"{self.proxmox_url}/api2/json/pools")
 
@@ -359,6 +448,12 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
     def _get_qemu_per_node(self, node):
         return self._get_json(f"{self.proxmox_url}/api2/json/nodes/{node}/qemu")
 
+    def _get_items_per_node(self, node):
+        '''Return the LXC containers and Qemu VMs of a node as (type, item) tuples.'''
+        lxc_objects = zip(itertools.repeat('lxc'), self._get_lxc_per_node(node))
+        qemu_objects = zip(itertools.repeat('qemu'), self._get_qemu_per_node(node))
+        return list(itertools.chain(lxc_objects, qemu_objects))
+
     def _get_members_per_pool(self, pool):
         ret = self._get_json(f"{self.proxmox_url}/api2/json/pools/{pool}")
         return ret['members']
@@ -451,10 +546,10 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
 
                 # Additional field containing parsed tags as list
                 if config == 'tags':
-                    stripped_value = value.strip()
-                    if stripped_value:
+                    parsed_value = self._parse_tags(value)
+                    if parsed_value:
                         parsed_key = f"{key}_parsed"
-                        properties[parsed_key] = [tag.strip() for tag in stripped_value.replace(',', ';').split(";")]
+                        properties[parsed_key] = parsed_value
 
                 # The first field in the agent string tells you whether the agent is enabled
                 # the rest of the comma separated string is extra config for the agent.
@@ -504,6 +599,96 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
         snapshots = [snapshot['name'] for snapshot in ret if snapshot['name'] != 'current']
         properties[self._fact('snapshots')] = snapshots
 
+    def _parse_tags(self, value):
+        stripped_value = value.strip()
+        if not stripped_value:
+            return []
+        return [tag.strip() for tag in stripped_value.replace(',', ';').split(";")]
+
+    def _get_resource_properties(self, node, ittype, item):
+        '''Build the facts of a LXC container or Qemu VM from its /cluster/resources
+        entry and add the status, config and snapshots if they are needed.'''
+        if item.get('template'):
+            return dict()
+
+        properties = {
+            self._fact('status'): item['status'],
+            self._fact('node'): node,
+            self._fact('vmid'): item['vmid'],
+            self._fact('vmtype'): ittype,
+        }
+        tags = item.get('tags') or ''
+        if tags:
+            properties[self._fact('tags')] = tags
+            parsed_tags = self._parse_tags(tags)
+            if parsed_tags:
+                properties[f"{self._fact('tags')}_parsed"] = parsed_tags
+
+        if self.want_guest_details:
+            properties.update(self._get_item_properties(node, ittype, item))
+        return properties
+
+    def _need_guest_details(self):
+        '''Check whether facts that are not part of /cluster/resources are used by
+        the constructed options, which requires fetching them for every guest.'''
+        if not self.get_option('want_facts'):
+            return False
+        if self.get_option('qemu_extended_statuses'):
+            return True
+
+        templates = list(self.get_option('filters') or [])
+        templates.extend((self.get_option('compose') or {}).values())
+        templates.extend((self.get_option('groups') or {}).values())
+        for keyed_group in self.get_option('keyed_groups') or []:
+            templates.extend(keyed_group.get(k) for k in ('key', 'parent_group'))
+
+        resource_facts = set(self._fact(name) for name in ('status', 'node', 'vmid', 'vmtype', 'tags', 'tags_parsed'))
+        fact_regex = re.compile(r'\b' + re.escape(self.to_safe(self.facts_prefix)) + r'\w+')
+        for template in templates:
+            if template is None:
+                continue
+            if any(fact not in resource_facts for fact in fact_regex.findall(str(template))):
+                return True
+        return False
+
+    def _get_guest_fingerprints(self, results):
+        '''Extract the comparable part of every guest list entry found in results,
+        keyed by (node, type, vmid).'''
+        fingerprints = {}
+        for url, data in results.items():
+            if url.endswith('/api2/json/cluster/resources'):
+                entries = [(entry.get('node'), entry.get('type'), entry) for entry in data]
+            else:
+                match = GUEST_LIST_URL_RE.search(url)
+                if not match:
+                    continue
+                entries = [(match.group('node'), match.group('type'), entry) for entry in data]
+
+            for node, ittype, entry in entries:
+                if ittype not in ('lxc', 'qemu') or 'vmid' not in entry:
+                    continue
+                fingerprints[(node, ittype, str(entry['vmid']))] = [entry.get(key) for key in INCREMENTAL_REFRESH_KEYS]
+        return fingerprints
+
+    def _reuse_unchanged_guests(self):
+        '''Make the cached API responses of all guests whose guest list entry did not
+        change since the last run available to _get_json.'''
+        try:
+            previous_results = self._cache[self.cache_key]
+        except KeyError:
+            return
+
+        previous = self._get_guest_fingerprints(previous_results)
+        current = self._get_guest_fingerprints(self._results)
+        unchanged = set(key for key, fingerprint in current.items() if previous.get(key) == fingerprint)
+
+        self._reusable_results = {}
+        for url, data in previous_results.items():
+            match = GUEST_URL_RE.search(url)
+            if match and (match.group('node'), match.group('type'), match.group('vmid')) in unchanged:
+                self._reusable_results[url] = data
+        display.vvv(f"Reusing cached details of {len(unchanged)} of {len(current)} guests")
+
     def to_safe(self, word):
         '''Converts 'bad' characters in a string to underscores so they can be used as Ansible groups
         #> ProxmoxInventory.to_safe("foo-bar baz")
@@ -545,25 +730,35 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
         self._add_host_to_composed_groups(self.get_option('groups'), variables, name, strict=self.strict)
         self._add_host_to_keyed_groups(self.get_option('keyed_groups'), variables, name, strict=self.strict)
 
-    def _handle_item(self, node, ittype, item):
+    def _get_item_properties(self, node, ittype, item):
+        '''Fetch the status, config and snapshots of a LXC container or Qemu VM
+        if want_facts == True. Only queries the API, the inventory is not touched.'''
+        properties = dict()
+        if item.get('template') or not self.get_option('want_facts'):
+            return properties
+
+        name, vmid = item['name'], item['vmid']
+        self._get_vm_status(properties, node, vmid, ittype, name)
+        self._get_vm_config(properties, node, vmid, ittype, name)
+        self._get_vm_snapshots(properties, node, vmid, ittype, name)
+
+        if ittype == 'lxc':
+            self._get_lxc_interfaces(properties, node, vmid)
+
+        return properties
+
+    def _handle_item(self, node, ittype, item, properties=None):
         '''Handle an item from the list of LXC containers and Qemu VM. The
         return value will be either None if the item was skipped or the name of
-        the item if it was added to the inventory.'''
+        the item if it was added to the inventory. The item's facts are fetched
+        unless they have already been passed in properties.'''
         if item.get('template'):
             return None
 
-        properties = dict()
-        name, vmid = item['name'], item['vmid']
-
-        # get status, config and snapshots if want_facts == True
+        name = item['name']
         want_facts = self.get_option('want_facts')
-        if want_facts:
-            self._get_vm_status(properties, node, vmid, ittype, name)
-            self._get_vm_config(properties, node, vmid, ittype, name)
-            self._get_vm_snapshots(properties, node, vmid, ittype, name)
-
-            if ittype == 'lxc':
-                self._get_lxc_interfaces(properties, node, vmid)
+        if properties is None:
+            properties = self._get_item_properties(node, ittype, item)
 
         # ensure the host satisfies filters
         if not self._can_add_host(name, properties):
@@ -599,6 +794,20 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
                 if name and name in added_hosts:
                     self.inventory.add_child(pool_group, name)
 
+    def _populate_pool_groups_from_resources(self, resources, added_hosts):
+        '''Generate groups from the pools in /cluster/resources, ignoring VMs and
+        containers that were skipped.'''
+        for resource in resources:
+            if resource['type'] == 'pool' and resource.get('pool'):
+                self.inventory.add_group(self._group(f"pool_{resource['pool']}"))
+
+        for resource in resources:
+            if resource['type'] not in ('lxc', 'qemu') or not resource.get('pool'):
+                continue
+            name = resource.get('name')
+            if name and name in added_hosts:
+                self.inventory.add_child(self._group(f"pool_{resource['pool']}"), name)
+
     def _populate(self):
 
         # create common groups
@@ -617,10 +826,39 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
 
         # gather vm's on nodes
         self._get_auth()
+        use_cluster_resources = self.get_option('source') == 'cluster_resources'
+        if use_cluster_resources:
+            resources = self._get_cluster_resources()
+            nodes = [resource for resource in resources if resource['type'] == 'node' and resource.get('node')]
+        else:
+            nodes = [node for node in self._get_nodes() if node.get('node')]
+        online_nodes = [node['node'] for node in nodes if node['status'] != 'offline']
+
+        # query the API up front, in parallel if max_concurrency > 1; the inventory
+        # is populated sequentially afterwards so that the output stays stable
+        node_ips = {}
+        if want_proxmox_nodes_ansible_host and not self.exclude_nodes:
+            node_ips = dict(zip(online_nodes, self._map(self._get_node_ip, ((node,) for node in online_nodes))))
+        if use_cluster_resources:
+            self.want_guest_details = self._need_guest_details()
+            items = [(resource['node'], resource['type'], resource) for resource in resources
+                     if resource['type'] in ('lxc', 'qemu') and resource.get('node') in online_nodes]
+            get_properties = self._get_resource_properties
+        else:
+            node_items = self._map(self._get_items_per_node, ((node,) for node in online_nodes))
+            items = [(node, ittype, item) for node, objects in zip(online_nodes, node_items) for ittype, item in objects]
+            get_properties = self._get_item_properties
+
+        if self.incremental_refresh:
+            self._reuse_unchanged_guests()
+        items_properties = self._map(get_properties, items)
+
+        guests = {}
+        for (node, ittype, item), properties in zip(items, items_properties):
+            guests.setdefault(node, []).append((ittype, item, properties))
+
         hosts = []
-        for node in self._get_nodes():
-            if not node.get('node'):
-                continue
+        for node in nodes:
             if not self.exclude_nodes:
                 self.inventory.add_host(node['node'])
             if node['type'] == 'node' and not self.exclude_nodes:
@@ -631,8 +869,7 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
 
             # get node IP address
             if want_proxmox_nodes_ansible_host and not self.exclude_nodes:
-                ip = self._get_node_ip(node['node'])
-                self.inventory.set_variable(node['node'], 'ansible_host', ip)
+                self.inventory.set_variable(node['node'], 'ansible_host', node_ips[node['node']])
 
             # Setting composite variables
             if not self.exclude_nodes:
@@ -644,16 +881,17 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
                 node_type_group = self._group(f"{node['node']}_{ittype}")
                 self.inventory.add_group(node_type_group)
 
-            # get LXC containers and Qemu VMs for this node
-            lxc_objects = zip(itertools.repeat('lxc'), self._get_lxc_per_node(node['node']))
-            qemu_objects = zip(itertools.repeat('qemu'), self._get_qemu_per_node(node['node']))
-            for ittype, item in itertools.chain(lxc_objects, qemu_objects):
-                name = self._handle_item(node['node'], ittype, item)
+            # add LXC containers and Qemu VMs of this node
+            for ittype, item, properties in guests.get(node['node'], []):
+                name = self._handle_item(node['node'], ittype, item, properties)
                 if name is not None:
                     hosts.append(name)
 
         # gather vm's in pools
-        self._populate_pool_groups(hosts)
+        if use_cluster_resources:
+            self._populate_pool_groups_from_resources(resources, hosts)
+        else:
+            self._populate_pool_groups(hosts)
 
     def parse(self, inventory, loader, path, cache=True):
         if not HAS_REQUESTS:
@@ -680,11 +918,18 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
 
         if self.get_option('qemu_extended_statuses') and not self.get_option('want_facts'):
             raise AnsibleError('You must set want_facts to True if you want to use qemu_extended_statuses.')
+        if self.get_option('max_concurrency') < 1:
+            raise AnsibleError('max_concurrency must be at least 1.')
         # read rest of options
         self.exclude_nodes = self.get_option('exclude_nodes')
         self.cache_key = self.get_cache_key(path)
         self.use_cache = cache and self.get_option('cache')
         self.update_cache = not cache and self.get_option('cache')
+        self.incremental_refresh = self.use_cache and self.get_option('incremental_refresh')
+        if self.incremental_refresh:
+            # always query the API, _get_json() only reuses the results of unchanged guests
+            self.use_cache = False
+            self.update_cache = True
         self.host_filters = self.get_option('filters')
         self.group_prefix = self.get_option('group_prefix')
         self.facts_prefix = self.get_option('facts_prefix')
@@ -205,6 +205,19 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
             'hosts': self.get_object('host'),
         }
 
+    def _get_cached_objects(self):
+        """Returns the objects from the inventory cache if it is valid, queries the XO server otherwise."""
+        if self.use_cache:
+            try:
+                return self._cache[self.cache_key]
+            except KeyError:
+                pass
+
+        objects = self._get_objects()
+        if self.get_option('cache'):
+            self._cache[self.cache_key] = objects
+        return objects
+
     def _apply_constructable(self, name, variables):
         strict = self.get_option('strict')
         self._add_host_to_composed_groups(self.get_option('groups'), variables, name, strict=strict)
@@ -382,5 +395,5 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
         if not self.get_option('use_host_uuid'):
             self.host_entry_name_type = 'name_label'
 
-        objects = self._get_objects()
+        objects = self._get_cached_objects()
         self._populate(make_unsafe(objects))
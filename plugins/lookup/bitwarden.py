@@ -62,6 +62,11 @@ DOCUMENTATION = """
             is set but does not match the number of query results. Leave empty to skip this check.
         type: int
         version_added: 10.4.0
+    extends_documentation_fragment:
+      - community.general.secret_cache
+    notes:
+      - With O(secret_cache) enabled, the list of all items is fetched once and filtered locally for every term.
+        This is not done if O(search) is empty, since C(bw) then also returns records whose other fields match.
 """
 
 EXAMPLES = """
@@ -109,6 +114,12 @@ EXAMPLES = """
   ansible.builtin.debug:
     msg: >-
       {{ lookup('community.general.bitwarden', 'a_test', result_count=1) }}
+
+- name: "Get passwords of many records, listing the items only once for all tasks of the run"
+  ansible.builtin.debug:
+    msg: >-
+      {{ lookup('community.general.bitwarden', item, field='password', secret_cache='file') }}
+  loop: "{{ record_names }}"
 """
 
 RETURN = """
@@ -128,6 +139,8 @@ from ansible.module_utils.common.text.converters import to_bytes, to_text
 from ansible.parsing.ajson import AnsibleJSONDecoder
 from ansible.plugins.lookup import LookupBase
 
+from ansible_collections.community.general.plugins.plugin_utils.secret_cache import SecretCache
+
 
 class BitwardenException(AnsibleError):
     pass
@@ -138,6 +151,7 @@ class Bitwarden(object):
     def __init__(self, path='bw'):
         self._cli_path = path
         self._session = None
+        self.cache = None
 
     @property
     def cli_path(self):
@@ -153,10 +167,42 @@ class Bitwarden(object):
 
     @property
     def unlocked(self):
+        if self.cache is not None and self.cache.get(self._cache_key(['status'])) == 'unlocked':
+            return True
         out, err = self._run(['status'], stdin="")
         decoded = AnsibleJSONDecoder().raw_decode(out)[0]
+        if self.cache is not None:
+            self.cache.set(self._cache_key(['status']), decoded['status'])
         return decoded['status'] == 'unlocked'
 
+    def _cache_key(self, params):
+        return [self.cli_path, self.session] + params
+
+    def _get_json(self, params):
+        """Run the CLI and decode its output, using the cache if it is enabled."""
+        if self.cache is not None:
+            result = self.cache.get(self._cache_key(params))
+            if result is not None:
+                return result
+        out, err = self._run(list(params))
+        result = AnsibleJSONDecoder().raw_decode(out)[0]
+        if self.cache is not None:
+            self.cache.set(self._cache_key(params), result)
+        return result
+
+    def _get_cached_matches(self, search_value, search_field, collection_id=None, organization_id=None):
+        """Return matching records from the list of all items, which is only fetched once while it is cached.
+        """
+        params = ['list', 'items']
+        # 'get item' does not filter by collection or organization
+        if search_field != 'id':
+            if collection_id:
+                params.extend(['--collectionid', collection_id])
+            if organization_id:
+                params.extend(['--organizationid', organization_id])
+
+        return [item for item in self._get_json(params) if item.get(search_field) == search_value]
+
     def _run(self, args, stdin=None, expected_rc=0):
         if self.session:
             args += ['--session', self.session]
@@ -174,6 +220,9 @@ class Bitwarden(object):
         """Return matching records whose search_field is equal to key.
         """
 
+        if self.cache is not None and search_value and search_field:
+            return self._get_cached_matches(search_value, search_field, collection_id, organization_id)
+
         # Prepare set of params for Bitwarden CLI
         if search_field == 'id':
             params = ['get', 'item', search_value]
@@ -244,10 +293,8 @@ class Bitwarden(object):
         if organization_id:
             params.extend(['--organizationid', organization_id])
 
-        out, err = self._run(params)
-
         # This includes things that matched in different fields.
-        initial_matches = AnsibleJSONDecoder().raw_decode(out)[0]
+        initial_matches = self._get_json(params)
 
         # Filter to only return the ID of a collections with exactly matching name
         return [item['id'] for item in initial_matches
@@ -265,6 +312,7 @@ class LookupModule(LookupBase):
         organization_id = self.get_option('organization_id')
         result_count = self.get_option('result_count')
         _bitwarden.session = self.get_option('bw_session')
+        _bitwarden.cache = SecretCache.from_options(self, 'bitwarden')
 
         if not _bitwarden.unlocked:
             raise AnsibleError("Bitwarden Vault locked. Run 'bw unlock'.")
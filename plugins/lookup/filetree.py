@@ -21,6 +21,29 @@ options:
     required: true
     type: list
     elements: string
+  checksum:
+    description:
+      - Whether to compute a checksum of the content of every file.
+      - The checksums are computed in parallel with a pool of threads.
+      - Files that cannot be read are returned without checksum, and a warning is shown.
+    type: bool
+    default: false
+    version_added: 10.5.0
+  checksum_algorithm:
+    description:
+      - The algorithm used to compute RV(_raw[].checksum).
+      - The default matches the checksums returned by modules like M(ansible.builtin.copy) and M(ansible.builtin.stat).
+    type: str
+    default: sha1
+    version_added: 10.5.0
+  cache_path:
+    description:
+      - Directory to cache the walk results of every path in.
+      - A cached result is reused as long as the modification times of all directories of the tree are unchanged.
+        Changes to existing files that do not modify a directory, like changes of content or permissions, are not detected.
+      - If not set, the results are not cached.
+    type: path
+    version_added: 10.5.0
 '''
 
 EXAMPLES = r"""
@@ -114,11 +137,21 @@ RETURN = r"""
         ctime:
           description: Time of last metadata update or creation (depends on OS).
           type: float
+        checksum:
+          description:
+          - Checksum of the file content, computed with O(checksum_algorithm).
+          - Only returned for files when O(checksum=true), and if the file could be read.
+          type: str
+          version_added: 10.5.0
 """
+import grp
+import hashlib
+import json
 import os
 import pwd
-import grp
 import stat
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 HAVE_SELINUX = False
 try:
@@ -127,12 +160,16 @@ try:
 except ImportError:
     pass
 
+from ansible.errors import AnsibleLookupError
 from ansible.plugins.lookup import LookupBase
-from ansible.module_utils.common.text.converters import to_native, to_text
+from ansible.module_utils.common.text.converters import to_bytes, to_native, to_text
 from ansible.utils.display import Display
 
 display = Display()
 
+# number of threads computing checksums
+CHECKSUM_WORKERS = 8
+
 
 # If selinux fails to find a default, return an array of None
 def selinux_context(path):
@@ -151,15 +188,32 @@ def selinux_context(path):
     return context
 
 
-def file_props(root, path):
+@lru_cache(maxsize=None)
+def _owner(uid):
+    try:
+        return pwd.getpwuid(uid).pw_name
+    except KeyError:
+        return uid
+
+
+@lru_cache(maxsize=None)
+def _group(gid):
+    try:
+        return to_text(grp.getgrgid(gid).gr_name)
+    except KeyError:
+        return gid
+
+
+def file_props(root, path, st=None):
     ''' Returns dictionary with file properties, or return None on failure '''
     abspath = os.path.join(root, path)
 
-    try:
-        st = os.lstat(abspath)
-    except OSError as e:
-        display.warning(f'filetree: Error using stat() on path {abspath} ({e})')
-        return None
+    if st is None:
+        try:
+            st = os.lstat(abspath)
+        except OSError as e:
+            display.warning(f'filetree: Error using stat() on path {abspath} ({e})')
+            return None
 
     ret = dict(root=root, path=path)
 
@@ -177,14 +231,8 @@ def file_props(root, path):
 
     ret['uid'] = st.st_uid
     ret['gid'] = st.st_gid
-    try:
-        ret['owner'] = pwd.getpwuid(st.st_uid).pw_name
-    except KeyError:
-        ret['owner'] = st.st_uid
-    try:
-        ret['group'] = to_text(grp.getgrgid(st.st_gid).gr_name)
-    except KeyError:
-        ret['group'] = st.st_gid
+    ret['owner'] = _owner(st.st_uid)
+    ret['group'] = _group(st.st_gid)
     ret['mode'] = f'0{stat.S_IMODE(st.st_mode):03o}'
     ret['size'] = st.st_size
     ret['mtime'] = st.st_mtime
@@ -200,28 +248,149 @@ def file_props(root, path):
     return ret
 
 
+def file_checksum(path, algorithm):
+    ''' Returns the hex digest of the content of a file '''
+    digest = hashlib.new(algorithm)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(64 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def walk_tree(top):
+    '''
+    Walks a tree in the same order as os.walk(top), and yields the relative path
+    and the stat result of every entry, together with the modification times of all directories.
+    The modification time of a directory that cannot be listed, including top itself, is None.
+    '''
+    dir_mtimes = {}
+    entries = []
+    stack = ['']
+    while stack:
+        reldir = stack.pop()
+        absdir = os.path.join(top, reldir)
+        dirs = []
+        files = []
+        try:
+            mtime = os.stat(absdir).st_mtime_ns
+            with os.scandir(absdir) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    (dirs if is_dir else files).append(entry)
+        except OSError:
+            # os.walk silently skips directories it cannot list
+            dir_mtimes[reldir] = None
+            continue
+        dir_mtimes[reldir] = mtime
+
+        for entry in dirs + files:
+            relpath = os.path.join(reldir, entry.name)
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                st = None
+            entries.append((relpath, st))
+
+        # os.walk does not descend into symlinks to directories
+        stack.extend(os.path.join(reldir, entry.name) for entry in reversed(dirs) if not entry.is_symlink())
+
+    return dir_mtimes, entries
+
+
 class LookupModule(LookupBase):
 
+    def _cache_file(self, path):
+        cache_path = self.get_option('cache_path')
+        if not cache_path:
+            return None
+        key = hashlib.sha1(to_bytes(path)).hexdigest()
+        return os.path.join(cache_path, f'filetree-{key}.json')
+
+    def _load_cache(self, path):
+        cache_file = self._cache_file(path)
+        if cache_file is None:
+            return None
+        try:
+            with open(cache_file) as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        for reldir, mtime in cached['dir_mtimes'].items():
+            try:
+                if os.stat(os.path.join(path, reldir)).st_mtime_ns != mtime:
+                    return None
+            except OSError:
+                return None
+        display.debug(f"Using cached walk of '{path}'")
+        return cached['entries']
+
+    def _save_cache(self, path, dir_mtimes, entries):
+        cache_file = self._cache_file(path)
+        if cache_file is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            tmp_file = f'{cache_file}.{os.getpid()}'
+            with open(tmp_file, 'w') as f:
+                json.dump({'dir_mtimes': dir_mtimes, 'entries': entries}, f)
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            display.warning(f'filetree: Error writing cache file {cache_file} ({e})')
+
+    def _walk(self, path):
+        entries = self._load_cache(path)
+        if entries is not None:
+            return entries
+
+        dir_mtimes, found = walk_tree(path)
+        entries = []
+        for relpath, st in found:
+            props = file_props(path, relpath, st)
+            if props is not None:
+                entries.append(props)
+        # a directory that cannot be listed, for example a root that does not exist yet,
+        # can change without changing any of the recorded modification times
+        if None not in dir_mtimes.values():
+            self._save_cache(path, dir_mtimes, entries)
+        return entries
+
     def run(self, terms, variables=None, **kwargs):
         self.set_options(var_options=variables, direct=kwargs)
 
+        checksum_algorithm = self.get_option('checksum_algorithm')
+        if self.get_option('checksum') and checksum_algorithm not in hashlib.algorithms_available:
+            raise AnsibleLookupError(f'filetree: unsupported checksum algorithm {checksum_algorithm}')
+
         basedir = self.get_basedir(variables)
 
         ret = []
+        seen = set()
         for term in terms:
             term_file = os.path.basename(term)
             dwimmed_path = self._loader.path_dwim_relative(basedir, 'files', os.path.dirname(term))
             path = os.path.join(dwimmed_path, term_file)
             display.debug(f"Walking '{path}'")
-            for root, dirs, files in os.walk(path, topdown=True):
-                for entry in dirs + files:
-                    relpath = os.path.relpath(os.path.join(root, entry), path)
-
-                    # Skip if relpath was already processed (from another root)
-                    if relpath not in [entry['path'] for entry in ret]:
-                        props = file_props(path, relpath)
-                        if props is not None:
-                            display.debug(f"  found '{os.path.join(path, relpath)}'")
-                            ret.append(props)
+            for props in self._walk(path):
+                # Skip if relpath was already processed (from another root)
+                if props['path'] not in seen:
+                    seen.add(props['path'])
+                    display.debug(f"  found '{os.path.join(path, props['path'])}'")
+                    ret.append(props)
+
+        if self.get_option('checksum'):
+            def add_checksum(props):
+                try:
+                    props['checksum'] = file_checksum(props['src'], checksum_algorithm)
+                except OSError as e:
+                    display.warning(f"filetree: Error reading file {props['src']} ({e})")
+
+            files = [props for props in ret if props['state'] == 'file']
+            with ThreadPoolExecutor(max_workers=CHECKSUM_WORKERS) as executor:
+                # consume the results so that the pool finishes before returning
+                list(executor.map(add_checksum, files))
 
         return ret
@@ -121,6 +121,7 @@ RETURN = """
 """
 
 import re
+from collections import ChainMap
 
 from ansible.errors import AnsibleError
 from ansible.plugins.lookup import LookupBase
@@ -139,6 +140,7 @@ def _verify_and_get_type(variable):
 
 
 class LookupModule(LookupBase):
+
     def run(self, terms, variables=None, **kwargs):
         self.set_options(direct=kwargs)
         initial_value = self.get_option("initial_value", None)
@@ -147,23 +149,40 @@ class LookupModule(LookupBase):
         self._groups = self.get_option('groups', None)
 
         ret = []
+        group_hosts = None
         for term in terms:
             if not isinstance(term, str):
                 raise AnsibleError(f"Non-string type '{type(term)}' passed, only 'str' types are allowed!")
 
+            matcher = self._get_matcher(term)
             if not self._groups:  # consider only own variables
-                ret.append(self._merge_vars(term, initial_value, variables))
+                ret.append(self._merge_vars(term, initial_value, variables, matcher=matcher))
             else:  # consider variables of hosts in given groups
+                if group_hosts is None:
+                    group_hosts = self._get_group_hosts(variables["hostvars"])
                 cross_host_merge_result = initial_value
-                for host in variables["hostvars"]:
-                    if self._is_host_in_allowed_groups(variables["hostvars"][host]["group_names"]):
-                        host_variables = dict(variables["hostvars"].raw_get(host))
-                        host_variables["hostvars"] = variables["hostvars"]  # re-add hostvars
-                        cross_host_merge_result = self._merge_vars(term, cross_host_merge_result, host_variables)
+                for host_variables, sorted_names in group_hosts:
+                    var_merge_names = [key for key in sorted_names if matcher(key)]
+                    # only add hostvars to the variables of the host when templating, instead of copying them
+                    template_variables = ChainMap({"hostvars": variables["hostvars"]}, host_variables)
+                    cross_host_merge_result = self._merge_vars(
+                        term, cross_host_merge_result, template_variables, matcher=matcher, var_merge_names=var_merge_names)
                 ret.append(cross_host_merge_result)
 
         return ret
 
+    def _get_group_hosts(self, hostvars):
+        """
+        Return the raw variables and their sorted names for every host in the given groups.
+        The variables of every host are only retrieved once per run, independent of the number of terms.
+        """
+        group_hosts = []
+        for host in hostvars:
+            host_variables = hostvars.raw_get(host)
+            if self._is_host_in_allowed_groups(host_variables["group_names"]):
+                group_hosts.append((host_variables, sorted(key for key in host_variables.keys() if key != "hostvars")))
+        return group_hosts
+
     def _is_host_in_allowed_groups(self, host_groups):
         if 'all' in self._groups:
             return True
@@ -174,20 +193,25 @@ class LookupModule(LookupBase):
 
         return False
 
-    def _var_matches(self, key, search_pattern):
+    def _get_matcher(self, search_pattern):
         if self._pattern_type == "prefix":
-            return key.startswith(search_pattern)
+            return lambda key: key.startswith(search_pattern)
         elif self._pattern_type == "suffix":
-            return key.endswith(search_pattern)
+            return lambda key: key.endswith(search_pattern)
         elif self._pattern_type == "regex":
-            matcher = re.compile(search_pattern)
-            return matcher.search(key)
+            return re.compile(search_pattern).search
 
-        return False
+        return lambda key: False
+
+    def _var_matches(self, key, search_pattern):
+        return self._get_matcher(search_pattern)(key)
 
-    def _merge_vars(self, search_pattern, initial_value, variables):
+    def _merge_vars(self, search_pattern, initial_value, variables, matcher=None, var_merge_names=None):
         display.vvv(f"Merge variables with {self._pattern_type}: {search_pattern}")
-        var_merge_names = sorted([key for key in variables.keys() if self._var_matches(key, search_pattern)])
+        if var_merge_names is None:
+            if matcher is None:
+                matcher = self._get_matcher(search_pattern)
+            var_merge_names = sorted([key for key in variables.keys() if matcher(key)])
         display.vvv(f"The following variables will be merged: {var_merge_names}")
         prev_var_type = None
         result = None
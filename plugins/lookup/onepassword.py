@@ -38,6 +38,7 @@ DOCUMENTATION = '''
     extends_documentation_fragment:
       - community.general.onepassword
       - community.general.onepassword.lookup
+      - community.general.secret_cache
 '''
 
 EXAMPLES = """
@@ -96,6 +97,7 @@ from ansible.module_utils.common.text.converters import to_bytes, to_text
 from ansible.module_utils.six import with_metaclass
 
 from ansible_collections.community.general.plugins.module_utils.onepassword import OnePasswordConfig
+from ansible_collections.community.general.plugins.plugin_utils.secret_cache import SecretCache
 
 
 def _lower_if_possible(value):
@@ -609,6 +611,7 @@ class OnePass(object):
 
         self.logged_in = False
         self.token = None
+        self.cache = None
 
         self._config = OnePasswordConfig()
         self._cli = self._get_cli_class(cli_class)
@@ -663,8 +666,21 @@ class OnePass(object):
         else:
             self.set_token()
 
+    def _cache_key(self, item_id, vault=None):
+        return [self.domain, self.subdomain, self.account_id, self.connect_host, vault, item_id]
+
+    def is_cached(self, item_id, vault=None):
+        return self.cache is not None and self.cache.get(self._cache_key(item_id, vault)) is not None
+
     def get_raw(self, item_id, vault=None):
+        if self.cache is not None:
+            out = self.cache.get(self._cache_key(item_id, vault))
+            if out is not None:
+                return out
+
         rc, out, err = self._cli.get_raw(item_id, vault, self.token)
+        if self.cache is not None and out:
+            self.cache.set(self._cache_key(item_id, vault), out)
         return out
 
     def get_field(self, item_id, field, section=None, vault=None):
@@ -704,7 +720,10 @@ class LookupModule(LookupBase):
             connect_host=connect_host,
             connect_token=connect_token,
         )
-        op.assert_logged_in()
+        op.cache = SecretCache.from_options(self, 'onepassword')
+        # signing in runs the op CLI as well, skip it if all items are cached
+        if not all(op.is_cached(term, vault) for term in terms):
+            op.assert_logged_in()
 
         values = []
         for term in terms:
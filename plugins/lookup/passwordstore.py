@@ -157,8 +157,26 @@ DOCUMENTATION = '''
         ini:
           - section: passwordstore_lookup
             key: missing_subkey
+      workers:
+        description:
+          - Number of pass files that are read concurrently before the terms are processed.
+          - If set to a value greater than V(1) and more than one term is looked up, the existing pass files of all terms are
+            read in a batch by a pool of this many workers. Terms that create or overwrite a password still read the pass file
+            again under the O(lock=write) lock.
+          - If O(lock=readwrite), the batch is read by a single worker while holding the lock, so C(gpg-agent) is never called
+            in parallel.
+        type: int
+        default: 1
+        ini:
+          - section: passwordstore_lookup
+            key: workers
+        version_added: 10.5.0
     notes:
       - The lookup supports passing all options as lookup parameters since community.general 6.0.0.
+      - With O(secret_cache) enabled, the content of every pass file is cached. Pass files that are created or updated
+        by this lookup are removed from the cache.
+    extends_documentation_fragment:
+      - community.general.secret_cache
 '''
 EXAMPLES = """
 ansible.cfg: |
@@ -241,6 +259,7 @@ _raw:
   elements: str
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 import os
 import re
@@ -257,6 +276,7 @@ from ansible.plugins.lookup import LookupBase
 from ansible import constants as C
 
 from ansible_collections.community.general.plugins.module_utils._filelock import FileLock
+from ansible_collections.community.general.plugins.plugin_utils.secret_cache import SecretCache
 
 display = Display()
 
@@ -305,6 +325,9 @@ class LookupModule(LookupBase):
 
         super(LookupModule, self).__init__(loader, templar, **kwargs)
         self.realpass = None
+        self.cache = None
+        self._prefetched = {}
+        self._parsed = {}
 
     def is_real_pass(self):
         if self.realpass is None:
@@ -375,24 +398,118 @@ class LookupModule(LookupBase):
                 else:
                     self.env['PASSWORD_STORE_UMASK'] = self.paramvals['umask']
 
+    def _cache_key(self):
+        return [self.backend, self.paramvals['directory'], self.passname]
+
+    def _read_pass(self, passname, env):
+        return to_text(
+            check_output2([self.pass_cmd, 'show'] +
+                          [passname], env=env),
+            errors='surrogate_or_strict'
+        )
+
+    def show_pass(self):
+        # under the write lock, always read the current content of the pass file
+        fresh = self.locked == 'write'
+        key = tuple(self._cache_key())
+        if not fresh and key in self._prefetched:
+            output = self._prefetched[key]
+            if isinstance(output, subprocess.CalledProcessError):
+                raise output
+            return output
+
+        if self.cache is not None and not fresh:
+            output = self.cache.get(self._cache_key())
+            if output is not None:
+                return output
+
+        output = self._read_pass(self.passname, self.env)
+        if self.cache is not None:
+            self.cache.set(self._cache_key(), output)
+        return output
+
+    def insert_pass(self, msg):
+        try:
+            check_output2([self.pass_cmd, 'insert', '-f', '-m', self.passname], input=msg, env=self.env)
+        except (subprocess.CalledProcessError) as e:
+            raise AnsibleError(f'exit code {e.returncode} while running {e.cmd}. Error output: {e.output}')
+        finally:
+            key = tuple(self._cache_key())
+            self._prefetched.pop(key, None)
+            self._parsed.pop(key, None)
+            if self.cache is not None:
+                self.cache.invalidate(self._cache_key())
+
+    def prefetch(self, terms):
+        """Read the pass files of all terms concurrently, before the terms are processed one by one"""
+        workers = self.get_option('workers')
+        if workers < 2 or len(terms) < 2:
+            return
+
+        paramvals = dict(self.paramvals)
+        pending = {}
+        try:
+            for term in terms:
+                try:
+                    self.parse_params(term)
+                except AnsibleError:
+                    # raised again when the term is processed
+                    break
+                key = tuple(self._cache_key())
+                if key in pending or key in self._prefetched:
+                    continue
+                if self.backend == 'pass' and not os.path.isfile(os.path.join(self.paramvals['directory'], f"{self.passname}.gpg")):
+                    continue
+                if self.cache is not None and self.cache.get(self._cache_key()) is not None:
+                    continue
+                pending[key] = (self.passname, self.env)
+        finally:
+            # term parameters are applied again, in order, when the terms are processed
+            self.paramvals = paramvals
+
+        if len(pending) < 2:
+            return
+
+        def read(item):
+            try:
+                return self._read_pass(*item)
+            except subprocess.CalledProcessError as e:
+                return e
+
+        if self.get_option('lock') == 'readwrite':
+            workers = 1
+        with self.opt_lock('readwrite'):
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                outputs = executor.map(read, pending.values())
+                for key, output in zip(pending, outputs):
+                    self._prefetched[key] = output
+                    if self.cache is not None and not isinstance(output, subprocess.CalledProcessError):
+                        self.cache.set(list(key), output)
+
+    def parse_pass(self, output):
+        passoutput = output.splitlines()
+        passdict = {}
+        try:
+            values = yaml.safe_load('\n'.join(passoutput[1:]))
+            for key, item in values.items():
+                passdict[key] = item
+        except (yaml.YAMLError, AttributeError):
+            for line in passoutput[1:]:
+                if ':' in line:
+                    name, value = line.split(':', 1)
+                    passdict[name.strip()] = value.strip()
+        return passoutput, passdict
+
     def check_pass(self):
         try:
-            self.passoutput = to_text(
-                check_output2([self.pass_cmd, 'show'] +
-                              [self.passname], env=self.env),
-                errors='surrogate_or_strict'
-            ).splitlines()
+            output = self.show_pass()
+            key = tuple(self._cache_key())
+            parsed = self._parsed.get(key)
+            if parsed is None or parsed[0] != output:
+                parsed = (output, ) + self.parse_pass(output)
+                self._parsed[key] = parsed
+            self.passoutput, self.passdict = parsed[1], parsed[2]
             self.password = self.passoutput[0]
-            self.passdict = {}
-            try:
-                values = yaml.safe_load('\n'.join(self.passoutput[1:]))
-                for key, item in values.items():
-                    self.passdict[key] = item
-            except (yaml.YAMLError, AttributeError):
-                for line in self.passoutput[1:]:
-                    if ':' in line:
-                        name, value = line.split(':', 1)
-                        self.passdict[name.strip()] = value.strip()
             if (self.backend == 'gopass' or
                     os.path.isfile(os.path.join(self.paramvals['directory'], f"{self.passname}.gpg"))
                     or not self.is_real_pass()):
@@ -464,10 +581,7 @@ class LookupModule(LookupBase):
                 if self.paramvals['timestamp'] and self.paramvals['backup']:
                     msg += f"lookup_pass: old password was {self.password} (Updated on {datetime})\n"
 
-        try:
-            check_output2([self.pass_cmd, 'insert', '-f', '-m', self.passname], input=msg, env=self.env)
-        except (subprocess.CalledProcessError) as e:
-            raise AnsibleError(f'exit code {e.returncode} while running {e.cmd}. Error output: {e.output}')
+        self.insert_pass(msg)
         return newpass
 
     def generate_password(self):
@@ -485,10 +599,7 @@ class LookupModule(LookupBase):
         if self.paramvals['timestamp']:
             msg += f"\nlookup_pass: First generated by ansible on {datetime}\n"
 
-        try:
-            check_output2([self.pass_cmd, 'insert', '-f', '-m', self.passname], input=msg, env=self.env)
-        except (subprocess.CalledProcessError) as e:
-            raise AnsibleError(f'exit code {e.returncode} while running {e.cmd}. Error output: {e.output}')
+        self.insert_pass(msg)
 
         return newpass
 
@@ -567,8 +678,13 @@ class LookupModule(LookupBase):
     def run(self, terms, variables, **kwargs):
         self.set_options(var_options=variables, direct=kwargs)
         self.setup(variables)
+        self.cache = SecretCache.from_options(self, 'passwordstore')
+        self._prefetched = {}
+        self._parsed = {}
         result = []
 
+        self.prefetch(terms)
+
         for term in terms:
             self.parse_params(term)   # parse the input into paramvals
             with self.opt_lock('readwrite'):
@@ -19,8 +19,21 @@ try:
 except ImportError:
     from urllib.parse import urljoin  # Python 3+
 
+import random
+import time
 import traceback
 
+try:
+    from concurrent.futures import ThreadPoolExecutor
+    HAS_THREAD_POOL = True
+except ImportError:
+    HAS_THREAD_POOL = False
+
+# Number of variables created, updated or deleted concurrently
+VARIABLE_WRITE_WORKERS = 4
+# How often a write rejected by the rate limiter of GitLab is retried, with exponential backoff
+RATE_LIMIT_RETRIES = 5
+
 
 def _determine_list_all_kwargs(version):
     gitlab_version = LooseVersion(version)
@@ -177,3 +190,68 @@ def vars_to_variables(vars, module):
             module.fail_json(msg="value must be of type string, integer, float or dict")
 
     return variables
+
+
+def variable_id(variable):
+    # instance variables have no environment scope
+    return variable.get('key'), variable.get('environment_scope')
+
+
+def index_variables(variables):
+    return dict((variable_id(item), item) for item in variables)
+
+
+def variable_items(variable):
+    # hashable form of a variable, for exact comparisons against sets
+    return frozenset(variable.items())
+
+
+def _retry_rate_limited(func, item):
+    delay = 1
+    for attempt in range(RATE_LIMIT_RETRIES + 1):
+        try:
+            return func(item)
+        except gitlab.exceptions.GitlabError as e:
+            if e.response_code != 429 or attempt == RATE_LIMIT_RETRIES:
+                raise
+        time.sleep(delay + random.uniform(0, delay))
+        delay *= 2
+
+
+def write_variables(this_gitlab, added=None, updated=None, removed=None):
+    """ Creates, updates and deletes variables concurrently with the create_variable,
+    update_variable and delete_variable methods of this_gitlab. Writes rejected with
+    HTTP 429 are retried with exponential backoff. A variable that cannot be created
+    is updated instead.
+
+    Returns a dict with the lists of the variables added, updated and removed.
+    """
+    def create(item):
+        try:
+            return _retry_rate_limited(this_gitlab.create_variable, item) and 'added'
+        except Exception:
+            # the variable exists after all, for instance because it was created concurrently
+            return _retry_rate_limited(this_gitlab.update_variable, item) and 'updated'
+
+    def update(item):
+        return _retry_rate_limited(this_gitlab.update_variable, item) and 'updated'
+
+    def delete(item):
+        return _retry_rate_limited(this_gitlab.delete_variable, item) and 'removed'
+
+    writes = [(create, item) for item in added or []]
+    writes += [(update, item) for item in updated or []]
+    writes += [(delete, item) for item in removed or []]
+
+    if HAS_THREAD_POOL and len(writes) > 1:
+        with ThreadPoolExecutor(max_workers=VARIABLE_WRITE_WORKERS) as executor:
+            futures = [executor.submit(func, item) for func, item in writes]
+            results = [future.result() for future in futures]
+    else:
+        results = [func(item) for func, item in writes]
+
+    return_value = dict(added=[], updated=[], removed=[])
+    for (func, item), result in zip(writes, results):
+        if result:
+            return_value[result].append(item)
+    return return_value
@@ -7,10 +7,16 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import fcntl
 import json
+import os
+import stat
+import tempfile
+import time
 import traceback
 import copy
 
+from ansible.module_utils.basic import env_fallback
 from ansible.module_utils.urls import open_url
 from ansible.module_utils.six.moves.urllib.parse import urlencode, quote
 from ansible.module_utils.six.moves.urllib.error import HTTPError
@@ -20,6 +26,8 @@ URL_REALM_INFO = "{url}/realms/{realm}"
 URL_REALMS = "{url}/admin/realms"
 URL_REALM = "{url}/admin/realms/{realm}"
 URL_REALM_KEYS_METADATA = "{url}/admin/realms/{realm}/keys"
+URL_REALM_PARTIAL_EXPORT = "{url}/admin/realms/{realm}/partial-export"
+URL_REALM_PARTIAL_IMPORT = "{url}/admin/realms/{realm}/partialImport"
 
 URL_TOKEN = "{url}/realms/{realm}/protocol/openid-connect/token"
 URL_CLIENT = "{url}/admin/realms/{realm}/clients/{id}"
@@ -125,6 +133,10 @@ URL_AUTHZ_RESOURCES = "{url}/admin/realms/{realm}/clients/{client_id}/authz/reso
 URL_AUTHZ_CUSTOM_POLICY = "{url}/admin/realms/{realm}/clients/{client_id}/authz/resource-server/policy/{policy_type}"
 URL_AUTHZ_CUSTOM_POLICIES = "{url}/admin/realms/{realm}/clients/{client_id}/authz/resource-server/policy"
 
+# Cached tokens are considered expired this many seconds before Keycloak expires them,
+# so that a token does not run out between being read from the cache and being used.
+TOKEN_CACHE_EXPIRY_MARGIN = 30
+
 
 def keycloak_argument_spec():
     """
@@ -143,6 +155,7 @@ def keycloak_argument_spec():
         connection_timeout=dict(type='int', default=10),
         token=dict(type='str', no_log=True),
         refresh_token=dict(type='str', no_log=True),
+        token_cache=dict(type='path', fallback=(env_fallback, ['KEYCLOAK_TOKEN_CACHE'])),
         http_agent=dict(type='str', default='Ansible'),
     )
 
@@ -160,9 +173,8 @@ class KeycloakError(Exception):
         return str(self.msg)
 
 
-def _token_request(module_params, payload):
-    """ Obtains connection header with token for the authentication,
-    using the provided auth_username/auth_password
+def _token_response(module_params, payload):
+    """ Sends an authentication request to the token endpoint of the realm
     :param module_params: parameters of the module
     :param payload:
        type:
@@ -173,7 +185,7 @@ def _token_request(module_params, payload):
            along with parameters based on 'grant_type'; e.g.,
            'username'/'password' for type 'password',
            'refresh_token' for type 'refresh_token'.
-    :return: access token
+    :return: token endpoint response, containing at least 'access_token'
     """
     base_url = module_params.get('auth_keycloak_url')
     if not base_url.lower().startswith(('http', 'https')):
@@ -188,26 +200,31 @@ def _token_request(module_params, payload):
         r = json.loads(to_native(open_url(auth_url, method='POST',
                                           validate_certs=validate_certs, http_agent=http_agent, timeout=connection_timeout,
                                           data=urlencode(payload)).read()))
-
-        return r['access_token']
     except ValueError as e:
         raise KeycloakError(
             'API returned invalid JSON when trying to obtain access token from %s: %s'
             % (auth_url, str(e)))
-    except KeyError:
-        raise KeycloakError(
-            'API did not include access_token field in response from %s' % auth_url)
     except Exception as e:
         raise KeycloakError('Could not obtain access token from %s: %s'
                             % (auth_url, str(e)), authError=e)
 
+    if not isinstance(r, dict) or 'access_token' not in r:
+        raise KeycloakError(
+            'API did not include access_token field in response from %s' % auth_url)
+    return r
+
 
-def _request_token_using_credentials(module_params):
+def _token_request(module_params, payload):
     """ Obtains connection header with token for the authentication,
     using the provided auth_username/auth_password
-    :param module_params: parameters of the module. Must include 'auth_username' and 'auth_password'.
-    :return: connection header
+    :param module_params: parameters of the module
+    :param payload: authentication request payload, see _token_response
+    :return: access token
     """
+    return _token_response(module_params, payload)['access_token']
+
+
+def _credentials_payload(module_params):
     client_id = module_params.get('auth_client_id')
     auth_username = module_params.get('auth_username')
     auth_password = module_params.get('auth_password')
@@ -221,19 +238,11 @@ def _request_token_using_credentials(module_params):
         'password': auth_password,
     }
     # Remove empty items, for instance missing client_secret
-    payload = {k: v for k, v in temp_payload.items() if v is not None}
-
-    return _token_request(module_params, payload)
+    return {k: v for k, v in temp_payload.items() if v is not None}
 
 
-def _request_token_using_refresh_token(module_params):
-    """ Obtains connection header with token for the authentication,
-    using the provided refresh_token
-    :param module_params: parameters of the module. Must include 'refresh_token'.
-    :return: connection header
-    """
+def _refresh_token_payload(module_params, refresh_token):
     client_id = module_params.get('auth_client_id')
-    refresh_token = module_params.get('refresh_token')
     client_secret = module_params.get('auth_client_secret')
 
     temp_payload = {
@@ -243,9 +252,161 @@ def _request_token_using_refresh_token(module_params):
         'refresh_token': refresh_token,
     }
     # Remove empty items, for instance missing client_secret
-    payload = {k: v for k, v in temp_payload.items() if v is not None}
+    return {k: v for k, v in temp_payload.items() if v is not None}
+
+
+def _request_token_using_credentials(module_params):
+    """ Obtains connection header with token for the authentication,
+    using the provided auth_username/auth_password
+    :param module_params: parameters of the module. Must include 'auth_username' and 'auth_password'.
+    :return: connection header
+    """
+    return _token_request(module_params, _credentials_payload(module_params))
 
-    return _token_request(module_params, payload)
+
+def _request_token_using_refresh_token(module_params):
+    """ Obtains connection header with token for the authentication,
+    using the provided refresh_token
+    :param module_params: parameters of the module. Must include 'refresh_token'.
+    :return: connection header
+    """
+    return _token_request(module_params, _refresh_token_payload(module_params, module_params.get('refresh_token')))
+
+
+class KeycloakTokenCache(object):
+    """ Access and refresh tokens shared between module invocations through a file only readable
+    by its owner. Entries are keyed by Keycloak URL, realm, client ID and user, so every
+    task and host that authenticates the same way reuses the same token until shortly
+    before it expires. An exclusive lock on a companion lock file serializes the
+    invocations that need a new token, so that only one of them asks Keycloak for it.
+    """
+
+    def __init__(self, module_params):
+        self.path = module_params.get('token_cache')
+        self.module_params = module_params
+        self.key = json.dumps([
+            module_params.get('auth_keycloak_url').rstrip('/'),
+            module_params.get('auth_realm'),
+            module_params.get('auth_client_id'),
+            module_params.get('auth_username'),
+        ])
+
+    @staticmethod
+    def _open_private(path, flags):
+        """ Opens a file of the cache without following symbolic links, and makes sure that
+        it is a regular file owned by the current user that nobody else can access.
+        """
+        try:
+            fd = os.open(path, flags | os.O_NOFOLLOW, 0o600)
+        except (IOError, OSError) as e:
+            raise KeycloakError('Cannot open token cache file %s: %s' % (path, to_native(e)))
+        st = os.fstat(fd)
+        if not stat.S_ISREG(st.st_mode) or st.st_uid != os.getuid() or stat.S_IMODE(st.st_mode) & 0o077:
+            os.close(fd)
+            raise KeycloakError('Refusing to use token cache file %s, it must be a regular file owned by the current user '
+                                'that is not accessible by group or others' % path)
+        return fd
+
+    @staticmethod
+    def _check_directory(directory):
+        # the tokens are safe in a listable directory, but not in one where others can replace the cache files
+        st = os.stat(directory)
+        if st.st_uid != os.getuid() or stat.S_IMODE(st.st_mode) & 0o022:
+            raise KeycloakError('Refusing to use token cache directory %s, it must be owned by the current user '
+                                'and not writable by group or others' % directory)
+
+    def _read(self):
+        if not os.path.lexists(self.path):
+            return {}
+        fd = self._open_private(self.path, os.O_RDONLY)
+        try:
+            with os.fdopen(fd) as f:
+                entries = json.load(f)
+        except ValueError:
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def _store(self, response):
+        now = time.time()
+        entries = self._read()
+        # Drop the entries nobody can use anymore so that the file does not grow forever
+        entries = dict((k, v) for k, v in entries.items() if self._usable(v, now))
+        previous = entries.get(self.key, {})
+        entry = {
+            'access_token': response['access_token'],
+            'expires_at': now + response.get('expires_in', 0),
+        }
+        # With refresh token rotation Keycloak hands out a new refresh token on every refresh;
+        # without it the previous one stays valid and is kept
+        if response.get('refresh_token'):
+            entry['refresh_token'] = response['refresh_token']
+            refresh_expires_in = response.get('refresh_expires_in', 0)
+            entry['refresh_expires_at'] = now + refresh_expires_in if refresh_expires_in else None
+        elif previous.get('refresh_token'):
+            entry['refresh_token'] = previous['refresh_token']
+            entry['refresh_expires_at'] = previous.get('refresh_expires_at')
+        entries[self.key] = entry
+
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path) or '.', prefix='.keycloak_token_cache')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entries, f)
+            os.rename(tmp_path, self.path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+    @staticmethod
+    def _access_token_valid(entry, now):
+        return entry.get('expires_at', 0) - TOKEN_CACHE_EXPIRY_MARGIN > now
+
+    @staticmethod
+    def _refresh_token_valid(entry, now):
+        if not entry.get('refresh_token'):
+            return False
+        refresh_expires_at = entry.get('refresh_expires_at')
+        return refresh_expires_at is None or refresh_expires_at - TOKEN_CACHE_EXPIRY_MARGIN > now
+
+    def _usable(self, entry, now):
+        return isinstance(entry, dict) and (self._access_token_valid(entry, now) or self._refresh_token_valid(entry, now))
+
+    def get_token(self, rejected_token=None):
+        """ Returns a valid access token, from the cache if possible, otherwise obtained
+        with the cached refresh token or the module credentials and stored in the cache.
+
+        :param rejected_token: access token Keycloak just refused; it is not returned again
+        :return: access token
+        """
+        directory = os.path.dirname(self.path) or '.'
+        if not os.path.isdir(directory):
+            os.makedirs(directory, 0o700)
+        self._check_directory(directory)
+        lock_fd = self._open_private(self.path + '.lock', os.O_RDWR | os.O_CREAT)
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX)
+            now = time.time()
+            entry = self._read().get(self.key)
+            if not isinstance(entry, dict):
+                entry = {}
+
+            if self._access_token_valid(entry, now) and entry['access_token'] != rejected_token:
+                return entry['access_token']
+
+            response = None
+            if self._refresh_token_valid(entry, now):
+                try:
+                    response = _token_response(self.module_params, _refresh_token_payload(self.module_params, entry['refresh_token']))
+                except KeycloakError as e:
+                    # Token refresh returns 400 if the refresh token is expired or was revoked
+                    if e.authError is None or getattr(e.authError, 'code', None) != 400:
+                        raise e
+            if response is None:
+                response = _token_response(self.module_params, _credentials_payload(self.module_params))
+
+            self._store(response)
+            return response['access_token']
+        finally:
+            os.close(lock_fd)
 
 
 def get_token(module_params):
@@ -257,7 +418,10 @@ def get_token(module_params):
     token = module_params.get('token')
 
     if token is None:
-        token = _request_token_using_credentials(module_params)
+        if module_params.get('token_cache'):
+            token = KeycloakTokenCache(module_params).get_token()
+        else:
+            token = _request_token_using_credentials(module_params)
 
     return {
         'Authorization': 'Bearer ' + token,
@@ -382,7 +546,11 @@ class KeycloakAPI(object):
             auth_username = self.module.params.get('auth_username')
             auth_password = self.module.params.get('auth_password')
             if auth_username is not None and auth_password is not None:
-                token = _request_token_using_credentials(self.module.params)
+                if self.module.params.get('token_cache'):
+                    rejected_token = self.restheaders['Authorization'][len('Bearer '):]
+                    token = KeycloakTokenCache(self.module.params).get_token(rejected_token=rejected_token)
+                else:
+                    token = _request_token_using_credentials(self.module.params)
                 self.restheaders['Authorization'] = 'Bearer ' + token
 
                 r = make_request_catching_401()
@@ -523,6 +691,44 @@ class KeycloakAPI(object):
             self.fail_request(e, msg='Could not delete realm %s: %s' % (realm, str(e)),
                               exception=traceback.format_exc())
 
+    def export_realm(self, realm='master', export_clients=True, export_groups_and_roles=True):
+        """ Obtain a partial export of a realm in a single request
+
+        Secrets in the export, for instance client secrets, are masked by Keycloak.
+
+        :param realm: realm to be exported
+        :param export_clients: whether to include the clients of the realm
+        :param export_groups_and_roles: whether to include the groups, realm roles and client roles of the realm
+        :return: realm representation
+        """
+        export_url = URL_REALM_PARTIAL_EXPORT.format(url=self.baseurl, realm=realm)
+        export_url += '?' + urlencode(dict(exportClients=str(export_clients).lower(),
+                                           exportGroupsAndRoles=str(export_groups_and_roles).lower()))
+
+        try:
+            return self._request_and_deserialize(export_url, method='POST')
+        except ValueError as e:
+            self.module.fail_json(msg='API returned incorrect JSON when trying to export realm %s: %s' % (realm, str(e)))
+        except Exception as e:
+            self.fail_request(e, msg='Could not export realm %s: %s' % (realm, str(e)))
+
+    def partial_import_realm(self, rep, realm='master'):
+        """ Create or overwrite clients, roles, groups, users and identity providers of a realm in a single request
+
+        :param rep: partial import representation; the 'ifResourceExists' key sets what Keycloak does with
+                    objects that already exist ('FAIL', 'SKIP' or 'OVERWRITE')
+        :param realm: realm to import into
+        :return: dict with the counts 'added', 'overwritten' and 'skipped', and the per-object 'results'
+        """
+        import_url = URL_REALM_PARTIAL_IMPORT.format(url=self.baseurl, realm=realm)
+
+        try:
+            return self._request_and_deserialize(import_url, method='POST', data=json.dumps(rep))
+        except ValueError as e:
+            self.module.fail_json(msg='API returned incorrect JSON when trying to import into realm %s: %s' % (realm, str(e)))
+        except Exception as e:
+            self.fail_request(e, msg='Could not import into realm %s: %s' % (realm, str(e)))
+
     def get_clients(self, realm='master', filter=None):
         """ Obtains client representations for clients in a realm
 
@@ -918,6 +1124,55 @@ class KeycloakAPI(object):
             self.fail_request(e, msg="Could not fetch effective rolemappings for user %s, realm %s: %s"
                                      % (uid, realm, str(e)))
 
+    def get_users(self, realm="master", brief_representation=False, page_size=500):
+        """ Fetch all users of a realm, a page of page_size users per request.
+
+        :param realm: Realm from which to obtain the users; default 'master'
+        :param brief_representation: Only return the basic attributes of the users
+        :param page_size: Number of users requested at once
+        :return: list of user representations
+        """
+        users = []
+        while True:
+            users_url = URL_USERS.format(url=self.baseurl, realm=realm)
+            users_url += '?' + urlencode(dict(briefRepresentation=str(brief_representation).lower(),
+                                              first=len(users), max=page_size))
+            try:
+                page = self._request_and_deserialize(users_url, method='GET')
+            except ValueError as e:
+                self.module.fail_json(msg='API returned incorrect JSON when trying to obtain the users of realm %s: %s'
+                                          % (realm, str(e)))
+            except Exception as e:
+                self.fail_request(e, msg='Could not obtain the users of realm %s: %s'
+                                         % (realm, str(e)))
+            users.extend(page)
+            if len(page) < page_size:
+                return users
+
+    def get_user_memberships(self, user_id, realm="master"):
+        """ Fetch the group memberships and role mappings of a user, in the form of the 'groups',
+        'realmRoles' and 'clientRoles' keys of the user representations in a realm export.
+
+        :param user_id: ID of the user
+        :param realm: Realm in which the user resides; default 'master'
+        :return: dict with the group paths, the realm role names and the client role names by clientId
+        """
+        try:
+            groups = self._request_and_deserialize(URL_USER_GROUPS.format(url=self.baseurl, realm=realm, id=user_id), method='GET')
+            mappings = self._request_and_deserialize(URL_USER_ROLE_MAPPINGS.format(url=self.baseurl, realm=realm, id=user_id), method='GET')
+        except ValueError as e:
+            self.module.fail_json(msg='API returned incorrect JSON when trying to obtain the memberships of user %s in realm %s: %s'
+                                      % (user_id, realm, str(e)))
+        except Exception as e:
+            self.fail_request(e, msg='Could not obtain the memberships of user %s in realm %s: %s'
+                                     % (user_id, realm, str(e)))
+        return dict(
+            groups=[group['path'] for group in groups],
+            realmRoles=[role['name'] for role in mappings.get('realmMappings') or []],
+            clientRoles=dict((client_id, [role['name'] for role in client.get('mappings') or []])
+                             for client_id, client in (mappings.get('clientMappings') or {}).items()),
+        )
+
     def get_user_by_username(self, username, realm="master"):
         """ Fetch a keycloak user within a realm based on its username.
 
@@ -117,6 +117,33 @@ class LXDClient(object):
         except socket.error as e:
             raise LXDClientException('cannot connect to the LXD server', err=e)
 
+    def request_raw(self, method, url, body=None, headers=None):
+        """Send a request whose body and response are not JSON, like the file and log endpoints.
+
+        :param body: The request body, bytes or a file object.
+        :param headers: The request headers.
+        :return: The response. It must be read completely before the next request is sent.
+        """
+        try:
+            self.connection.request(method, url, body=body, headers=headers or {})
+            resp = self.connection.getresponse()
+            if resp.status >= 400:
+                resp_data = to_text(resp.read(), errors='surrogate_or_strict')
+        except socket.error as e:
+            raise LXDClientException('cannot connect to the LXD server', err=e)
+        self.logs.append({
+            'type': 'sent request',
+            'request': {'method': method, 'url': url, 'headers': headers},
+            'response': {'status': resp.status},
+        })
+        if resp.status >= 400:
+            try:
+                resp_json = json.loads(resp_data)
+            except ValueError:
+                resp_json = {'error': resp_data}
+            self._raise_err_from_json(resp_json)
+        return resp
+
     def _raise_err_from_json(self, resp_json):
         err_params = {}
         if self.debug:
@@ -6,14 +6,18 @@
 from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
+import base64
+import copy
 import json
 import os
 import random
+import socket
 import string
 import gzip
+import threading
 import time
 from io import BytesIO
-from ansible.module_utils.urls import open_url
+from ansible.module_utils.urls import open_url, make_context
 from ansible.module_utils.common.text.converters import to_native
 from ansible.module_utils.common.text.converters import to_text
 from ansible.module_utils.common.text.converters import to_bytes
@@ -21,9 +25,16 @@ from ansible.module_utils.six import text_type
 from ansible.module_utils.six.moves import http_client
 from ansible.module_utils.six.moves.urllib.error import URLError, HTTPError
 from ansible.module_utils.six.moves.urllib.parse import urlparse
+from ansible.module_utils.six.moves.urllib.request import getproxies, proxy_bypass
 from ansible.module_utils.ansible_release import __version__ as ansible_version
 from ansible_collections.community.general.plugins.module_utils.version import LooseVersion
 
+try:
+    from concurrent.futures import ThreadPoolExecutor
+    HAS_THREAD_POOL = True
+except ImportError:
+    HAS_THREAD_POOL = False
+
 GET_HEADERS = {'accept': 'application/json', 'OData-Version': '4.0'}
 POST_HEADERS = {'content-type': 'application/json', 'accept': 'application/json',
                 'OData-Version': '4.0'}
@@ -33,14 +44,215 @@ PUT_HEADERS = {'content-type': 'application/json', 'accept': 'application/json',
                'OData-Version': '4.0'}
 DELETE_HEADERS = {'accept': 'application/json', 'OData-Version': '4.0'}
 
+# Size of the chunks read from files while they are sent in a multipart body
+MULTIPART_CHUNK_SIZE = 1024 * 1024
+
 FAIL_MSG = 'Issuing a data modification command without specifying the '\
            'ID of the target %(resource)s resource when there is more '\
            'than one %(resource)s is no longer allowed. Use the `resource_id` '\
            'option to specify the target %(resource)s ID.'
 
 
+class MultipartBody(object):
+    """File-like multipart request body.
+
+    The parts are either bytes or dicts with the 'filename' of a file to
+    send. Files are only read while the body is sent, so the memory used
+    does not depend on the size of the files. The total length is known up
+    front and is returned by len() for the Content-Length header.
+    """
+
+    def __init__(self, parts, progress=None):
+        # List of (data, path, size) tuples; either data or path is None
+        self._parts = []
+        self.length = 0
+        for part in parts:
+            if isinstance(part, bytes):
+                self._parts.append((part, None, len(part)))
+            else:
+                path = to_bytes(part['filename'], errors='surrogate_or_strict')
+                self._parts.append((None, path, os.path.getsize(path)))
+            self.length += self._parts[-1][2]
+        self.progress = progress
+        self.sent = 0
+        self._index = 0
+        self._offset = 0
+        self._file = None
+
+    def __len__(self):
+        return self.length
+
+    def _read_part(self, size):
+        data, path, part_size = self._parts[self._index]
+        size = min(size, part_size - self._offset)
+        if data is not None:
+            chunk = data[self._offset:self._offset + size]
+        else:
+            if self._file is None:
+                self._file = open(path, 'rb')
+            chunk = self._file.read(size)
+            if len(chunk) < size:
+                raise IOError('%s has been truncated while it was sent' % to_native(path))
+        self._offset += len(chunk)
+        if self._offset >= part_size:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self._index += 1
+            self._offset = 0
+        return chunk
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self.length - self.sent
+        chunks = []
+        remaining = size
+        while remaining > 0 and self._index < len(self._parts):
+            chunk = self._read_part(min(remaining, MULTIPART_CHUNK_SIZE))
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        data = b''.join(chunks)
+        self.sent += len(data)
+        if data and self.progress is not None:
+            self.progress(self.sent, self.length)
+        return data
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class KeepAliveResponse(object):
+    """Response of a request sent over a persistent connection.
+
+    Provides the parts of the open_url response interface used by the
+    callers of RedfishUtils.get_request.
+    """
+
+    def __init__(self, url, response, body):
+        self.url = url
+        self.status = self.code = response.status
+        self.reason = response.reason
+        self.headers = response.msg
+        self._body = body
+
+    def getcode(self):
+        return self.status
+
+    def geturl(self):
+        return self.url
+
+    def getheader(self, name, default=None):
+        return self.headers.get(name, default)
+
+    def info(self):
+        return self.headers
+
+    def read(self):
+        body, self._body = self._body, b''
+        return body
+
+
+class KeepAliveConnections(object):
+    """Persistent HTTP(S) connections to the Redfish services, per thread.
+
+    open_url opens a new TCP and TLS connection for every request. Requests
+    sent with request() reuse the connection of the current thread to the
+    same host. If a request can not be handled the same way open_url would
+    handle it (proxies, redirects, authentication challenges), request()
+    returns None and the caller falls back to open_url.
+    """
+
+    REDIRECT_CODES = (301, 302, 303, 307, 308)
+
+    def __init__(self, ciphers=None):
+        self.ciphers = ciphers
+        self._local = threading.local()
+        self._context = None
+
+    def _get_connection(self, scheme, netloc, timeout):
+        connections = getattr(self._local, 'connections', None)
+        if connections is None:
+            connections = self._local.connections = {}
+        connection = connections.get((scheme, netloc))
+        if connection is None:
+            if scheme == 'https':
+                if self._context is None:
+                    self._context = make_context(ciphers=self.ciphers, validate_certs=False)
+                connection = http_client.HTTPSConnection(netloc, timeout=timeout, context=self._context)
+            else:
+                connection = http_client.HTTPConnection(netloc, timeout=timeout)
+            connections[(scheme, netloc)] = connection
+        connection.timeout = timeout
+        if connection.sock is not None:
+            connection.sock.settimeout(timeout)
+        return connection
+
+    def _drop_connection(self, scheme, netloc):
+        connection = self._local.connections.pop((scheme, netloc), None)
+        if connection is not None:
+            connection.close()
+
+    def close(self):
+        for key in list(getattr(self._local, 'connections', {})):
+            self._drop_connection(*key)
+
+    def request(self, method, url, headers, username=None, password=None, force_basic_auth=False, timeout=10):
+        parsed = urlparse(url)
+        if parsed.scheme not in ('http', 'https'):
+            return None
+        if parsed.scheme in getproxies() and not proxy_bypass(parsed.hostname):
+            return None
+
+        headers = dict(headers)
+        headers.setdefault('User-Agent', 'ansible-httpget')
+        if force_basic_auth and username:
+            credentials = to_bytes('%s:%s' % (username, password or ''), errors='surrogate_or_strict')
+            headers['Authorization'] = 'Basic %s' % to_native(base64.b64encode(credentials))
+        path = parsed.path or '/'
+        if parsed.query:
+            path = '%s?%s' % (path, parsed.query)
+
+        for attempt in (1, 2):
+            connection = self._get_connection(parsed.scheme, parsed.netloc, timeout)
+            reused = connection.sock is not None
+            try:
+                connection.request(method, path, headers=headers)
+                response = connection.getresponse()
+                body = response.read()
+            except (http_client.HTTPException, socket.error) as e:
+                self._drop_connection(parsed.scheme, parsed.netloc)
+                if reused and attempt == 1:
+                    # The service closed the idle connection; retry once on a new one
+                    continue
+                raise URLError(e)
+            break
+
+        if response.will_close:
+            self._drop_connection(parsed.scheme, parsed.netloc)
+
+        if response.status in self.REDIRECT_CODES:
+            return None
+        if response.status == 401 and not force_basic_auth and username:
+            # open_url answers the authentication challenge
+            return None
+        if response.msg.get('content-encoding') == 'gzip':
+            body = gzip.GzipFile(fileobj=BytesIO(body)).read()
+            del response.msg['content-encoding']
+        if response.status >= 400 or response.status == 304:
+            raise HTTPError(url, response.status, response.reason, response.msg, BytesIO(body))
+        return KeepAliveResponse(url, response, body)
+
+
 class RedfishUtils(object):
 
+    # Use persistent connections for GET requests
+    keep_alive = True
+
+    # Maximum number of GET requests sent in parallel
+    max_workers = 4
+
     def __init__(self, creds, root_uri, timeout, module, resource_id=None,
                  data_modification=False, strip_etag_quotes=False, ciphers=None):
         self.root_uri = root_uri
@@ -55,6 +267,13 @@ class RedfishUtils(object):
         self.strip_etag_quotes = strip_etag_quotes
         self.ciphers = ciphers
         self._vendor = None
+        self._connections = KeepAliveConnections(ciphers=ciphers)
+        self._pool_local = threading.local()
+        self._expand_query = None
+        self._response_cache = None
+        self._revalidate_cache = False
+        self._cache_lock = threading.Lock()
+        self.response_cache_stats = {'hits': 0, 'misses': 0, 'revalidated': 0}
 
     def _auth_params(self, headers):
         """
@@ -132,11 +351,49 @@ class RedfishUtils(object):
             resp['msg'] = 'Properties in %s are already set' % uri
         return resp
 
+    def enable_response_cache(self, revalidate=False):
+        """
+        Cache the responses of GET requests for the rest of the run. Cached
+        responses of a URI are dropped by any POST, PATCH, PUT or DELETE
+        request to the same path, a parent or a child of it.
+
+        :param revalidate: if True, a cached response is only reused after
+            the service confirmed with If-None-Match that its ETag did not
+            change; otherwise it is reused without sending a request
+        """
+        self._response_cache = {}
+        self._revalidate_cache = revalidate
+
+    def _count_cache(self, name):
+        with self._cache_lock:
+            self.response_cache_stats[name] += 1
+
+    def _cached_response(self, cached):
+        # Return a copy of a cached response, the callers may modify the data
+        return dict(cached['response'], data=copy.deepcopy(cached['response']['data']))
+
+    def _invalidate_cache(self, uri):
+        if not self._response_cache:
+            return
+        path = urlparse(uri).path.rstrip('/')
+        for cached_uri in list(self._response_cache):
+            cached_path = urlparse(cached_uri).path.rstrip('/')
+            if cached_path == path or path.startswith(cached_path + '/') or cached_path.startswith(path + '/'):
+                self._response_cache.pop(cached_uri, None)
+
     # The following functions are to send GET/POST/PATCH/DELETE requests
     def get_request(self, uri, override_headers=None, allow_no_resp=False, timeout=None):
         req_headers = dict(GET_HEADERS)
         if override_headers:
             req_headers.update(override_headers)
+        use_cache = self._response_cache is not None and not override_headers
+        cached = self._response_cache.get(uri) if use_cache else None
+        if cached is not None:
+            if not self._revalidate_cache:
+                self._count_cache('hits')
+                return self._cached_response(cached)
+            if cached['etag']:
+                req_headers['If-None-Match'] = cached['etag']
         username, password, basic_auth = self._auth_params(req_headers)
         if timeout is None:
             timeout = self.timeout
@@ -145,11 +402,16 @@ class RedfishUtils(object):
             # in case the caller will be using sessions later.
             if uri == (self.root_uri + self.service_root):
                 basic_auth = False
-            resp = open_url(uri, method="GET", headers=req_headers,
-                            url_username=username, url_password=password,
-                            force_basic_auth=basic_auth, validate_certs=False,
-                            follow_redirects='all',
-                            use_proxy=True, timeout=timeout, ciphers=self.ciphers)
+            resp = None
+            if self.keep_alive:
+                resp = self._connections.request('GET', uri, req_headers, username=username, password=password,
+                                                 force_basic_auth=basic_auth, timeout=timeout)
+            if resp is None:
+                resp = open_url(uri, method="GET", headers=req_headers,
+                                url_username=username, url_password=password,
+                                force_basic_auth=basic_auth, validate_certs=False,
+                                follow_redirects='all',
+                                use_proxy=True, timeout=timeout, ciphers=self.ciphers)
             headers = {k.lower(): v for (k, v) in resp.info().items()}
             try:
                 if headers.get('content-encoding') == 'gzip' and LooseVersion(ansible_version) < LooseVersion('2.14'):
@@ -164,6 +426,9 @@ class RedfishUtils(object):
                 if not allow_no_resp:
                     raise
         except HTTPError as e:
+            if e.code == 304 and cached is not None:
+                self._count_cache('revalidated')
+                return self._cached_response(cached)
             msg, data = self._get_extended_message(e)
             return {'ret': False,
                     'msg': "HTTP Error %s on GET request to '%s', extended message: '%s'"
@@ -176,10 +441,18 @@ class RedfishUtils(object):
         except Exception as e:
             return {'ret': False,
                     'msg': "Failed GET request to '%s': '%s'" % (uri, to_text(e))}
-        return {'ret': True, 'data': data, 'headers': headers, 'resp': resp}
+        response = {'ret': True, 'data': data, 'headers': headers, 'resp': resp}
+        if use_cache:
+            self._count_cache('misses')
+            if data is not None:
+                etag = headers.get('etag') or (data.get('@odata.etag') if isinstance(data, dict) else None)
+                self._response_cache[uri] = {'response': response, 'etag': etag}
+                return self._cached_response(self._response_cache[uri])
+        return response
 
-    def post_request(self, uri, pyld, multipart=False):
+    def post_request(self, uri, pyld, multipart=False, progress=None):
         req_headers = dict(POST_HEADERS)
+        multipart_body = None
         username, password, basic_auth = self._auth_params(req_headers)
         try:
             # When performing a POST to the session collection, credentials are
@@ -189,11 +462,13 @@ class RedfishUtils(object):
                 basic_auth = False
             if multipart:
                 # Multipart requests require special handling to encode the request body
-                multipart_encoder = self._prepare_multipart(pyld)
-                data = multipart_encoder[0]
+                multipart_encoder = self._prepare_multipart(pyld, progress=progress)
+                data = multipart_body = multipart_encoder[0]
                 req_headers['content-type'] = multipart_encoder[1]
+                req_headers['content-length'] = str(len(data))
             else:
                 data = json.dumps(pyld)
+            self._invalidate_cache(uri)
             resp = open_url(uri, data=data,
                             headers=req_headers, method="POST",
                             url_username=username, url_password=password,
@@ -219,6 +494,9 @@ class RedfishUtils(object):
         except Exception as e:
             return {'ret': False,
                     'msg': "Failed POST request to '%s': '%s'" % (uri, to_text(e))}
+        finally:
+            if multipart_body is not None:
+                multipart_body.close()
         return {'ret': True, 'data': data, 'headers': headers, 'resp': resp}
 
     def patch_request(self, uri, pyld, check_pyld=False):
@@ -248,6 +526,7 @@ class RedfishUtils(object):
 
         username, password, basic_auth = self._auth_params(req_headers)
         try:
+            self._invalidate_cache(uri)
             resp = open_url(uri, data=json.dumps(pyld),
                             headers=req_headers, method="PATCH",
                             url_username=username, url_password=password,
@@ -283,6 +562,7 @@ class RedfishUtils(object):
                 req_headers['If-Match'] = etag
         username, password, basic_auth = self._auth_params(req_headers)
         try:
+            self._invalidate_cache(uri)
             resp = open_url(uri, data=json.dumps(pyld),
                             headers=req_headers, method="PUT",
                             url_username=username, url_password=password,
@@ -309,6 +589,7 @@ class RedfishUtils(object):
         username, password, basic_auth = self._auth_params(req_headers)
         try:
             data = json.dumps(pyld) if pyld else None
+            self._invalidate_cache(uri)
             resp = open_url(uri, data=data,
                             headers=req_headers, method="DELETE",
                             url_username=username, url_password=password,
@@ -330,8 +611,79 @@ class RedfishUtils(object):
                     'msg': "Failed DELETE request to '%s': '%s'" % (uri, to_text(e))}
         return {'ret': True, 'resp': resp}
 
+    def _run_in_pool(self, func, args_list):
+        # Run func for every item of args_list in the thread pool and return
+        # the results in order. Calls from a pool thread run serially, so
+        # nested fan-outs do not multiply the number of connections.
+        if (not HAS_THREAD_POOL or self.max_workers < 2 or len(args_list) < 2
+                or getattr(self._pool_local, 'active', False)):
+            return [func(args) for args in args_list]
+
+        def run(args):
+            self._pool_local.active = True
+            try:
+                return func(args)
+            finally:
+                self._pool_local.active = False
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(args_list))) as executor:
+            return list(executor.map(run, args_list))
+
+    def get_requests(self, uris):
+        """GET several URIs in parallel and return the responses in order."""
+        return self._run_in_pool(self.get_request, list(uris))
+
+    def _get_expand_query(self):
+        # Determine the $expand query to expand the members of a collection
+        # from ProtocolFeaturesSupported in the service root
+        if self._expand_query is None:
+            self._expand_query = ''
+            response = self.get_request(self.root_uri + self.service_root)
+            if response['ret'] and response['data']:
+                expand = response['data'].get('ProtocolFeaturesSupported', {}).get('ExpandQuery', {})
+                if expand.get('NoLinks'):
+                    self._expand_query = '$expand=.'
+                elif expand.get('ExpandAll'):
+                    self._expand_query = '$expand=*'
+                if self._expand_query and expand.get('Levels'):
+                    self._expand_query += '($levels=1)'
+        return self._expand_query
+
+    def get_members(self, collection_uri):
+        """Get the members of a collection.
+
+        If the service supports $expand, the collection is read with its
+        members expanded in a single request. Otherwise the members are read
+        in parallel.
+
+        :param collection_uri: the URI of the collection, without root_uri
+        :return: dict with the 'data' of the collection and the list of the
+                 'members' data, or the failed response
+        """
+        expand_query = self._get_expand_query()
+        if expand_query:
+            separator = '&' if '?' in collection_uri else '?'
+            response = self.get_request(self.root_uri + collection_uri + separator + expand_query)
+            if response['ret'] and response['data']:
+                members = response['data'].get('Members', [])
+                if all(len(member) > 1 for member in members):
+                    return {'ret': True, 'data': response['data'], 'members': members}
+
+        # The service does not support $expand or ignored it
+        response = self.get_request(self.root_uri + collection_uri)
+        if response['ret'] is False:
+            return response
+        data = response['data']
+        members = []
+        responses = self.get_requests([self.root_uri + member[u'@odata.id'] for member in data.get('Members', [])])
+        for member_response in responses:
+            if member_response['ret'] is False:
+                return member_response
+            members.append(member_response['data'])
+        return {'ret': True, 'data': data, 'members': members}
+
     @staticmethod
-    def _prepare_multipart(fields):
+    def _prepare_multipart(fields, progress=None):
         """Prepares a multipart body based on a set of fields provided.
 
         Ideally it would have been good to use the existing 'prepare_multipart'
@@ -342,6 +694,9 @@ class RedfishUtils(object):
         send to the service.  This implementation is simplified to Redfish's
         usage and doesn't necessarily represent an exhaustive method of
         building multipart requests.
+
+        The body is returned as a MultipartBody. Files given by 'filename'
+        without 'content' are streamed from disk while the body is sent.
         """
 
         def write_buffer(body, line):
@@ -358,6 +713,7 @@ class RedfishUtils(object):
         # Generate a random boundary marker; may need to consider probing the
         # payload for potential conflicts in the future
         boundary = ''.join(random.choice(string.digits + string.ascii_letters) for i in range(30))
+        parts = []
         body = []
         for form in fields:
             # Fill in the form details
@@ -372,16 +728,19 @@ class RedfishUtils(object):
             write_buffer(body, 'Content-Type: %s' % fields[form]['mime_type'])
             write_buffer(body, '')
 
-            # Insert the payload; read from the file if not given by the caller
+            # Insert the payload; stream it from the file if not given by the caller
             if 'content' not in fields[form]:
-                with open(to_bytes(fields[form]['filename'], errors='surrogate_or_strict'), 'rb') as f:
-                    fields[form]['content'] = f.read()
-            write_buffer(body, fields[form]['content'])
+                parts.append(b'\r\n'.join(body + [b'']))
+                parts.append({'filename': fields[form]['filename']})
+                body = [b'']
+            else:
+                write_buffer(body, fields[form]['content'])
 
         # Finalize the entire request
         write_buffer(body, '--' + boundary + '--')
         write_buffer(body, '')
-        return (b'\r\n'.join(body), 'multipart/form-data; boundary=' + boundary)
+        parts.append(b'\r\n'.join(body))
+        return (MultipartBody(parts, progress=progress), 'multipart/form-data; boundary=' + boundary)
 
     @staticmethod
     def _get_extended_message(error):
@@ -733,8 +1092,7 @@ class RedfishUtils(object):
     def aggregate(self, func, uri_list, uri_name):
         ret = True
         entries = []
-        for uri in uri_list:
-            inventory = func(uri)
+        for uri, inventory in zip(uri_list, self._run_in_pool(func, uri_list)):
             ret = inventory.pop('ret') and ret
             if 'entries' in inventory:
                 entries.append(({uri_name: uri},
@@ -770,40 +1128,27 @@ class RedfishUtils(object):
         if 'Storage' not in data:
             return {'ret': False, 'msg': "Storage resource not found"}
 
-        # Get a list of all storage controllers and build respective URIs
+        # Get all storage members
         storage_uri = data['Storage']["@odata.id"]
-        response = self.get_request(self.root_uri + storage_uri)
+        response = self.get_members(storage_uri)
         if response['ret'] is False:
             return response
         result['ret'] = True
-        data = response['data']
 
         # Loop through Members and their StorageControllers
         # and gather properties from each StorageController
-        if data[u'Members']:
-            for storage_member in data[u'Members']:
-                storage_member_uri = storage_member[u'@odata.id']
-                response = self.get_request(self.root_uri + storage_member_uri)
-                data = response['data']
-
+        if response['members']:
+            for data in response['members']:
                 if key in data:
                     controllers_uri = data[key][u'@odata.id']
 
-                    response = self.get_request(self.root_uri + controllers_uri)
+                    response = self.get_members(controllers_uri)
                     if response['ret'] is False:
                         return response
                     result['ret'] = True
-                    data = response['data']
-
-                    if data[u'Members']:
-                        for controller_member in data[u'Members']:
-                            controller_member_uri = controller_member[u'@odata.id']
-                            response = self.get_request(self.root_uri + controller_member_uri)
-                            if response['ret'] is False:
-                                return response
-                            result['ret'] = True
-                            data = response['data']
 
+                    if response['members']:
+                        for data in response['members']:
                             controller_result = {}
                             for property in properties:
                                 if property in data:
@@ -847,23 +1192,15 @@ class RedfishUtils(object):
                      not found"}
 
         if 'Storage' in data:
-            # Get a list of all storage controllers and build respective URIs
+            # Get all storage members
             storage_uri = data[u'Storage'][u'@odata.id']
-            response = self.get_request(self.root_uri + storage_uri)
+            response = self.get_members(storage_uri)
             if response['ret'] is False:
                 return response
             result['ret'] = True
-            data = response['data']
 
-            if data[u'Members']:
-                for controller in data[u'Members']:
-                    controller_list.append(controller[u'@odata.id'])
-                for c in controller_list:
-                    uri = self.root_uri + c
-                    response = self.get_request(uri)
-                    if response['ret'] is False:
-                        return response
-                    data = response['data']
+            if response['members']:
+                for data in response['members']:
                     controller_name = 'Controller 1'
                     storage_id = data['Id']
                     if 'Controllers' in data:
@@ -894,9 +1231,10 @@ class RedfishUtils(object):
                                 controller_name = 'Controller %s' % sc_id
                     drive_results = []
                     if 'Drives' in data:
-                        for device in data[u'Drives']:
-                            disk_uri = self.root_uri + device[u'@odata.id']
-                            response = self.get_request(disk_uri)
+                        responses = self.get_requests([self.root_uri + device[u'@odata.id'] for device in data[u'Drives']])
+                        for response in responses:
+                            if response['ret'] is False:
+                                return response
                             data = response['data']
 
                             drive_result = {}
@@ -916,7 +1254,7 @@ class RedfishUtils(object):
                               'Drives': drive_results}
                     result["entries"].append(drives)
 
-        if 'SimpleStorage' in data:
+        elif 'SimpleStorage' in data:
             # Get a list of all storage controllers and build respective URIs
             storage_uri = data["SimpleStorage"]["@odata.id"]
             response = self.get_request(self.root_uri + storage_uri)
@@ -1945,8 +2283,8 @@ class RedfishUtils(object):
             return {'ret': False, 'msg':
                     'Must specify a valid file for the MultipartHTTPPushUpdate command'}
         try:
-            with open(image_file, 'rb') as f:
-                image_payload = f.read()
+            with open(image_file, 'rb'):
+                pass
         except Exception as e:
             return {'ret': False, 'msg':
                     'Could not read file %s' % image_file}
@@ -1970,14 +2308,23 @@ class RedfishUtils(object):
             payload["Oem"] = oem_params
         multipart_payload = {
             'UpdateParameters': {'content': json.dumps(payload), 'mime_type': 'application/json'},
-            'UpdateFile': {'filename': image_file, 'content': image_payload, 'mime_type': 'application/octet-stream'}
+            'UpdateFile': {'filename': image_file, 'mime_type': 'application/octet-stream'}
         }
         if custom_oem_params:
             multipart_payload[custom_oem_header] = {'content': custom_oem_params}
             if custom_oem_mime_type:
                 multipart_payload[custom_oem_header]['mime_type'] = custom_oem_mime_type
 
-        response = self.post_request(self.root_uri + update_uri, multipart_payload, multipart=True)
+        reported = [0]
+
+        def progress(sent, total):
+            # Log every 10% of the upload
+            percent = sent * 100 // total if total else 100
+            if percent >= reported[0] + 10 or sent == total:
+                reported[0] = percent
+                self.module.log('Uploaded %d of %d bytes (%d%%) of %s' % (sent, total, percent, image_file))
+
+        response = self.post_request(self.root_uri + update_uri, multipart_payload, multipart=True, progress=progress)
         if response['ret'] is False:
             return response
         return {'ret': True, 'changed': True,
@@ -2557,7 +2904,6 @@ class RedfishUtils(object):
 
     def get_cpu_inventory(self, systems_uri):
         result = {}
-        cpu_list = []
         cpu_results = []
         key = "Processors"
         # Get these entries, but does not fail if not found
@@ -2576,24 +2922,14 @@ class RedfishUtils(object):
 
         processors_uri = data[key]["@odata.id"]
 
-        # Get a list of all CPUs and build respective URIs
-        response = self.get_request(self.root_uri + processors_uri)
+        # Get all CPUs
+        response = self.get_members(processors_uri)
         if response['ret'] is False:
             return response
         result['ret'] = True
-        data = response['data']
-
-        for cpu in data[u'Members']:
-            cpu_list.append(cpu[u'@odata.id'])
 
-        for c in cpu_list:
+        for data in response['members']:
             cpu = {}
-            uri = self.root_uri + c
-            response = self.get_request(uri)
-            if response['ret'] is False:
-                return response
-            data = response['data']
-
             for property in properties:
                 if property in data:
                     cpu[property] = data[property]
@@ -2607,7 +2943,6 @@ class RedfishUtils(object):
 
     def get_memory_inventory(self, systems_uri):
         result = {}
-        memory_list = []
         memory_results = []
         key = "Memory"
         # Get these entries, but does not fail if not found
@@ -2626,24 +2961,14 @@ class RedfishUtils(object):
 
         memory_uri = data[key]["@odata.id"]
 
-        # Get a list of all DIMMs and build respective URIs
-        response = self.get_request(self.root_uri + memory_uri)
+        # Get all DIMMs
+        response = self.get_members(memory_uri)
         if response['ret'] is False:
             return response
         result['ret'] = True
-        data = response['data']
 
-        for dimm in data[u'Members']:
-            memory_list.append(dimm[u'@odata.id'])
-
-        for m in memory_list:
+        for data in response['members']:
             dimm = {}
-            uri = self.root_uri + m
-            response = self.get_request(uri)
-            if response['ret'] is False:
-                return response
-            data = response['data']
-
             if "Status" in data:
                 if "State" in data["Status"]:
                     if data["Status"]["State"] == "Absent":
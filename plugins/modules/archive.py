@@ -35,8 +35,9 @@ options:
   format:
     description:
       - The type of compression to use.
+      - V(zst) has been added in community.general 10.5.0.
     type: str
-    choices: [bz2, gz, tar, xz, zip]
+    choices: [bz2, gz, tar, xz, zip, zst]
     default: gz
   dest:
     description:
@@ -72,13 +73,31 @@ options:
       - Remove any added source files and trees after adding to archive.
     type: bool
     default: false
+  threads:
+    description:
+      - Number of worker threads used to compress with O(format=zst).
+      - V(0) compresses in the module process without worker threads, V(-1) uses one thread per CPU core.
+      - The other formats are always compressed by a single thread.
+    type: int
+    default: 0
+    version_added: 10.5.0
+  manifest:
+    description:
+      - Store the size, the modification time and the member checksums of the archive in C(<dest>.manifest) next to O(dest).
+      - On the next run, if the size and the modification time of O(dest) still match the manifest, the checksums of the
+        existing archive are taken from the manifest instead of reading and decompressing the whole archive.
+    type: bool
+    default: false
+    version_added: 10.5.0
 notes:
-  - Can produce C(gzip), C(bzip2), C(lzma), and C(zip) compressed files or archives.
+  - Can produce C(gzip), C(bzip2), C(lzma), C(zstd), and C(zip) compressed files or archives.
+  - Compressed tar archives are written as a stream, the archive is never held in memory.
   - This module uses C(tarfile), C(zipfile), C(gzip), and C(bz2) packages on the target host to create archives. These are
     part of the Python standard library for Python 2 and 3.
 requirements:
   - Requires C(lzma) (standard library of Python 3) or L(backports.lzma, https://pypi.org/project/backports.lzma/) (Python
     2) if using C(xz) format.
+  - Requires L(zstandard, https://pypi.org/project/zstandard/) if using C(zst) format.
 seealso:
   - module: ansible.builtin.unarchive
 author:
@@ -134,6 +153,13 @@ EXAMPLES = r"""
     dest: /path/file.gz
     format: gz
 
+- name: Create a zstd compressed tar archive of /path/to/foo with one compression thread per CPU core
+  community.general.archive:
+    path: /path/to/foo
+    dest: /path/foo.tar.zst
+    format: zst
+    threads: -1
+
 - name: Create a tar.gz archive of a single file.
   community.general.archive:
     path: /path/to/foo/single.file
@@ -183,7 +209,7 @@ import abc
 import bz2
 import glob
 import gzip
-import io
+import json
 import os
 import re
 import shutil
@@ -219,6 +245,14 @@ else:
         LZMA_IMP_ERR = format_exc()
         HAS_LZMA = False
 
+ZSTANDARD_IMP_ERR = None
+try:
+    import zstandard
+    HAS_ZSTANDARD = True
+except ImportError:
+    ZSTANDARD_IMP_ERR = format_exc()
+    HAS_ZSTANDARD = False
+
 PY27 = version_info[0:2] >= (2, 7)
 
 STATE_ABSENT = 'absent'
@@ -254,7 +288,7 @@ def matches_exclusion_patterns(path, exclusion_patterns):
 
 
 def is_archive(path):
-    return re.search(br'\.(tar|tar\.(gz|bz2|xz)|tgz|tbz2|zip)$', os.path.basename(path), re.IGNORECASE)
+    return re.search(br'\.(tar|tar\.(gz|bz2|xz|zst)|tgz|tbz2|tzst|zip)$', os.path.basename(path), re.IGNORECASE)
 
 
 def strip_prefix(prefix, string):
@@ -283,6 +317,8 @@ class Archive(object):
         self.format = module.params['format']
         self.must_archive = module.params['force_archive']
         self.remove = module.params['remove']
+        self.threads = module.params['threads']
+        self.manifest = module.params['manifest']
 
         self.changed = False
         self.destination_state = STATE_ABSENT
@@ -291,6 +327,7 @@ class Archive(object):
         self.successes = []
         self.targets = []
         self.not_found = []
+        self.written_checksums = None
 
         paths = module.params['path']
         self.expanded_paths, has_globs = expand_paths(paths)
@@ -344,9 +381,16 @@ class Archive(object):
         else:
             try:
                 f_out = self._open_compressed_file(_to_native_ascii(self.destination), 'wb')
+                checksum = 0
                 with open(path, 'rb') as f_in:
-                    shutil.copyfileobj(f_in, f_out)
+                    while True:
+                        chunk = f_in.read(16 * 1024 * 1024)
+                        if not chunk:
+                            break
+                        f_out.write(chunk)
+                        checksum = crc32(chunk, checksum)
                 f_out.close()
+                self.written_checksums = set([('', checksum)])
                 self.successes.append(path)
                 self.destination_state = STATE_COMPRESSED
             except (IOError, OSError) as e:
@@ -393,13 +437,57 @@ class Archive(object):
         if self.original_checksums is None:
             return self.original_size != self.destination_size()
         else:
-            return self.original_checksums != self.destination_checksums()
+            return self.original_checksums != self.written_destination_checksums()
 
     def destination_checksums(self):
         if self.destination_exists() and self.destination_readable():
-            return self._get_checksums(self.destination)
+            checksums = self._read_manifest()
+            if checksums is None:
+                checksums = self._get_checksums(self.destination)
+            return checksums
         return None
 
+    def written_destination_checksums(self):
+        if self.written_checksums is None:
+            if self.destination_exists() and self.destination_readable():
+                self.written_checksums = self._get_checksums(self.destination)
+        return self.written_checksums
+
+    def manifest_path(self):
+        return self.destination + b'.manifest'
+
+    def write_manifest(self):
+        if not self.manifest or not self.destination_exists():
+            return
+        checksums = self.written_destination_checksums()
+        if checksums is None:
+            return
+        st = os.stat(self.destination)
+        manifest = {
+            'format': self.format,
+            'size': st.st_size,
+            'mtime': st.st_mtime,
+            'checksums': sorted([_to_native(name), checksum] for name, checksum in checksums),
+        }
+        try:
+            with open(self.manifest_path(), 'w') as f:
+                json.dump(manifest, f)
+        except (IOError, OSError) as e:
+            self.module.warn('Unable to write the manifest %s: %s' % (_to_native(self.manifest_path()), _to_native(e)))
+
+    def _read_manifest(self):
+        if not self.manifest:
+            return None
+        try:
+            with open(self.manifest_path()) as f:
+                manifest = json.load(f)
+            st = os.stat(self.destination)
+            if manifest['format'] != self.format or manifest['size'] != st.st_size or manifest['mtime'] != st.st_mtime:
+                return None
+            return set((name, checksum) for name, checksum in manifest['checksums'])
+        except (IOError, OSError, ValueError, KeyError, TypeError):
+            return None
+
     def destination_exists(self):
         return self.destination and os.path.exists(self.destination)
 
@@ -486,6 +574,11 @@ class Archive(object):
             f = bz2.BZ2File(path, mode)
         elif self.format == 'xz':
             f = lzma.LZMAFile(path, mode)
+        elif self.format == 'zst':
+            if 'w' in mode:
+                f = zstandard.open(path, mode, cctx=zstandard.ZstdCompressor(threads=self.threads))
+            else:
+                f = zstandard.open(path, mode)
         else:
             self.module.fail_json(msg="%s is not a valid format" % self.format)
 
@@ -549,11 +642,12 @@ class TarArchive(Archive):
         self.fileIO = None
 
     def close(self):
+        # The checksums of the headers are not kept by tarfile, compute them while the members are still available
+        self.written_checksums = set((info.name, header_checksum(info, self.file)) for info in self.file.getmembers())
         self.file.close()
-        if self.format == 'xz':
-            with lzma.open(_to_native(self.destination), 'wb') as f:
-                f.write(self.fileIO.getvalue())
+        if self.fileIO is not None:
             self.fileIO.close()
+            self.fileIO = None
 
     def contains(self, name):
         try:
@@ -563,13 +657,13 @@ class TarArchive(Archive):
         return True
 
     def open(self):
-        if self.format in ('gz', 'bz2'):
+        if self.format in ('gz', 'bz2') or (self.format == 'xz' and six.PY3):
             self.file = tarfile.open(_to_native_ascii(self.destination), 'w|' + self.format)
-        # python3 tarfile module allows xz format but for python2 we have to create the tarfile
-        # in memory and then compress it with lzma.
-        elif self.format == 'xz':
-            self.fileIO = io.BytesIO()
-            self.file = tarfile.open(fileobj=self.fileIO, mode='w')
+        # python2 tarfile module does not support xz and no tarfile module supports zstd, so the
+        # uncompressed tar stream is written into the compressed file.
+        elif self.format in ('xz', 'zst'):
+            self.fileIO = self._open_compressed_file(_to_native_ascii(self.destination), 'wb')
+            self.file = tarfile.open(fileobj=self.fileIO, mode='w|')
         elif self.format == 'tar':
             self.file = tarfile.open(_to_native_ascii(self.destination), 'w')
         else:
@@ -593,34 +687,47 @@ class TarArchive(Archive):
         else:
             # Just picking another exception that's also listed below
             LZMAError = tarfile.ReadError
+        if HAS_ZSTANDARD:
+            ZstdError = zstandard.ZstdError
+        else:
+            ZstdError = tarfile.ReadError
         try:
-            if self.format == 'xz':
-                with lzma.open(_to_native_ascii(path), 'r') as f:
-                    archive = tarfile.open(fileobj=f)
+            if self.format in ('xz', 'zst'):
+                f = self._open_compressed_file(_to_native_ascii(path), 'rb')
+                try:
+                    archive = tarfile.open(fileobj=f, mode='r|')
                     checksums = set((info.name, info.chksum) for info in archive.getmembers())
                     archive.close()
+                finally:
+                    f.close()
             else:
                 archive = tarfile.open(_to_native_ascii(path), 'r|' + self.format)
                 checksums = set((info.name, info.chksum) for info in archive.getmembers())
                 archive.close()
-        except (LZMAError, tarfile.ReadError, tarfile.CompressionError):
+        except (LZMAError, ZstdError, tarfile.ReadError, tarfile.CompressionError):
             try:
                 # The python implementations of gzip, bz2, and lzma do not support restoring compressed files
                 # to their original names so only file checksum is returned
-                f = self._open_compressed_file(_to_native_ascii(path), 'r')
+                f = self._open_compressed_file(_to_native_ascii(path), 'rb')
                 checksum = 0
                 while True:
                     chunk = f.read(16 * 1024 * 1024)
                     if not chunk:
                         break
                     checksum = crc32(chunk, checksum)
-                checksums = set([(b'', checksum)])
+                checksums = set([('', checksum)])
                 f.close()
             except Exception:
                 checksums = set()
         return checksums
 
 
+def header_checksum(tarinfo, archive):
+    # The checksum of a member is the one of its last header block, after any extended headers.
+    buf = tarinfo.tobuf(archive.format, archive.encoding, archive.errors)
+    return tarfile.calc_chksums(buf[-tarfile.BLOCKSIZE:])[0]
+
+
 def get_archive(module):
     if module.params['format'] == 'zip':
         return ZipArchive(module)
@@ -632,12 +739,14 @@ def main():
     module = AnsibleModule(
         argument_spec=dict(
             path=dict(type='list', elements='path', required=True),
-            format=dict(type='str', default='gz', choices=['bz2', 'gz', 'tar', 'xz', 'zip']),
+            format=dict(type='str', default='gz', choices=['bz2', 'gz', 'tar', 'xz', 'zip', 'zst']),
             dest=dict(type='path'),
             exclude_path=dict(type='list', elements='path', default=[]),
             exclusion_patterns=dict(type='list', elements='path'),
             force_archive=dict(type='bool', default=False),
             remove=dict(type='bool', default=False),
+            threads=dict(type='int', default=0),
+            manifest=dict(type='bool', default=False),
         ),
         add_file_common_args=True,
         supports_check_mode=True,
@@ -648,6 +757,11 @@ def main():
             msg=missing_required_lib("lzma or backports.lzma", reason="when using xz format"), exception=LZMA_IMP_ERR
         )
 
+    if not HAS_ZSTANDARD and module.params['format'] == 'zst':
+        module.fail_json(
+            msg=missing_required_lib("zstandard", reason="when using zst format"), exception=ZSTANDARD_IMP_ERR
+        )
+
     check_mode = module.check_mode
 
     archive = get_archive(module)
@@ -663,6 +777,7 @@ def main():
             archive.add_targets()
             archive.destination_state = STATE_INCOMPLETE if archive.has_unfound_targets() else STATE_ARCHIVED
             archive.changed |= archive.is_different_from_original()
+            archive.write_manifest()
             if archive.remove:
                 archive.remove_targets()
     else:
@@ -673,6 +788,7 @@ def main():
             path = archive.paths[0]
             archive.add_single_target(path)
             archive.changed |= archive.is_different_from_original()
+            archive.write_manifest()
             if archive.remove:
                 archive.remove_single_target(path)
 
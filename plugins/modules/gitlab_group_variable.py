@@ -207,7 +207,7 @@ from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.api import basic_auth_argument_spec
 from ansible_collections.community.general.plugins.module_utils.gitlab import (
     auth_argument_spec, gitlab_authentication, filter_returned_variables, vars_to_variables,
-    list_all_kwargs
+    list_all_kwargs, index_variables, variable_id, variable_items, write_variables
 )
 
 
@@ -244,8 +244,15 @@ class GitlabGroupVariables(object):
     def update_variable(self, var_obj):
         if self._module.check_mode:
             return True
-        self.delete_variable(var_obj)
-        self.create_variable(var_obj)
+        var = {
+            "value": var_obj.get('value'),
+            "masked": var_obj.get('masked'),
+            "protected": var_obj.get('protected'),
+            "raw": var_obj.get('raw'),
+            "variable_type": var_obj.get('variable_type'),
+        }
+
+        self.group.variables.update(var_obj.get('key'), var, filter={'environment_scope': var_obj.get('environment_scope')})
         return True
 
     def delete_variable(self, var_obj):
@@ -268,19 +275,16 @@ def compare(requested_variables, existing_variables, state):
     added = list()
 
     if state == 'present':
-        existing_key_scope_vars = list()
-        for item in existing_variables:
-            existing_key_scope_vars.append({'key': item.get('key'), 'environment_scope': item.get('environment_scope')})
+        existing_index = index_variables(existing_variables)
+        existing_items = set(variable_items(item) for item in existing_variables)
 
         for var in requested_variables:
-            if var in existing_variables:
+            if variable_items(var) in existing_items:
                 untouched.append(var)
+            elif variable_id(var) in existing_index:
+                updated.append(var)
             else:
-                compare_item = {'key': var.get('name'), 'environment_scope': var.get('environment_scope')}
-                if compare_item in existing_key_scope_vars:
-                    updated.append(var)
-                else:
-                    added.append(var)
+                added.append(var)
 
     return untouched, updated, added
 
@@ -293,7 +297,6 @@ def native_python_main(this_gitlab, purge, requested_variables, state, module):
     gitlab_keys = this_gitlab.list_all_group_variables()
     before = [x.attributes for x in gitlab_keys]
 
-    gitlab_keys = this_gitlab.list_all_group_variables()
     existing_variables = filter_returned_variables(gitlab_keys)
 
     for item in requested_variables:
@@ -314,25 +317,18 @@ def native_python_main(this_gitlab, purge, requested_variables, state, module):
         untouched, updated, added = compare(requested_variables, existing_variables, state)
 
     if state == 'present':
-        add_or_update = [x for x in requested_variables if x not in existing_variables]
-        for item in add_or_update:
-            try:
-                if this_gitlab.create_variable(item):
-                    return_value['added'].append(item)
-
-            except Exception:
-                if this_gitlab.update_variable(item):
-                    return_value['updated'].append(item)
+        existing_index = index_variables(existing_variables)
+        existing_items = set(variable_items(item) for item in existing_variables)
+        add_or_update = [x for x in requested_variables if variable_items(x) not in existing_items]
+        to_add = [x for x in add_or_update if variable_id(x) not in existing_index]
+        to_update = [x for x in add_or_update if variable_id(x) in existing_index]
 
+        to_remove = []
         if purge:
-            # refetch and filter
-            gitlab_keys = this_gitlab.list_all_group_variables()
-            existing_variables = filter_returned_variables(gitlab_keys)
+            requested_index = index_variables(requested_variables)
+            to_remove = [x for x in existing_variables if variable_id(x) not in requested_index]
 
-            remove = [x for x in existing_variables if x not in requested_variables]
-            for item in remove:
-                if this_gitlab.delete_variable(item):
-                    return_value['removed'].append(item)
+        return_value.update(write_variables(this_gitlab, added=to_add, updated=to_update, removed=to_remove))
 
     elif state == 'absent':
         # value does not matter on removing variables.
@@ -345,15 +341,12 @@ def native_python_main(this_gitlab, purge, requested_variables, state, module):
             item.pop('variable_type')
 
         if not purge:
-            remove_requested = [x for x in requested_variables if x in existing_variables]
-            for item in remove_requested:
-                if this_gitlab.delete_variable(item):
-                    return_value['removed'].append(item)
-
+            existing_items = set(variable_items(item) for item in existing_variables)
+            to_remove = [x for x in requested_variables if variable_items(x) in existing_items]
         else:
-            for item in existing_variables:
-                if this_gitlab.delete_variable(item):
-                    return_value['removed'].append(item)
+            to_remove = existing_variables
+
+        return_value.update(write_variables(this_gitlab, removed=to_remove))
 
     if module.check_mode:
         return_value = dict(added=added, updated=updated, removed=return_value['removed'], untouched=untouched)
@@ -0,0 +1,382 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Copyright (c) Ansible project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+module: keycloak_partial_import
+
+short_description: Create or update many Keycloak clients, roles, groups, and users at once
+
+version_added: 10.5.0
+
+description:
+  - This module compares the desired clients, realm roles, client roles, groups, and users of a realm with a single export
+    of the realm, and pushes the objects that are missing or differ to Keycloak with one call of the partial import REST API.
+  - This is much faster than provisioning many objects with M(community.general.keycloak_client), M(community.general.keycloak_role),
+    M(community.general.keycloak_group), and M(community.general.keycloak_user), which need several requests per object.
+  - The objects use the representations of the Keycloak REST API, see U(https://www.keycloak.org/docs-api/latest/rest-api/index.html).
+    Their keys are camelCase, as in the API, and not snake_cased like the options of the other Keycloak modules.
+  - An object is considered unchanged if all the keys given for it have the same values in Keycloak. Client secrets and user
+    credentials cannot be read back from Keycloak and are not compared.
+  - The realm export does not contain the group memberships and role mappings of users. For the existing users that are given
+    with C(groups), C(realmRoles), or C(clientRoles), they are read with two more requests per user. Such a user is unchanged
+    if they are a member of all the given groups and have all the given roles.
+  - This module does not delete objects that are not listed.
+attributes:
+  check_mode:
+    support: full
+  diff_mode:
+    support: full
+  action_group:
+    version_added: 10.5.0
+
+options:
+  realm:
+    description:
+      - The Keycloak realm to import into.
+    type: str
+    default: master
+
+  clients:
+    description:
+      - Client representations, identified by their C(clientId).
+    type: list
+    elements: dict
+    default: []
+
+  realm_roles:
+    description:
+      - Realm role representations, identified by their C(name).
+    type: list
+    elements: dict
+    default: []
+
+  client_roles:
+    description:
+      - Client role representations, as a dictionary mapping the C(clientId) of a client to the list of its roles.
+      - The roles are identified by their C(name). The client must exist, or be listed in O(clients).
+    type: dict
+    default: {}
+
+  groups:
+    description:
+      - Top-level group representations, identified by their C(name). Subgroups are given in their C(subGroups).
+    type: list
+    elements: dict
+    default: []
+
+  users:
+    description:
+      - User representations, identified by their C(username).
+      - Initial passwords can be set in C(credentials). Use C(no_log) on the task if you do so.
+    type: list
+    elements: dict
+    default: []
+
+  if_resource_exists:
+    description:
+      - What to do with objects that already exist in Keycloak and differ from the desired state.
+      - V(skip) leaves them as they are, and reports them as skipped.
+      - V(overwrite) replaces them with the existing object updated with the given keys. Keycloak implements this by deleting
+        and recreating the object with the same ID. Overwritten users lose the credentials that are not given in C(credentials),
+        and the group memberships and role mappings that are not given.
+      - V(fail) makes the module fail without importing anything.
+      - Missing objects are always created.
+    type: str
+    choices: [fail, skip, overwrite]
+    default: skip
+
+extends_documentation_fragment:
+  - community.general.keycloak
+  - community.general.keycloak.actiongroup_keycloak
+  - community.general.attributes
+
+author:
+  - agent (!UNKNOWN)
+"""
+
+EXAMPLES = r"""
+- name: Provision the clients, roles, groups, and users of a realm
+  community.general.keycloak_partial_import:
+    auth_keycloak_url: https://auth.example.com/auth
+    auth_realm: master
+    auth_username: USERNAME
+    auth_password: PASSWORD
+    realm: MyCustomRealm
+    clients:
+      - clientId: my-app
+        redirectUris:
+          - https://app.example.com/*
+    realm_roles:
+      - name: reader
+      - name: writer
+        description: Can modify documents
+    client_roles:
+      my-app:
+        - name: admin
+    groups:
+      - name: editors
+        realmRoles:
+          - writer
+        subGroups:
+          - name: senior-editors
+    users: "{{ users_to_provision }}"
+    if_resource_exists: overwrite
+  delegate_to: localhost
+  no_log: true
+"""
+
+RETURN = r"""
+msg:
+  description: Message as to what action was taken.
+  returned: always
+  type: str
+  sample: "Added 2, overwritten 1, skipped 0, unchanged 1997 objects of realm MyCustomRealm"
+
+results:
+  description: One entry for every object given to the module.
+  returned: always
+  type: list
+  elements: dict
+  contains:
+    resource_type:
+      description: Type of the object.
+      type: str
+      sample: CLIENT
+      choices: [CLIENT, REALM_ROLE, CLIENT_ROLE, GROUP, USER]
+    resource_name:
+      description: The C(clientId), C(name), or C(username) of the object.
+      type: str
+      sample: my-app
+    client_id:
+      description: The C(clientId) of the client of a client role.
+      type: str
+      returned: for client roles
+    id:
+      description: ID of the object, if known.
+      type: str
+    action:
+      description: What was done with the object.
+      type: str
+      choices: [ADDED, OVERWRITTEN, SKIPPED, UNCHANGED]
+    changed:
+      description: Whether the object was changed.
+      type: bool
+    diff:
+      description: The object before and after the import. Secrets are masked.
+      type: dict
+      returned: in diff mode, when the object was changed
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.community.general.plugins.module_utils.identity.keycloak.keycloak import (
+    KeycloakAPI, KeycloakError, get_token, keycloak_argument_spec, is_struct_included)
+import copy
+
+# Keys whose values Keycloak does not return, or returns masked, so they cannot be compared
+COMPARE_EXCLUDE = ['credentials', 'secret']
+# Keys of user representations that are not returned with the users and have to be fetched per user
+USER_MEMBERSHIP_KEYS = ['groups', 'realmRoles', 'clientRoles']
+MASKED_SECRET = '**********'
+NAME_KEYS = dict(CLIENT='clientId', REALM_ROLE='name', CLIENT_ROLE='name', GROUP='name', USER='username')
+
+
+def sanitize(rep):
+    result = copy.deepcopy(rep)
+    if result.get('secret'):
+        result['secret'] = MASKED_SECRET
+    if result.get('credentials'):
+        result['credentials'] = MASKED_SECRET
+    return result
+
+
+def merge(existing, desired):
+    """ Returns the representation that overwrites existing, the existing object updated with the desired keys """
+    merged = copy.deepcopy(existing)
+    if merged.get('secret') == MASKED_SECRET:
+        del merged['secret']
+    merged.update(desired)
+    if existing.get('id') is not None:
+        merged['id'] = existing['id']
+    return merged
+
+
+def desired_objects(module):
+    """ Yields (resource_type, client_id, name, representation) of every object given to the module """
+    for client in module.params['clients']:
+        yield 'CLIENT', None, client.get('clientId'), client
+    for role in module.params['realm_roles']:
+        yield 'REALM_ROLE', None, role.get('name'), role
+    for client_id, roles in module.params['client_roles'].items():
+        for role in roles:
+            yield 'CLIENT_ROLE', client_id, role.get('name'), role
+    for group in module.params['groups']:
+        yield 'GROUP', None, group.get('name'), group
+    for user in module.params['users']:
+        # Keycloak stores usernames in lower case
+        user = dict(user, username=(user.get('username') or '').lower())
+        yield 'USER', None, user['username'], user
+
+
+def existing_objects(kc, module, realm):
+    """ Returns the objects of the realm, indexed by (resource_type, client_id, name) """
+    export = kc.export_realm(realm=realm)
+    existing = {}
+    for client in export.get('clients') or []:
+        existing[('CLIENT', None, client.get('clientId'))] = client
+    roles = export.get('roles') or {}
+    for role in roles.get('realm') or []:
+        existing[('REALM_ROLE', None, role.get('name'))] = role
+    for client_id, client_roles in (roles.get('client') or {}).items():
+        for role in client_roles:
+            existing[('CLIENT_ROLE', client_id, role.get('name'))] = role
+    for group in export.get('groups') or []:
+        existing[('GROUP', None, group.get('name'))] = group
+    if module.params['users']:
+        with_memberships = set((user.get('username') or '').lower() for user in module.params['users']
+                               if any(key in user for key in USER_MEMBERSHIP_KEYS))
+        for user in kc.get_users(realm=realm):
+            if user.get('username') in with_memberships:
+                user.update(kc.get_user_memberships(user['id'], realm=realm))
+            existing[('USER', None, user.get('username'))] = user
+    return existing
+
+
+def comparable(resource_type, rep):
+    """ Returns the representation to compare with the existing object """
+    if resource_type == 'USER' and rep.get('groups'):
+        # Group paths may be given without the leading slash Keycloak returns
+        rep = dict(rep, groups=[group if not isinstance(group, str) or group.startswith('/') else '/' + group
+                                for group in rep['groups']])
+    return rep
+
+
+def add_to_import(rep, resource_type, client_id, obj):
+    if resource_type == 'CLIENT':
+        rep.setdefault('clients', []).append(obj)
+    elif resource_type == 'REALM_ROLE':
+        rep.setdefault('roles', {}).setdefault('realm', []).append(obj)
+    elif resource_type == 'CLIENT_ROLE':
+        rep.setdefault('roles', {}).setdefault('client', {}).setdefault(client_id, []).append(obj)
+    elif resource_type == 'GROUP':
+        rep.setdefault('groups', []).append(obj)
+    elif resource_type == 'USER':
+        rep.setdefault('users', []).append(obj)
+
+
+def main():
+    argument_spec = keycloak_argument_spec()
+
+    meta_args = dict(
+        realm=dict(type='str', default='master'),
+        clients=dict(type='list', elements='dict', default=[]),
+        realm_roles=dict(type='list', elements='dict', default=[]),
+        client_roles=dict(type='dict', default={}),
+        groups=dict(type='list', elements='dict', default=[]),
+        users=dict(type='list', elements='dict', default=[]),
+        if_resource_exists=dict(type='str', choices=['fail', 'skip', 'overwrite'], default='skip'),
+    )
+    argument_spec.update(meta_args)
+
+    module = AnsibleModule(argument_spec=argument_spec,
+                           supports_check_mode=True,
+                           required_one_of=([['token', 'auth_realm', 'auth_username', 'auth_password']]),
+                           required_together=([['auth_realm', 'auth_username', 'auth_password']]),
+                           required_by={'refresh_token': 'auth_realm'},
+                           )
+
+    result = dict(changed=False, msg='', results=[])
+
+    # Obtain access token, initialize API
+    try:
+        connection_header = get_token(module.params)
+    except KeycloakError as e:
+        module.fail_json(msg=str(e))
+
+    kc = KeycloakAPI(module, connection_header)
+
+    realm = module.params.get('realm')
+    if_resource_exists = module.params.get('if_resource_exists')
+
+    for client_id, roles in module.params['client_roles'].items():
+        if not isinstance(roles, list) or not all(isinstance(role, dict) for role in roles):
+            module.fail_json(msg='The roles of client %s in client_roles must be a list of dictionaries' % client_id)
+
+    existing = existing_objects(kc, module, realm)
+
+    import_rep = {}
+    conflicts = []
+    diffs = []
+    for resource_type, client_id, name, desired in desired_objects(module):
+        if not name:
+            module.fail_json(msg='A %s is missing its %s' % (resource_type.lower().replace('_', ' '), NAME_KEYS[resource_type]))
+        object_result = dict(resource_type=resource_type, resource_name=name)
+        if client_id is not None:
+            object_result['client_id'] = client_id
+
+        before = existing.get((resource_type, client_id, name))
+        after = None
+        if before is None:
+            object_result['action'] = 'ADDED'
+            after = desired
+        elif is_struct_included(comparable(resource_type, desired), before, exclude=COMPARE_EXCLUDE):
+            object_result['action'] = 'UNCHANGED'
+        elif if_resource_exists == 'overwrite':
+            object_result['action'] = 'OVERWRITTEN'
+            after = merge(before, desired)
+        elif if_resource_exists == 'skip':
+            object_result['action'] = 'SKIPPED'
+        else:
+            conflicts.append(object_result)
+            continue
+
+        if before is not None and before.get('id') is not None:
+            object_result['id'] = before['id']
+        object_result['changed'] = after is not None
+        if after is not None:
+            add_to_import(import_rep, resource_type, client_id, after)
+            if module._diff:
+                object_result['diff'] = dict(before=sanitize(before) if before is not None else {}, after=sanitize(after))
+                diffs.append(dict(before_header='%s %s' % (resource_type, name), before=object_result['diff']['before'],
+                                  after_header='%s %s' % (resource_type, name), after=object_result['diff']['after']))
+        result['results'].append(object_result)
+
+    if conflicts:
+        module.fail_json(msg='%d objects of realm %s already exist and differ from the desired state: %s'
+                             % (len(conflicts), realm, ', '.join('%s %s' % (c['resource_type'], c['resource_name']) for c in conflicts)),
+                         conflicts=conflicts)
+
+    result['changed'] = bool(import_rep)
+    if module._diff:
+        result['diff'] = diffs
+
+    if import_rep and not module.check_mode:
+        import_rep['ifResourceExists'] = if_resource_exists.upper()
+        response = kc.partial_import_realm(import_rep, realm=realm)
+
+        # Fill in the IDs of the added objects
+        ids = {}
+        for r in response.get('results') or []:
+            ids.setdefault((r.get('resourceType'), r.get('resourceName')), []).append(r.get('id'))
+        for object_result in result['results']:
+            object_ids = ids.get((object_result['resource_type'], object_result['resource_name']))
+            if object_result['changed'] and object_ids:
+                object_result['id'] = object_ids.pop(0)
+
+    counts = dict((action, len([r for r in result['results'] if r['action'] == action]))
+                  for action in ('ADDED', 'OVERWRITTEN', 'SKIPPED', 'UNCHANGED'))
+    result['msg'] = 'Added %d, overwritten %d, skipped %d, unchanged %d objects of realm %s' % (
+        counts['ADDED'], counts['OVERWRITTEN'], counts['SKIPPED'], counts['UNCHANGED'], realm)
+
+    module.exit_json(**result)
+
+
+if __name__ == '__main__':
+    main()
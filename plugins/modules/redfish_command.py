@@ -843,6 +843,24 @@ return_values:
       "status": "New"
     }
   }
+response_cache:
+  description:
+    - Statistics of the cache of GET responses used during the run.
+    - Cached responses are only reused after the service confirmed with C(If-None-Match) that they did not change.
+  returned: on success
+  type: dict
+  version_added: 10.5.0
+  contains:
+    hits:
+      description: Number of GET requests answered from the cache without a request.
+      type: int
+    misses:
+      description: Number of GET requests answered with a full response from the service.
+      type: int
+    revalidated:
+      description: Number of cached responses confirmed by the service with C(304 Not Modified).
+      type: int
+  sample: {"hits": 0, "misses": 12, "revalidated": 5}
 """
 
 from ansible.module_utils.basic import AnsibleModule
@@ -1014,6 +1032,7 @@ def main():
     rf_utils = RedfishUtils(creds, root_uri, timeout, module,
                             resource_id=resource_id, data_modification=True, strip_etag_quotes=strip_etag_quotes,
                             ciphers=ciphers)
+    rf_utils.enable_response_cache(revalidate=True)
 
     # Check that Category is valid
     if category not in CATEGORY_COMMANDS_ALL:
@@ -1158,7 +1177,8 @@ def main():
         session = result.get('session', dict())
         module.exit_json(changed=changed, session=session,
                          msg='Action was successful',
-                         return_values=return_values)
+                         return_values=return_values,
+                         response_cache=rf_utils.response_cache_stats)
     else:
         module.fail_json(msg=to_native(result['msg']))
 
@@ -401,6 +401,24 @@ result:
   returned: always
   type: dict
   sample: List of CPUs on system
+response_cache:
+  description:
+    - Statistics of the cache of GET responses used during the run.
+    - Every URI is read once per run, repeated reads are served from the cache.
+  returned: always
+  type: dict
+  version_added: 10.5.0
+  contains:
+    hits:
+      description: Number of GET requests answered from the cache.
+      type: int
+    misses:
+      description: Number of GET requests sent to the service.
+      type: int
+    revalidated:
+      description: Number of cached responses confirmed by the service with C(304 Not Modified).
+      type: int
+  sample: {"hits": 42, "misses": 57, "revalidated": 0}
 """
 
 from ansible.module_utils.basic import AnsibleModule
@@ -482,6 +500,7 @@ def main():
     # Build root URI
     root_uri = "https://" + module.params['baseuri']
     rf_utils = RedfishUtils(creds, root_uri, timeout, module, ciphers=ciphers)
+    rf_utils.enable_response_cache()
 
     # Build Category list
     if "all" in module.params['category']:
@@ -643,7 +662,7 @@ def main():
                     result["service_id"] = rf_utils.get_service_identification(manager)
 
     # Return data back
-    module.exit_json(redfish_facts=result)
+    module.exit_json(redfish_facts=result, response_cache=rf_utils.response_cache_stats)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import gzip
+import threading
+import time
+
+from ansible.module_utils.six.moves import queue
+
+
+_STOP = object()
+
+
+def gzip_body(body):
+    """Compress a request body, returning the body and the headers to add to the request."""
+    if not isinstance(body, bytes):
+        body = body.encode('utf-8')
+    return gzip.compress(body), {'Content-Encoding': 'gzip'}
+
+
+class BatchEventSender(object):
+    """Ships events to a collector from a background thread.
+
+    Events are put into a bounded queue by ``submit()`` and never block the caller;
+    if the queue is full, the event is dropped. The background thread collects events
+    into batches per group and calls ``post(group, events)`` once a batch reaches
+    ``batch_size`` events or its oldest event is ``flush_interval`` seconds old.
+    Failed posts are retried ``retries`` times with exponential backoff, after that
+    the events of the batch are dropped.
+
+    ``close()`` must be called at the end of the run to flush the remaining events.
+    With a timeout, posts are no longer retried once it has passed, and the events
+    that have not been sent when it runs out are counted as dropped.
+    Raises ValueError if ``queue_size`` is not positive.
+    """
+
+    def __init__(self, post, batch_size=100, flush_interval=5.0, queue_size=10000, retries=3, retry_delay=1.0):
+        if queue_size < 1:
+            # queue.Queue would be unbounded
+            raise ValueError(f'queue_size must be at least 1, got {queue_size}')
+        self._post = post
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pending = 0
+        self._deadline = None
+        self._abandoned = False
+        self.sent = 0
+        self.queue_full = 0
+        self.failed = 0
+        self.unsent = 0
+        self.last_error = None
+
+    @property
+    def dropped(self):
+        """Number of events that have not been sent, for whatever reason."""
+        return self.queue_full + self.failed + self.unsent
+
+    def drop_summary(self):
+        """Describe how many events have been dropped and why."""
+        reasons = []
+        if self.queue_full:
+            reasons.append(f'{self.queue_full} because the queue was full')
+        if self.failed:
+            reasons.append(f'{self.failed} because sending them failed (last error: {self.last_error})')
+        if self.unsent:
+            reasons.append(f'{self.unsent} because they were not sent before the close timeout')
+        return f'dropped {self.dropped} events: {", ".join(reasons)}'
+
+    def submit(self, event, group=None):
+        """Queue an event for sending. Returns False if the event has been dropped."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='event-sender')
+            self._thread.daemon = True
+            self._thread.start()
+        try:
+            self._queue.put_nowait((group, event))
+        except queue.Full:
+            with self._lock:
+                self.queue_full += 1
+            return False
+        with self._lock:
+            self._pending += 1
+        return True
+
+    def close(self, timeout=None):
+        """Flush all queued events and stop the background thread, waiting at most ``timeout`` seconds."""
+        if self._thread is None:
+            return
+        if timeout is not None:
+            self._deadline = time.monotonic() + timeout
+        try:
+            self._queue.put(_STOP, timeout=self._remaining())
+        except queue.Full:
+            pass
+        self._thread.join(self._remaining())
+        if self._thread.is_alive():
+            # the daemon thread is left behind, it must not count the events again
+            with self._lock:
+                self._abandoned = True
+                self.unsent += self._pending
+                self._pending = 0
+        self._thread = None
+
+    def _remaining(self):
+        if self._deadline is None:
+            return None
+        return max(0, self._deadline - time.monotonic())
+
+    def _run(self):
+        batches = {}
+        deadline = None
+        while True:
+            timeout = None
+            if deadline is not None:
+                timeout = max(0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is not None and item is not _STOP:
+                group, event = item
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                events = batches.setdefault(group, [])
+                events.append(event)
+                if len(events) >= self.batch_size:
+                    self._flush(group, batches.pop(group))
+                    if not batches:
+                        deadline = None
+
+            # checked after every event, so that batches are not held back while events keep arriving
+            if item is _STOP or (deadline is not None and time.monotonic() >= deadline):
+                for group, events in batches.items():
+                    self._flush(group, events)
+                batches = {}
+                deadline = None
+                if item is _STOP:
+                    return
+
+    def _flush(self, group, events):
+        for attempt in range(self.retries + 1):
+            try:
+                self._post(group, events)
+            except Exception as e:  # pylint: disable=broad-except
+                self.last_error = e
+                remaining = self._remaining()
+                if remaining == 0:
+                    break
+                if attempt < self.retries:
+                    delay = self.retry_delay * 2 ** attempt
+                    time.sleep(delay if remaining is None else min(delay, remaining))
+                continue
+            self._count(sent=len(events))
+            return
+        self._count(failed=len(events))
+
+    def _count(self, sent=0, failed=0):
+        with self._lock:
+            if self._abandoned:
+                return
+            self._pending -= sent + failed
+            self.sent += sent
+            self.failed += failed
@@ -0,0 +1,58 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from functools import lru_cache
+
+from ansible.errors import AnsibleError, AnsibleFilterError
+
+try:
+    import jmespath
+    HAS_LIB = True
+except ImportError:
+    HAS_LIB = False
+
+
+# Number of compiled expressions to keep around
+COMPILE_CACHE_SIZE = 256
+
+
+def _register_ansible_types():
+    # Hack to handle Ansible Unsafe text, AnsibleMapping and AnsibleSequence
+    # See issue: https://github.com/ansible-collections/community.general/issues/320
+    # The names are only added once, so that the type lookup tables do not grow with every query.
+    for jmespath_type, type_names in (
+        ('string', ('AnsibleUnicode', 'AnsibleUnsafeText', )),
+        ('array', ('AnsibleSequence', )),
+        ('object', ('AnsibleMapping', )),
+    ):
+        existing = jmespath.functions.REVERSE_TYPES_MAP[jmespath_type]
+        jmespath.functions.REVERSE_TYPES_MAP[jmespath_type] = existing + tuple(name for name in type_names if name not in existing)
+
+
+if HAS_LIB:
+    _register_ansible_types()
+
+
+@lru_cache(maxsize=COMPILE_CACHE_SIZE)
+def _compile(expr):
+    return jmespath.compile(expr)
+
+
+def _check_lib(filter_name):
+    if not HAS_LIB:
+        raise AnsibleError(f'You need to install "jmespath" prior to running {filter_name} filter')
+
+
+def _search(filter_name, expr, data):
+    """Evaluate a JMESPath expression, compiling it only the first time it is seen."""
+    try:
+        return _compile(expr).search(data)
+    except jmespath.exceptions.JMESPathError as e:
+        raise AnsibleFilterError(f'JMESPathError in {filter_name} filter plugin:\n{e}')
+    except Exception as e:
+        # For older jmespath, we can get ValueError and TypeError without much info.
+        raise AnsibleFilterError(f'Error in jmespath.search in {filter_name} filter plugin:\n{e}')
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import shutil
+import stat
+
+from ansible.module_utils.common.text.converters import to_bytes, to_text
+from ansible.module_utils.six.moves.urllib.parse import quote, urlencode
+
+from ansible_collections.community.general.plugins.module_utils.lxd import LXDClientException
+
+
+class LXDInstance(object):
+    """
+    Run commands in, and transfer files to and from, an LXD or Incus instance
+    through the REST API of the server, over a single connection.
+    """
+
+    def __init__(self, client, name, project=None, header_prefix='X-LXD'):
+        """
+        :param client: The LXDClient connected to the server.
+        :param name: The name of the instance.
+        :param project: The project of the instance, if not the default one.
+        :param header_prefix: The prefix of the headers of the file API, C(X-LXD) or C(X-Incus).
+        """
+        self.client = client
+        self.name = name
+        self.project = project
+        self.header_prefix = header_prefix
+
+    def _url(self, url, **params):
+        if self.project:
+            params['project'] = self.project
+        if params:
+            url += ('&' if '?' in url else '?') + urlencode(params)
+        return url
+
+    def _instance_url(self, endpoint, **params):
+        return self._url(f"/1.0/instances/{quote(self.name, safe='')}{endpoint}", **params)
+
+    def _read_output(self, url):
+        if not url:
+            return b''
+        url = self._url(url)
+        data = self.client.request_raw('GET', url).read()
+        # the output is kept by the server until the instance stops otherwise
+        try:
+            self.client.request_raw('DELETE', url).read()
+        except LXDClientException:
+            pass
+        return data
+
+    def exec_command(self, command):
+        """
+        Run command, a list of arguments, in the instance and record its output.
+
+        :return: The exit code, the standard output and the standard error of the command.
+        """
+        body = {
+            'command': command,
+            'environment': {},
+            'interactive': False,
+            'wait-for-websocket': False,
+            'record-output': True,
+        }
+        resp_json = self.client.do('POST', self._instance_url('/exec'), body_json=body)
+        metadata = resp_json['metadata'].get('metadata') or {}
+        output = metadata.get('output') or {}
+        return metadata.get('return', -1), self._read_output(output.get('1')), self._read_output(output.get('2'))
+
+    def put_data(self, data, out_path, uid=None, gid=None, mode=None):
+        """ Write data, bytes or a file object, to out_path in the instance """
+        headers = {
+            'Content-Type': 'application/octet-stream',
+            f'{self.header_prefix}-type': 'file',
+            f'{self.header_prefix}-write': 'overwrite',
+        }
+        if uid is not None:
+            headers[f'{self.header_prefix}-uid'] = str(uid)
+        if gid is not None:
+            headers[f'{self.header_prefix}-gid'] = str(gid)
+        if mode is not None:
+            headers[f'{self.header_prefix}-mode'] = '%04o' % mode
+        if isinstance(data, bytes):
+            headers['Content-Length'] = str(len(data))
+        else:
+            headers['Content-Length'] = str(os.fstat(data.fileno()).st_size)
+        self.client.request_raw('POST', self._instance_url('/files', path=out_path), body=data, headers=headers).read()
+
+    def put_file(self, in_path, out_path, uid=None, gid=None):
+        """ Copy the local file in_path to out_path in the instance, with the same mode """
+        with open(to_bytes(in_path, errors='surrogate_or_strict'), 'rb') as in_file:
+            mode = stat.S_IMODE(os.fstat(in_file.fileno()).st_mode)
+            self.put_data(in_file, out_path, uid=uid, gid=gid, mode=mode)
+
+    def fetch_file(self, in_path, out_path):
+        """ Copy the file in_path in the instance to the local file out_path """
+        resp = self.client.request_raw('GET', self._instance_url('/files', path=in_path))
+        if resp.getheader(f'{self.header_prefix}-type', 'file') != 'file':
+            resp.read()
+            raise LXDClientException(f'{to_text(in_path)} is not a file')
+        with open(to_bytes(out_path, errors='surrogate_or_strict'), 'wb') as out_file:
+            shutil.copyfileobj(resp, out_file)
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import errno
+import os
+import shutil
+
+from ansible.errors import AnsibleError
+from ansible.module_utils.common.text.converters import to_bytes, to_text
+
+# same limit as the Linux kernel
+MAX_SYMLINKS = 40
+
+# errors of copy_file_range() and sendfile() telling that the files do not support them
+_FALLBACK_ERRNOS = frozenset((errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EBADF,
+                              errno.ENOTSOCK))
+
+
+def _split(path):
+    return [c for c in to_bytes(path, errors='surrogate_or_strict').split(b'/') if c and c != b'.']
+
+
+def _open_in_root(root, path, flags, mode):
+    """
+    Open the file path inside the directory root, resolving symbolic links and ".."
+    the way a process chrooted into root would, so that they cannot lead outside of root.
+    Returns the file descriptor, and whether the file was created.
+    """
+    root_fd = os.open(to_bytes(root, errors='surrogate_or_strict'), os.O_RDONLY | os.O_DIRECTORY)
+    # the file descriptors of the directories leading to the current one, starting with root
+    dirs = [root_fd]
+    try:
+        components = _split(path)
+        symlinks = 0
+        while components:
+            name = components.pop(0)
+            if name == b'..':
+                # cannot go above root
+                if len(dirs) > 1:
+                    os.close(dirs.pop())
+                continue
+
+            last = not components
+            try:
+                if not last:
+                    dirs.append(os.open(name, os.O_RDONLY | os.O_DIRECTORY | os.O_NOFOLLOW, dir_fd=dirs[-1]))
+                    continue
+                if flags & os.O_CREAT:
+                    try:
+                        return os.open(name, flags | os.O_EXCL | os.O_NOFOLLOW, mode, dir_fd=dirs[-1]), True
+                    except OSError as e:
+                        if e.errno != errno.EEXIST:
+                            raise
+                return os.open(name, (flags & ~os.O_CREAT) | os.O_NOFOLLOW, dir_fd=dirs[-1]), False
+            except OSError as e:
+                if e.errno not in (errno.ELOOP, errno.ENOTDIR, errno.EMLINK):
+                    raise
+                # O_NOFOLLOW refused a symbolic link, or the component is not a directory
+                try:
+                    target = os.readlink(name, dir_fd=dirs[-1])
+                except OSError:
+                    raise e
+                symlinks += 1
+                if symlinks > MAX_SYMLINKS:
+                    raise OSError(errno.ELOOP, os.strerror(errno.ELOOP))
+                if target.startswith(b'/'):
+                    # absolute links are relative to root
+                    for fd in dirs[1:]:
+                        os.close(fd)
+                    dirs = [root_fd]
+                components = _split(target) + components
+        # the path is root itself, or resolved to it
+        raise OSError(errno.EISDIR, os.strerror(errno.EISDIR))
+    finally:
+        for fd in dirs:
+            os.close(fd)
+
+
+def _copy(in_fd, out_fd):
+    """ Copy the rest of in_fd to out_fd, without copying the data through Python where possible """
+    for name in ('copy_file_range', 'sendfile'):
+        func = getattr(os, name, None)
+        if func is None:
+            continue
+        try:
+            while True:
+                if name == 'sendfile':
+                    copied = func(out_fd, in_fd, None, 1024 * 1024 * 1024)
+                else:
+                    copied = func(in_fd, out_fd, 1024 * 1024 * 1024)
+                if not copied:
+                    return
+        except OSError as e:
+            # the calls fail before copying anything on unsupported files, so the next method
+            # carries on from the current offsets
+            if e.errno not in _FALLBACK_ERRNOS:
+                raise
+    with os.fdopen(os.dup(in_fd), 'rb') as in_file, os.fdopen(os.dup(out_fd), 'wb') as out_file:
+        shutil.copyfileobj(in_file, out_file)
+
+
+def read_owner(root, user):
+    """ Return the uid and gid of user from the passwd file of root """
+    try:
+        fd = _open_in_root(root, '/etc/passwd', os.O_RDONLY, 0)[0]
+        with os.fdopen(fd, 'rb') as f:
+            for line in f:
+                fields = line.rstrip(b'\n').split(b':')
+                if len(fields) >= 4 and fields[0] == to_bytes(user):
+                    return int(fields[2]), int(fields[3])
+    except (OSError, ValueError) as e:
+        raise AnsibleError(f"failed to read the passwd file of {root}: {to_text(e)}")
+    raise AnsibleError(f"user {user} not found in {root}/etc/passwd")
+
+
+def put_file_in_root(root, in_path, out_path, owner=None):
+    """
+    Copy the local file in_path to out_path inside root.
+
+    Like dd, an existing file is truncated and keeps its owner and mode. A new file
+    is owned by owner, a tuple of uid and gid, if set.
+    """
+    try:
+        with open(to_bytes(in_path, errors='surrogate_or_strict'), 'rb') as in_file:
+            fd, created = _open_in_root(root, out_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+            try:
+                if created and owner is not None:
+                    os.fchown(fd, *owner)
+                _copy(in_file.fileno(), fd)
+            finally:
+                os.close(fd)
+    except (IOError, OSError) as e:
+        raise AnsibleError(f"failed to transfer file {in_path} to {out_path}: {to_text(e)}")
+
+
+def fetch_file_from_root(root, in_path, out_path):
+    """ Copy the file in_path inside root to the local file out_path """
+    try:
+        fd = _open_in_root(root, in_path, os.O_RDONLY, 0)[0]
+        try:
+            with open(to_bytes(out_path, errors='surrogate_or_strict'), 'wb+') as out_file:
+                _copy(fd, out_file.fileno())
+        finally:
+            os.close(fd)
+    except (IOError, OSError) as e:
+        raise AnsibleError(f"failed to transfer file {in_path} to {out_path}: {to_text(e)}")
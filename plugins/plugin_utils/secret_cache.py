@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import base64
+import hashlib
+import hmac
+import json
+import multiprocessing
+import os
+import shutil
+import stat
+import tempfile
+import time
+
+from ansible.errors import AnsibleError
+from ansible.module_utils.common.text.converters import to_bytes, to_text
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+    HAS_CRYPTOGRAPHY = True
+except ImportError:
+    HAS_CRYPTOGRAPHY = False
+
+
+DIR_PREFIX = 'ansible-secret-cache-'
+
+# values cached with mode 'memory', by namespace
+_MEMORY = {}
+
+
+def _read_proc(pid, name):
+    with open(f'/proc/{pid}/{name}', 'rb') as f:
+        return f.read()
+
+
+def _proc_stat(pid):
+    # the fields following the command name, which can contain spaces and parentheses
+    return _read_proc(pid, 'stat').rsplit(b')', 1)[1].split()
+
+
+def _process_alive(pid, start_time):
+    try:
+        return _proc_stat(pid)[19] == to_bytes(start_time)
+    except (OSError, IndexError):
+        return False
+
+
+def _group_alive(pgid):
+    try:
+        os.killpg(pgid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    return True
+
+
+def run_id():
+    """
+    Return an identifier of the current Ansible run.
+
+    Ansible runs tasks in processes forked from the controller process, which all have the same command line.
+    The run is identified by the process ID and the start time of the topmost process with this command line.
+    Without /proc, the process group is used.
+    """
+    pid = os.getpid()
+    try:
+        cmdline = _read_proc(pid, 'cmdline')
+        while True:
+            ppid = int(_proc_stat(pid)[1])
+            if ppid <= 1 or _read_proc(ppid, 'cmdline') != cmdline:
+                break
+            pid = ppid
+        return f'{pid}-{to_text(_proc_stat(pid)[19])}'
+    except (OSError, IndexError, ValueError):
+        return f'pgrp{os.getpgrp()}'
+
+
+def run_secret(purpose):
+    """
+    Return a secret of the current Ansible run for purpose.
+
+    The secret is derived from the authentication key of multiprocessing, which is created randomly in the controller
+    process and inherited by the forked worker processes. It is only kept in memory.
+    """
+    return hmac.new(bytes(multiprocessing.current_process().authkey), to_bytes(purpose), hashlib.sha256).digest()
+
+
+def default_directory():
+    if os.path.isdir('/dev/shm'):
+        return '/dev/shm'
+    return tempfile.gettempdir()
+
+
+class SecretCache(object):
+    """
+    Cache for values fetched from secret stores, used by lookups that call a command line utility per secret.
+
+    With mode ``memory``, values are kept in the memory of the current process. With mode ``file``, every
+    value is stored encrypted in a file of a directory that belongs to the current Ansible run, so that all
+    forked worker processes of the run share the cache. The name of the directory ends with a suffix that cannot
+    be guessed, and the encryption key is never written to disk; both are derived from run_secret().
+    Directories of runs that are no longer running are removed.
+
+    Values must be JSON serializable, and ``None`` cannot be cached.
+    """
+
+    def __init__(self, namespace, mode='memory', ttl=300, directory=None):
+        self.namespace = namespace
+        self.mode = mode
+        self.ttl = ttl
+        self._fernet = None
+        self._path = None
+
+        if mode == 'file':
+            if not HAS_CRYPTOGRAPHY:
+                raise AnsibleError('The file secret cache requires the Python cryptography library')
+            directory = directory or default_directory()
+            uid = os.getuid()
+            suffix = to_text(base64.b32encode(run_secret('secret cache directory')[:10])).lower()
+            self._path = os.path.join(directory, f'{DIR_PREFIX}{uid}-{run_id()}-{suffix}')
+            self._fernet = Fernet(base64.urlsafe_b64encode(run_secret('secret cache key')))
+            self._open_directory(directory, uid)
+
+    @classmethod
+    def from_options(cls, plugin, namespace):
+        """Create a cache from the options of the community.general.secret_cache doc fragment, or return None if it is disabled."""
+        mode = plugin.get_option('secret_cache')
+        if mode in (None, 'none'):
+            return None
+        cache = cls(namespace, mode=mode, ttl=plugin.get_option('secret_cache_ttl'), directory=plugin.get_option('secret_cache_dir'))
+        if plugin.get_option('secret_cache_invalidate'):
+            cache.invalidate()
+        return cache
+
+    def _open_directory(self, directory, uid):
+        try:
+            os.mkdir(self._path, 0o700)
+        except FileExistsError:
+            pass
+        else:
+            # the umask can remove permissions from the owner
+            os.chmod(self._path, 0o700)
+            self._remove_stale(directory, uid)
+
+        # the directory can have been created by another user, or replaced by a symbolic link
+        try:
+            st = os.lstat(self._path)
+        except OSError as e:
+            raise AnsibleError(f'Cannot access secret cache directory {self._path}: {e}')
+        if not stat.S_ISDIR(st.st_mode) or st.st_uid != uid or stat.S_IMODE(st.st_mode) != 0o700:
+            raise AnsibleError(f'Refusing to use secret cache directory {self._path}, it must be a directory owned by the current user with mode 0700')
+
+    def _remove_stale(self, directory, uid):
+        prefix = f'{DIR_PREFIX}{uid}-'
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(directory, name)
+            if not name.startswith(prefix) or path == self._path:
+                continue
+            try:
+                st = os.lstat(path)
+            except OSError:
+                continue
+            if not stat.S_ISDIR(st.st_mode) or st.st_uid != uid:
+                continue
+            run = name[len(prefix):].rpartition('-')[0]
+            if run.startswith('pgrp'):
+                alive = run[4:].isdigit() and _group_alive(int(run[4:]))
+            else:
+                pid, dummy, start_time = run.partition('-')
+                alive = pid.isdigit() and _process_alive(int(pid), start_time)
+            if not alive:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def _hash(self, key):
+        return hashlib.sha256(to_bytes(json.dumps([self.namespace, key], sort_keys=True))).hexdigest()
+
+    def _file(self, key):
+        return os.path.join(self._path, f'{self.namespace}-{self._hash(key)}')
+
+    def get(self, key):
+        """Return the cached value for key, or None if it is not cached or has expired."""
+        if self.mode == 'memory':
+            expires, value = _MEMORY.get(self.namespace, {}).get(self._hash(key), (0, None))
+            return value if expires > time.time() else None
+
+        path = self._file(key)
+        try:
+            with open(path, 'rb') as f:
+                token = f.read()
+        except OSError:
+            return None
+        try:
+            return json.loads(to_text(self._fernet.decrypt(token, ttl=self.ttl)))
+        except (InvalidToken, ValueError):
+            self._remove(path)
+            return None
+
+    def set(self, key, value):
+        if value is None:
+            return
+        if self.mode == 'memory':
+            _MEMORY.setdefault(self.namespace, {})[self._hash(key)] = (time.time() + self.ttl, value)
+            return
+
+        path = self._file(key)
+        tmp_path = f'{path}.{os.getpid()}'
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(self._fernet.encrypt(to_bytes(json.dumps(value))))
+        os.replace(tmp_path, path)
+
+    def invalidate(self, key=None):
+        """Remove the cached value for key, or all values of the namespace if key is None."""
+        if self.mode == 'memory':
+            if key is None:
+                _MEMORY.pop(self.namespace, None)
+            else:
+                _MEMORY.get(self.namespace, {}).pop(self._hash(key), None)
+            return
+
+        if key is not None:
+            self._remove(self._file(key))
+            return
+        for name in os.listdir(self._path):
+            if name.startswith(f'{self.namespace}-'):
+                self._remove(os.path.join(self._path, name))
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -16,3 +16,116 @@ from ansible_collections.community.general.plugins.cache.memcached import CacheM
 
 def test_memcached_cachemodule():
     assert isinstance(cache_loader.get('community.general.memcached'), MemcachedCache)
+
+
+class FakeMemcacheClient(object):
+    """ In-memory stand-in for memcache.Client, shared by all connections of a test """
+    store = {}
+
+    def __init__(self, *args, **kwargs):
+        self.calls = []
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def gets(self, key):
+        return self.store.get(key)
+
+    def get_multi(self, keys, key_prefix=''):
+        self.calls.append('get_multi')
+        return dict((k, self.store[key_prefix + k]) for k in keys if key_prefix + k in self.store)
+
+    def set(self, key, value, time=0, min_compress_len=0):
+        self.store[key] = value
+        return True
+
+    def set_multi(self, mapping, key_prefix=''):
+        for k, v in mapping.items():
+            self.store[key_prefix + k] = v
+        return []
+
+    def add(self, key, value):
+        if key in self.store:
+            return False
+        self.store[key] = value
+        return True
+
+    def append(self, key, value):
+        if key not in self.store:
+            return False
+        self.store[key] += value
+        return True
+
+    def cas(self, key, value):
+        self.store[key] = value
+        return True
+
+    def delete(self, key):
+        self.store.pop(key, None)
+        return 1
+
+    def delete_multi(self, keys, key_prefix=''):
+        for k in keys:
+            self.store.pop(key_prefix + k, None)
+        return 1
+
+    def disconnect_all(self):
+        pass
+
+
+@pytest.fixture
+def memcached(monkeypatch):
+    FakeMemcacheClient.store = {}
+    monkeypatch.setattr('ansible_collections.community.general.plugins.cache.memcached.memcache.Client', FakeMemcacheClient)
+    return FakeMemcacheClient.store
+
+
+def test_memcached_keyset_is_append_only(memcached):
+    cache = cache_loader.get('community.general.memcached')
+    for i in range(100):
+        cache.set('host%d' % i, {'i': i})
+    cache.delete('host0')
+
+    shards = [k for k in memcached if k.startswith('ansible_cache_keys_')]
+    assert 1 < len(shards) <= 16
+    # each write appends one line to a single shard
+    assert sum(len(memcached[k].splitlines()) for k in shards) == 101
+
+    other = cache_loader.get('community.general.memcached')
+    assert sorted(other.keys()) == sorted('host%d' % i for i in range(1, 100))
+    assert not other.contains('host0')
+    assert other.get('host42') == {'i': 42}
+
+
+def test_memcached_copy_uses_get_multi(memcached):
+    cache = cache_loader.get('community.general.memcached')
+    cache.set('host1', {'a': 1})
+    cache.set('host2', {'b': 2})
+    # expired in memcached, but still in the keyset
+    del memcached['ansible_factshost2']
+
+    other = cache_loader.get('community.general.memcached')
+    assert other.copy() == {'host1': {'a': 1}}
+    assert other.keys() == ['host1']
+
+    other.flush()
+    assert other.keys() == []
+    assert 'ansible_factshost1' not in memcached
+
+
+def test_memcached_keyset_migration_and_compaction(memcached, monkeypatch):
+    from ansible_collections.community.general.plugins.cache.memcached import CacheModuleKeys
+
+    memcached['ansible_facts' + 'old'] = {'c': 3}
+    memcached['ansible_cache_keys'] = {'old': 1e10}
+    cache = cache_loader.get('community.general.memcached')
+    assert cache.keys() == ['old']
+    assert 'ansible_cache_keys' not in memcached
+
+    monkeypatch.setattr(CacheModuleKeys, 'MAX_LOG_SIZE', 100)
+    for i in range(20):
+        cache.set('old', {'c': i})
+    shard = cache._keys._shard('old')
+    assert len(memcached[shard].splitlines()) == 21
+    cache.keys()
+    assert len(memcached[shard].splitlines()) == 1
@@ -6,10 +6,14 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+import json
+
 import pytest
 
 pytest.importorskip('redis')
 
+from ansible_collections.community.general.tests.unit.compat.mock import patch
+
 from ansible.plugins.loader import cache_loader
 from ansible_collections.community.general.plugins.cache.redis import CacheModule as RedisCache
 
@@ -24,3 +28,59 @@ def test_redis_cachemodule():
     # The _uri option is required for the redis plugin
     connection = '[::1]:6379:1'
     assert isinstance(cache_loader.get('community.general.redis', **{'_uri': connection}), RedisCache)
+
+
+@pytest.mark.parametrize('serializer, compress', [
+    ('json', False),
+    ('compact_json', False),
+    ('compact_json', True),
+    ('msgpack', False),
+    ('msgpack', True),
+])
+def test_redis_cachemodule_encoding(serializer, compress):
+    if serializer == 'msgpack':
+        pytest.importorskip('msgpack')
+    cache = cache_loader.get('community.general.redis', **{'_uri': '127.0.0.1:6379:1', '_serializer': serializer, '_compress': compress})
+    value = {'ansible_facts': {'hostname': u'hosté', 'interfaces': ['lo', 'eth0'], 'virtual': None, 'count': 2}}
+    data = cache._encode(value)
+    assert cache._decode(data) == value
+    # records written with other settings are readable as well
+    assert cache._decode(json.dumps(value).encode('utf-8')) == value
+
+
+def test_redis_cachemodule_pipelines():
+    with patch('ansible_collections.community.general.plugins.cache.redis.StrictRedis') as mock_redis:
+        cache = cache_loader.get('community.general.redis', **{'_uri': '127.0.0.1:6379:1', '_serializer': 'compact_json'})
+    db = mock_redis.return_value
+    pipe = db.pipeline.return_value
+
+    cache.set('host1', {'a': 1})
+    db.pipeline.assert_called_with(transaction=True)
+    pipe.setex.assert_called_once_with('ansible_factshost1', 86400, b'{"a":1}')
+    assert pipe.zadd.call_count == 1
+    assert pipe.execute.call_count == 1
+    assert not db.setex.called
+
+    db.zrange.return_value = [b'host1', b'host2', b'host3']
+    db.mget.return_value = [b'{"b":2}', None]
+    assert cache.copy() == {'host1': {'a': 1}, 'host2': {'b': 2}}
+    db.mget.assert_called_once_with(['ansible_factshost2', 'ansible_factshost3'])
+    pipe.zrem.assert_called_once_with('ansible_cache_keys', 'host3')
+    # the keyset was swept only once
+    cache.keys()
+    assert db.zremrangebyscore.call_count == 1
+
+
+def test_redis_cachemodule_cluster():
+    pytest.importorskip('redis.cluster')
+    with patch('redis.cluster.RedisCluster') as mock_cluster:
+        cache = cache_loader.get('community.general.redis', **{'_uri': '127.0.0.1:7000:0:changeme', '_cluster': True})
+    mock_cluster.assert_called_once_with(host='127.0.0.1', port=7000, password='changeme')
+    db = mock_cluster.return_value
+    pipe = db.pipeline.return_value
+
+    cache.set('host1', {'a': 1})
+    db.pipeline.assert_called_with(transaction=False)
+    assert pipe.setex.call_args[0][0] == '{ansible_cache_keys}ansible_factshost1'
+    assert list(pipe.zadd.call_args[0][1]) == ['host1']
+    assert pipe.zadd.call_args[0][0] == '{ansible_cache_keys}ansible_cache_keys'
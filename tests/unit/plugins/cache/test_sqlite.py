@@ -0,0 +1,63 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import sqlite3
+import time
+
+from ansible.plugins.loader import cache_loader
+from ansible_collections.community.general.plugins.cache.sqlite import CacheModule as SqliteCache
+
+
+def test_sqlite_cachemodule(tmp_path):
+    assert isinstance(cache_loader.get('community.general.sqlite', _uri=str(tmp_path / 'facts.db')), SqliteCache)
+
+
+def test_sqlite_cache(tmp_path):
+    path = str(tmp_path / 'facts.db')
+    cache = cache_loader.get('community.general.sqlite', _uri=path)
+    for i in range(100):
+        cache.set('host%d' % i, {'ansible_hostname': 'host%d' % i, 'i': i})
+    cache.delete('host0')
+
+    other = cache_loader.get('community.general.sqlite', _uri=path)
+    assert sorted(other.keys()) == sorted('host%d' % i for i in range(1, 100))
+    assert other.contains('host42')
+    assert not other.contains('host0')
+    assert other.get('host42') == {'ansible_hostname': 'host42', 'i': 42}
+    assert len(other.copy()) == 99
+
+    # records of other prefixes are separate
+    assert cache_loader.get('community.general.sqlite', _uri=path, _prefix='other').keys() == []
+
+    other.flush()
+    assert cache.keys() == []
+
+    db = sqlite3.connect(path)
+    assert db.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+
+def test_sqlite_cache_expiry(tmp_path):
+    path = str(tmp_path / 'facts.db')
+    cache = cache_loader.get('community.general.sqlite', _uri=path, _timeout=60)
+    cache.set('old', {'a': 1})
+    cache.set('new', {'b': 2})
+    db = sqlite3.connect(path)
+    db.execute('UPDATE cache SET timestamp = ? WHERE key = ?', (time.time() - 120, 'old'))
+    db.commit()
+
+    other = cache_loader.get('community.general.sqlite', _uri=path, _timeout=60)
+    assert not other.contains('old')
+    assert other.copy() == {'new': {'b': 2}}
+    assert db.execute('SELECT key FROM cache').fetchall() == [('new',)]
+
+
+def test_sqlite_cache_fork(tmp_path, monkeypatch):
+    cache = cache_loader.get('community.general.sqlite', _uri=str(tmp_path / 'facts.db'))
+    connection = cache._connection()
+    monkeypatch.setattr(os, 'getpid', lambda: -1)
+    assert cache._connection() is not connection
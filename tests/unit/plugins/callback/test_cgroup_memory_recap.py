@@ -0,0 +1,88 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import errno
+import os
+import tempfile
+
+from ansible.plugins.loader import callback_loader
+
+from ansible_collections.community.general.tests.unit.compat import unittest
+from ansible_collections.community.general.tests.unit.compat.mock import MagicMock, patch
+from ansible_collections.community.general.plugins.callback.cgroup_memory_recap import MemProf, read_pressure_stall
+
+
+class TestCgroupMemoryRecap(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.current = os.path.join(self.tmpdir, 'memory.current')
+        self.pressure = os.path.join(self.tmpdir, 'memory.pressure')
+        with open(self.current, 'w') as f:
+            f.write('%d\n' % (64 * 1024 * 1024))
+        self.write_pressure(1000)
+
+    def tearDown(self):
+        for name in os.listdir(self.tmpdir):
+            os.remove(os.path.join(self.tmpdir, name))
+        os.rmdir(self.tmpdir)
+
+    def write_pressure(self, total):
+        with open(self.pressure, 'w') as f:
+            f.write('some avg10=0.00 avg60=0.00 avg300=0.00 total=%d\n' % total)
+            f.write('full avg10=0.00 avg60=0.00 avg300=0.00 total=10\n')
+
+    def test_read_pressure_stall(self):
+        self.assertEqual(read_pressure_stall(self.pressure), 1000)
+
+    def test_memprof_running_stats(self):
+        memprof = MemProf(self.current, interval=0.001, pressure_path=self.pressure)
+        memprof.add_host('host1')
+        memprof.record(10)
+        memprof.record(30)
+        memprof.remove_host('host1')
+        memprof.record(20)
+
+        self.assertEqual(memprof.min, 10)
+        self.assertEqual(memprof.max, 30)
+        self.assertEqual(memprof.mean, 20)
+        self.assertEqual(memprof.max_hosts, ('host1',))
+
+    def test_memprof_thread(self):
+        memprof = MemProf(self.current, interval=0.001, pressure_path=self.pressure)
+        memprof.start()
+        self.write_pressure(3500)
+        memprof.stop()
+
+        self.assertGreaterEqual(memprof.count, 1)
+        self.assertEqual(memprof.max, 64)
+        self.assertEqual(memprof.min, 64)
+        self.assertEqual(memprof.pressure, 2500)
+        self.assertIsNotNone(memprof.end_time)
+
+    def test_read_only_peak_file(self):
+        peak = os.path.join(self.tmpdir, 'memory.peak')
+        with open(peak, 'w') as f:
+            f.write('%d\n' % (128 * 1024 * 1024))
+        real_open = os.open
+
+        def fake_open(path, flags, *args):
+            # memory.peak cannot be opened for writing before Linux 6.12, even by its owner
+            if flags & os.O_RDWR:
+                raise OSError(errno.EACCES, os.strerror(errno.EACCES), path)
+            return real_open(path, flags, *args)
+
+        display = MagicMock(verbosity=0)
+        callback = callback_loader.get('community.general.cgroup_memory_recap', display=display)
+        with patch('os.open', side_effect=fake_open):
+            callback.set_options(direct={'max_mem_file': peak, 'cur_mem_file': self.current})
+        try:
+            self.assertIsNotNone(callback._max_fd)
+            self.assertEqual(os.pread(callback._max_fd, 64, 0), b'134217728\n')
+            display.warning.assert_called_once()
+            self.assertIn('Could not reset', display.warning.call_args[0][0])
+        finally:
+            os.close(callback._max_fd)
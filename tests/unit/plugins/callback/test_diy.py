@@ -0,0 +1,142 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import copy
+
+from ansible.plugins.callback.default import CallbackModule as Default
+from ansible.plugins.loader import callback_loader
+
+from ansible_collections.community.general.tests.unit.compat import unittest
+from ansible_collections.community.general.tests.unit.compat.mock import MagicMock, patch
+from ansible_collections.community.general.plugins.callback.diy import LazyAttributeDict
+
+
+class TestLazyAttributeDict(unittest.TestCase):
+    def test_values_looked_up_once_on_access(self):
+        getter = MagicMock(side_effect=lambda attr: attr.upper())
+        values = LazyAttributeDict(getter, ['name', 'uuid'])
+
+        getter.assert_not_called()
+        self.assertEqual(values['name'], 'NAME')
+        self.assertEqual(values['name'], 'NAME')
+        getter.assert_called_once_with('name')
+        self.assertEqual(dict(values), {'name': 'NAME', 'uuid': 'UUID'})
+        self.assertEqual(getter.call_count, 2)
+
+    def test_unknown_key(self):
+        getter = MagicMock()
+        values = LazyAttributeDict(getter, ['name'])
+
+        self.assertRaises(KeyError, values.__getitem__, 'other')
+        self.assertNotIn('other', values)
+        getter.assert_not_called()
+
+    def test_callable_attributes_only_resolved_when_iterated(self):
+        attributes = MagicMock(return_value=['name'])
+        values = LazyAttributeDict(lambda attr: attr, attributes)
+        values.add('extra', lambda: 'value')
+
+        self.assertEqual(values['extra'], 'value')
+        attributes.assert_not_called()
+        self.assertEqual(sorted(values), ['extra', 'name'])
+        self.assertEqual(len(values), 2)
+        attributes.assert_called_once_with()
+
+    def test_deepcopy_returns_same_mapping(self):
+        values = LazyAttributeDict(lambda attr: attr, ['name'])
+
+        self.assertIs(copy.deepcopy(values), values)
+
+
+class TestCallbackDiy(unittest.TestCase):
+    def setUp(self):
+        self.callback = callback_loader.get('community.general.diy')
+        self.callback.set_options()
+
+        self.variable_manager = MagicMock(extra_vars={})
+        self.variable_manager.get_vars.side_effect = lambda **kwargs: {'omit': '__omit_place_holder__'}
+        self.play = MagicMock(_uuid='play-uuid')
+        self.play.get_variable_manager.return_value = self.variable_manager
+        self.play.get_vars.return_value = {}
+        self.task = MagicMock(_uuid='task-uuid', loop=None)
+        self.task.get_vars.return_value = {}
+        self.host = MagicMock()
+        self.host.get_name.return_value = 'testhost'
+        self.host.get_vars.return_value = {}
+        self.host.get_groups.return_value = []
+
+        self.callback._diy_playbook = MagicMock()
+        self.callback._diy_loader = MagicMock()
+        self.callback._diy_play = self.play
+        self.callback._diy_task = self.task
+
+        self.result = MagicMock(_host=self.host, _task=self.task, _result={})
+
+    @patch.object(Default, 'v2_runner_on_ok')
+    def test_event_without_msg_merges_variables_by_default(self, default_on_ok):
+        # the message option could be set in variables that are only known after the merge
+        variables = {'omit': '__omit_place_holder__'}
+        with patch.object(self.callback, '_get_vars', return_value=variables) as get_vars:
+            self.callback.v2_runner_on_ok(self.result)
+
+        get_vars.assert_called_once()
+        default_on_ok.assert_called_once_with(self.result)
+        self.assertIsNotNone(self.callback._diy_spec)
+
+    @patch.object(Default, 'v2_runner_on_ok')
+    def test_event_without_msg_skips_variable_merge(self, default_on_ok):
+        self.callback.set_options(direct={'skip_vars_without_msg': True})
+        with patch.object(self.callback, '_get_vars') as get_vars:
+            self.callback.v2_runner_on_ok(self.result)
+
+        get_vars.assert_not_called()
+        self.variable_manager.get_vars.assert_not_called()
+        default_on_ok.assert_called_once_with(self.result)
+        self.assertIsNone(self.callback._diy_spec)
+
+    @patch.object(Default, 'v2_runner_on_ok')
+    def test_event_with_msg_in_task_vars_merges_variables(self, default_on_ok):
+        self.callback.set_options(direct={'skip_vars_without_msg': True})
+        variables = {'omit': '__omit_place_holder__', 'ansible_callback_diy_runner_on_ok_msg': 'message'}
+        self.task.get_vars.return_value = {'ansible_callback_diy_runner_on_ok_msg': 'message'}
+
+        with patch.object(self.callback, '_get_vars', return_value=variables) as get_vars:
+            with patch.object(self.callback, '_template', side_effect=lambda loader, template, variables: template):
+                with patch.object(self.callback, '_output') as output:
+                    self.callback.v2_runner_on_ok(self.result)
+
+        get_vars.assert_called_once()
+        output.assert_called_once()
+        self.assertEqual(self.callback._diy_spec['msg'], 'message')
+
+    def test_msg_found_in_inventory_variables(self):
+        self.callback.set_options(direct={'skip_vars_without_msg': True})
+        group = MagicMock()
+        group.get_vars.return_value = {'ansible_callback_diy_runner_on_ok_msg': 'message'}
+        self.host.get_groups.return_value = [group]
+
+        def v2_runner_on_ok():
+            return self.callback._msg_unset(task=self.task, host=self.host)
+
+        self.assertFalse(v2_runner_on_ok())
+        group.get_vars.return_value = {}
+        self.assertTrue(v2_runner_on_ok())
+
+    def test_play_vars_cached_while_task_runs(self):
+        first = self.callback._get_play_vars(play=self.play, host=self.host, task=self.task, use_cache=True)
+        second = self.callback._get_play_vars(play=self.play, host=self.host, task=self.task, use_cache=True)
+
+        self.assertIs(first, second)
+        self.assertEqual(self.variable_manager.get_vars.call_count, 1)
+
+    def test_final_result_merges_again_and_drops_cache(self):
+        cached = self.callback._get_play_vars(play=self.play, host=self.host, task=self.task, use_cache=True)
+        final = self.callback._get_play_vars(play=self.play, host=self.host, task=self.task)
+
+        self.assertIsNot(cached, final)
+        self.assertEqual(self.variable_manager.get_vars.call_count, 2)
+        self.assertEqual(self.callback._diy_vars_cache, {})
@@ -112,6 +112,44 @@ class TestOpentelemetry(unittest.TestCase):
 
         self.assertEqual(self.opentelemetry.ansible_version, '1.2.3')
 
+    def test_finish_task_span(self):
+        try:
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+            from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+        except ImportError:
+            self.skipTest("opentelemetry-sdk is needed for this test")
+
+        exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+        tracer = provider.get_tracer(__name__)
+        parent = tracer.start_span('myplaybook')
+        tasks_data = OrderedDict()
+        tasks_data['myuuid'] = TaskData('myuuid', 'mytask', '/mypath', 'myplay', 'myaction', {})
+
+        for dummy in range(2):
+            self.opentelemetry.finish_task_span(
+                tracer,
+                parent,
+                tasks_data,
+                'ok',
+                self.my_task_result,
+                "mydump",
+                False,
+                False
+            )
+
+        # the span is emitted right away and only once per host, the result is not kept
+        spans = exporter.get_finished_spans()
+        self.assertEqual(len(spans), 1)
+        self.assertEqual(spans[0].name, 'mytask')
+        self.assertEqual(spans[0].parent.span_id, parent.get_span_context().span_id)
+        self.assertEqual(spans[0].attributes['ansible.task.host.name'], 'myhost')
+        self.assertEqual(spans[0].events[0].name, 'mydump')
+        self.assertEqual(len(tasks_data['myuuid'].host_data), 0)
+        self.assertIsNone(tasks_data['myuuid'].dump)
+
     def test_get_error_message(self):
         test_cases = (
             ('my-exception', 'my-msg', None, 'my-exception'),
@@ -9,7 +9,9 @@ from ansible.executor.task_result import TaskResult
 from ansible_collections.community.general.tests.unit.compat import unittest
 from ansible_collections.community.general.tests.unit.compat.mock import patch, Mock
 from ansible_collections.community.general.plugins.callback.splunk import SplunkHTTPCollectorSource
+from ansible_collections.community.general.plugins.plugin_utils.event_sender import BatchEventSender
 from datetime import datetime
+from functools import partial
 
 import json
 
@@ -62,3 +64,30 @@ class TestSplunkClient(unittest.TestCase):
         self.assertEqual(sent_data['event']['timestamp'], '2020-12-01 00:00:00 +0000')
         self.assertEqual(sent_data['event']['host'], 'my-host')
         self.assertEqual(sent_data['event']['ip_address'], '1.2.3.4')
+
+    @patch('ansible_collections.community.general.plugins.callback.splunk.now')
+    @patch('ansible_collections.community.general.plugins.callback.splunk.open_url')
+    def test_background_send(self, open_url_mock, mock_now):
+        mock_now.return_value = datetime(2020, 12, 1)
+        self.splunk.sender = BatchEventSender(
+            partial(self.splunk.send_batch, 'endpoint', 'token', False, False), batch_size=10, flush_interval=60)
+
+        for dummy in range(3):
+            result = TaskResult(host=self.mock_host, task=self.mock_task, return_data={}, task_fields={'args': {}})
+            self.splunk.send_event(
+                url='endpoint', authtoken='token', validate_certs=False, include_milliseconds=False,
+                batch=None, state='OK', result=result, runtime=100
+            )
+        self.splunk.sender.close()
+
+        self.assertEqual(open_url_mock.call_count, 1)
+        args, kwargs = open_url_mock.call_args
+        decoder = json.JSONDecoder()
+        sent_events, pos = [], 0
+        while pos < len(args[1]):
+            event, pos = decoder.raw_decode(args[1], pos)
+            sent_events.append(event)
+        self.assertEqual(len(sent_events), 3)
+        self.assertEqual(sent_events[0]['event']['ansible_host'], 'myhost')
+        self.assertEqual(kwargs['headers']['Authorization'], 'Splunk token')
+        self.assertEqual(self.splunk.sender.sent, 3)
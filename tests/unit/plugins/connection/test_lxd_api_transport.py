@@ -0,0 +1,134 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import io
+import json
+
+import pytest
+
+from ansible.errors import AnsibleConnectionFailure
+from ansible.module_utils.six.moves.urllib.parse import parse_qs, urlparse
+from ansible.playbook.play_context import PlayContext
+from ansible.plugins.loader import connection_loader
+
+from ansible_collections.community.general.plugins.module_utils.lxd import LXDClientException
+from ansible_collections.community.general.tests.unit.compat import mock
+
+
+class FakeResponse(io.BytesIO):
+    def __init__(self, data=b'', headers=None):
+        super(FakeResponse, self).__init__(data)
+        self.headers = headers or {}
+
+    def getheader(self, name, default=None):
+        return self.headers.get(name, default)
+
+
+class FakeLXDClient(object):
+    """ A server with a single running instance, whose commands echo their arguments """
+
+    def __init__(self, url, *args, **kwargs):
+        self.url = url
+        self.requests = []
+        self.files = {}
+        self.logs = {}
+        self.connection = mock.MagicMock()
+
+    def do(self, method, url, body_json=None, **kwargs):
+        self.requests.append((method, url))
+        command = body_json['command']
+        if command[-1] == 'stopped':
+            raise LXDClientException('Instance is not running')
+        if command[-1] in ('/bin/id -u', '/bin/id -g'):
+            stdout = b'1000\n'
+        else:
+            stdout = json.dumps(command).encode()
+        self.logs['/1.0/instances/c1/logs/exec.stdout'] = stdout
+        self.logs['/1.0/instances/c1/logs/exec.stderr'] = b''
+        return {'metadata': {'metadata': {'return': 0, 'output': {
+            '1': '/1.0/instances/c1/logs/exec.stdout', '2': '/1.0/instances/c1/logs/exec.stderr'}}}}
+
+    def request_raw(self, method, url, body=None, headers=None):
+        self.requests.append((method, url))
+        parsed = urlparse(url)
+        if parsed.path.endswith('/files'):
+            path = parse_qs(parsed.query)['path'][0]
+            if method == 'POST':
+                data = body if isinstance(body, bytes) else body.read()
+                self.files[path] = (data, dict((k.split('-', 2)[-1], v) for k, v in headers.items() if k.startswith('X-')))
+                return FakeResponse()
+            return FakeResponse(self.files[path][0], {'X-LXD-type': 'file', 'X-Incus-type': 'file'})
+        if method == 'GET':
+            return FakeResponse(self.logs[parsed.path])
+        return FakeResponse()
+
+
+@pytest.fixture(params=['lxd', 'incus'])
+def conn(request, mocker):
+    plugin = request.param
+    mocker.patch(f'ansible_collections.community.general.plugins.connection.{plugin}.LXDClient', FakeLXDClient)
+    mocker.patch(f'ansible_collections.community.general.plugins.connection.{plugin}.get_bin_path', side_effect=ValueError)
+    conn = connection_loader.get(f'community.general.{plugin}', PlayContext(), io.StringIO())
+    conn.set_options(var_options={
+        'inventory_hostname': 'c1',
+        f'ansible_{plugin}_transport': 'api',
+        f'ansible_{plugin}_url': 'unix:/run/test.socket',
+    })
+    conn.plugin = plugin
+    return conn
+
+
+def test_api_exec(conn):
+    conn._connect()
+    rc, stdout, stderr = conn.exec_command('echo hello')
+    assert rc == 0
+    assert json.loads(stdout) == ['/bin/sh', '-c', 'echo hello']
+
+    client = conn._api_instance.client
+    assert client.url == 'unix:/run/test.socket'
+    assert client.requests[0][1].startswith('/1.0/instances/c1/exec')
+    # the recorded output is removed
+    assert ('DELETE', client.requests[-1][1]) == client.requests[-1]
+
+    with pytest.raises(AnsibleConnectionFailure, match='instance not running'):
+        conn.exec_command('stopped')
+
+
+def test_api_exec_stdin(conn):
+    rc, stdout, stderr = conn.exec_command('python3', in_data=b'print(1)')
+    client = conn._api_instance.client
+    (path, (data, headers)), = client.files.items()
+    assert data == b'print(1)'
+    assert headers == {'type': 'file', 'write': 'overwrite', 'uid': '0', 'gid': '0', 'mode': '0600'}
+    assert json.loads(stdout)[-1] == f'exec <{path}; rm -f {path}; python3'
+
+
+def test_api_put_fetch_non_root(conn, tmp_path):
+    conn.set_option('remote_user', 'ansible')
+    src = tmp_path / 'src'
+    src.write_bytes(b'payload')
+    src.chmod(0o640)
+    conn.put_file(str(src), '/tmp/a')
+    conn.put_file(str(src), '/tmp/b')
+
+    client = conn._api_instance.client
+    assert client.files['/tmp/a'] == (b'payload', {'type': 'file', 'write': 'overwrite', 'uid': '1000', 'gid': '1000', 'mode': '0640'})
+    # the uid and gid are looked up once
+    assert len([r for r in client.requests if r[1].startswith('/1.0/instances/c1/exec')]) == 2
+
+    dest = tmp_path / 'dest'
+    conn.fetch_file('/tmp/b', str(dest))
+    assert dest.read_bytes() == b'payload'
+
+    if conn.plugin == 'incus':
+        assert all('project=default' in r[1] for r in client.requests if r[1].startswith('/1.0/instances/'))
+
+
+def test_api_remote(conn):
+    conn.set_option('remote', 'other')
+    with pytest.raises(Exception, match="remote must be 'local'"):
+        conn.exec_command('true')
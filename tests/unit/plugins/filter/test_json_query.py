@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import pytest
+
+from ansible.errors import AnsibleFilterError
+from ansible.parsing.yaml.objects import AnsibleMapping, AnsibleSequence, AnsibleUnicode
+
+from ansible_collections.community.general.tests.unit.compat import unittest
+from ansible_collections.community.general.plugins.filter.json_query import json_query
+from ansible_collections.community.general.plugins.filter.json_query_many import json_query_many
+from ansible_collections.community.general.plugins.plugin_utils import jmespath_query
+
+jmespath = pytest.importorskip('jmespath')
+
+
+class TestFilterJsonQuery(unittest.TestCase):
+
+    def setUp(self):
+        self.data = AnsibleMapping(users=AnsibleSequence([
+            AnsibleMapping(name=AnsibleUnicode('steve'), groups=AnsibleSequence(['a', 'b'])),
+            AnsibleMapping(name=AnsibleUnicode('bill'), groups=AnsibleSequence(['c'])),
+        ]))
+
+    def test_ansible_types(self):
+        self.assertEqual(json_query(self.data, "users[?starts_with(name, 'st')].name"), ['steve'])
+        self.assertEqual(json_query(self.data, "users[*].length(groups)"), [2, 1])
+
+    def test_types_registered_once(self):
+        before = dict(jmespath.functions.REVERSE_TYPES_MAP)
+        for dummy in range(3):
+            json_query(self.data, 'users[*].name')
+        self.assertEqual(dict(jmespath.functions.REVERSE_TYPES_MAP), before)
+
+    def test_compile_cache(self):
+        jmespath_query._compile.cache_clear()
+        for dummy in range(3):
+            json_query(self.data, 'users[0].name')
+        info = jmespath_query._compile.cache_info()
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.hits, 2)
+
+    def test_invalid_expression(self):
+        with self.assertRaises(AnsibleFilterError):
+            json_query(self.data, 'users[')
+
+    def test_many(self):
+        self.assertEqual(json_query_many(self.data, ['users[*].name', 'users[1].groups']), [['steve', 'bill'], ['c']])
+        self.assertEqual(json_query_many(self.data, {'first': 'users[0].name'}), {'first': 'steve'})
+        with self.assertRaises(AnsibleFilterError):
+            json_query_many(self.data, 'users[*].name')
@@ -104,3 +104,57 @@ def test_build_inventory_groups_with_no_groupselection(inventory):
         if generated_data[key] != value:
             eq = False
     assert eq
+
+
+def test_build_inventory_recursion(inventory, mocker):
+    """Load example data as a single recursive response and start the inventory to test the host generation.
+
+    After the inventory plugin has run with the test data, the result of the host is checked."""
+    fixture = inventory.data
+    instances = []
+    for instance_data in fixture['instances'].values():
+        instance = dict(instance_data['instances']['metadata'])
+        instance['state'] = instance_data['state']['metadata']
+        instances.append(instance)
+
+    def do(method, url):
+        if url == '/1.0/instances?recursion=2&project=default':
+            return {'type': 'sync', 'status_code': 200, 'metadata': instances}
+        if url == '/1.0/networks':
+            return {'type': 'sync', 'status_code': 200, 'metadata': [f'/1.0/networks/{name}' for name in fixture['networks']]}
+        name = url.split('/')[3]
+        return fixture['networks'][name]['state']
+
+    socket = mocker.MagicMock()
+    socket.do = mocker.MagicMock(side_effect=do)
+    inventory._connect_to_socket = mocker.MagicMock(return_value=socket)
+    inventory.data = {}
+    inventory.project = 'default'
+    inventory.recursion = True
+    inventory._populate()
+    generated_data = inventory.inventory.get_host('vlantest').get_vars()
+
+    for key, value in HOST_COMPARATIVE_DATA.items():
+        assert generated_data[key] == value
+    assert socket.do.call_count == 2 + len(fixture['networks'])
+
+
+def test_get_instance_and_network_data(inventory, mocker):
+    """Fetch the example data with one request per instance and network and compare it to the example data."""
+    fixture = inventory.data
+
+    def do(method, url):
+        parts = url.split('?')[0].split('/')
+        if parts[2] == 'instances':
+            branch = parts[4] if len(parts) > 4 else 'instances'
+            return fixture['instances'][parts[3]][branch]
+        return fixture['networks'][parts[3]]['state']
+
+    inventory.socket = mocker.MagicMock()
+    inventory.socket.do = mocker.MagicMock(side_effect=do)
+    inventory.data = {}
+    inventory.project = 'default'
+    inventory.get_instance_data(list(fixture['instances']))
+    inventory.get_network_data(list(fixture['networks']))
+
+    assert inventory.data == fixture
@@ -11,6 +11,8 @@ __metaclass__ = type
 import pytest
 
 from ansible.inventory.data import InventoryData
+from ansible.parsing.dataloader import DataLoader
+from ansible.template import Templar
 from ansible_collections.community.general.plugins.inventory.proxmox import InventoryModule
 
 
@@ -58,6 +60,22 @@ def get_json(url, ignore_errors=None):
                  "id": "node/testnode2",
                  "status": "offline",
                  "ssl_fingerprint": "yy"}]
+    elif url == "https://localhost:8006/api2/json/cluster/resources":
+        # _get_cluster_resources
+        return [{"type": "node", "id": "node/testnode", "node": "testnode", "status": "online", "level": ""},
+                {"type": "node", "id": "node/testnode2", "node": "testnode2", "status": "offline"},
+                {"type": "lxc", "id": "lxc/100", "node": "testnode", "vmid": 100, "name": "test-lxc",
+                 "status": "running", "template": 0, "tags": "one;two;three"},
+                {"type": "qemu", "id": "qemu/101", "node": "testnode", "vmid": 101, "name": "test-qemu",
+                 "status": "running", "template": 0, "pool": "test"},
+                {"type": "qemu", "id": "qemu/102", "node": "testnode", "vmid": 102, "name": "test-qemu-windows",
+                 "status": "running", "template": 0},
+                {"type": "qemu", "id": "qemu/103", "node": "testnode", "vmid": 103, "name": "test-qemu-multi-nic",
+                 "status": "running", "template": 0},
+                {"type": "qemu", "id": "qemu/9001", "node": "testnode", "vmid": 9001, "name": "test-qemu-template",
+                 "status": "stopped", "template": 1},
+                {"type": "pool", "id": "/pool/test", "pool": "test"},
+                {"type": "storage", "id": "storage/testnode/local", "node": "testnode", "storage": "local", "status": "available"}]
     elif url == "https://localhost:8006/api2/json/pools":
         # _get_pools
         return [{"poolid": "test"}]
@@ -784,3 +802,174 @@ def test_populate_exclude_nodes(inventory, mocker):
     # make sure that nodes are not in the "ungrouped" group
     for node in ['testnode', 'testnode2']:
         assert node not in inventory.inventory.get_groups_dict()["ungrouped"]
+
+
+def test_populate_max_concurrency(mocker):
+    def populate(max_concurrency):
+        inventory = InventoryModule()
+        inventory.inventory = InventoryData()
+        inventory.proxmox_user = 'root@pam'
+        inventory.proxmox_password = 'password'
+        inventory.proxmox_url = 'https://localhost:8006'
+        inventory.group_prefix = 'proxmox_'
+        inventory.facts_prefix = 'proxmox_'
+        inventory.strict = False
+        inventory.exclude_nodes = False
+
+        opts = {
+            'group_prefix': 'proxmox_',
+            'facts_prefix': 'proxmox_',
+            'want_facts': True,
+            'want_proxmox_nodes_ansible_host': True,
+            'qemu_extended_statuses': True,
+            'exclude_nodes': False,
+            'max_concurrency': max_concurrency,
+        }
+
+        inventory._get_auth = mocker.MagicMock(side_effect=get_auth)
+        inventory._get_json = mocker.MagicMock(side_effect=get_json)
+        inventory._get_vm_snapshots = mocker.MagicMock(side_effect=get_vm_snapshots)
+        inventory.get_option = mocker.MagicMock(side_effect=get_option(opts))
+        inventory._can_add_host = mocker.MagicMock(return_value=True)
+        inventory._populate()
+        return inventory.inventory
+
+    serial = populate(1)
+    parallel = populate(4)
+
+    # hosts are added in the same order and with the same facts and groups
+    assert list(parallel.hosts) == list(serial.hosts)
+    for name, host in serial.hosts.items():
+        assert parallel.get_host(name).get_vars() == host.get_vars()
+    assert parallel.get_groups_dict() == serial.get_groups_dict()
+
+
+def populate_cluster_resources(mocker, **options):
+    inventory = InventoryModule()
+    inventory.inventory = InventoryData()
+    inventory.templar = Templar(loader=DataLoader())
+    inventory.proxmox_user = 'root@pam'
+    inventory.proxmox_password = 'password'
+    inventory.proxmox_url = 'https://localhost:8006'
+    inventory.group_prefix = 'proxmox_'
+    inventory.facts_prefix = 'proxmox_'
+    inventory.strict = False
+    inventory.exclude_nodes = False
+
+    opts = {
+        'group_prefix': 'proxmox_',
+        'facts_prefix': 'proxmox_',
+        'want_facts': True,
+        'source': 'cluster_resources',
+    }
+    opts.update(options)
+
+    inventory._get_auth = mocker.MagicMock(side_effect=get_auth)
+    inventory._get_json = mocker.MagicMock(side_effect=get_json)
+    inventory._get_vm_snapshots = mocker.MagicMock(side_effect=get_vm_snapshots)
+    inventory.get_option = mocker.MagicMock(side_effect=get_option(opts))
+    inventory._can_add_host = mocker.MagicMock(return_value=True)
+    inventory._populate()
+    return inventory
+
+
+def test_populate_cluster_resources(mocker):
+    inventory = populate_cluster_resources(
+        mocker,
+        groups={'tagged': "'one' in proxmox_tags_parsed | default([])"},
+        keyed_groups=[{'key': 'proxmox_node', 'prefix': 'node'}],
+    )
+
+    # only a single API request is needed
+    urls = [call[0][0] for call in inventory._get_json.call_args_list]
+    assert urls == ["https://localhost:8006/api2/json/cluster/resources"]
+
+    host_lxc = inventory.inventory.get_host('test-lxc')
+    host_qemu = inventory.inventory.get_host('test-qemu')
+    assert host_lxc.get_vars()['proxmox_tags_parsed'] == ['one', 'two', 'three']
+    assert host_qemu.get_vars()['proxmox_vmid'] == 101
+    assert host_qemu.get_vars()['proxmox_status'] == 'running'
+    assert 'proxmox_agent_interfaces' not in host_qemu.get_vars()
+    assert inventory.inventory.get_host('test-qemu-template') is None
+    assert inventory.inventory.get_host('testnode2')
+
+    assert inventory.inventory.groups['proxmox_pool_test'].hosts == [host_qemu]
+    assert inventory.inventory.groups['proxmox_all_lxc'].hosts == [host_lxc]
+    assert inventory.inventory.groups['tagged'].hosts == [host_lxc]
+    assert len(inventory.inventory.groups['node_testnode'].hosts) == 4
+
+
+def test_populate_cluster_resources_config_facts(mocker):
+    inventory = populate_cluster_resources(
+        mocker,
+        compose={'ansible_host': "proxmox_agent_interfaces[1]['ip-addresses'][0] | default(omit)"},
+    )
+
+    # the compose option references a fact from the guest config
+    urls = [call[0][0] for call in inventory._get_json.call_args_list]
+    assert "https://localhost:8006/api2/json/nodes/testnode/qemu/101/config" in urls
+    assert "https://localhost:8006/api2/json/pools/test" not in urls
+
+    host_qemu = inventory.inventory.get_host('test-qemu')
+    assert 'eth0' in [d['name'] for d in host_qemu.get_vars()['proxmox_agent_interfaces']]
+
+
+def test_populate_incremental_refresh(mocker):
+    changed_vmid = []
+
+    def get(url, headers=None):
+        data = get_json(url)
+        if url == "https://localhost:8006/api2/json/nodes/testnode/qemu":
+            data = [dict(item, status='stopped') if item['vmid'] in changed_vmid else item for item in data]
+        response = mocker.MagicMock()
+        response.status_code = 200
+        response.json.return_value = {'data': data}
+        return response
+
+    def populate(cache):
+        inventory = InventoryModule()
+        inventory.inventory = InventoryData()
+        inventory.proxmox_user = 'root@pam'
+        inventory.proxmox_password = 'password'
+        inventory.proxmox_url = 'https://localhost:8006'
+        inventory.group_prefix = 'proxmox_'
+        inventory.facts_prefix = 'proxmox_'
+        inventory.strict = False
+        inventory.exclude_nodes = False
+        inventory.headers = {}
+        inventory.cache_key = 'proxmox'
+        inventory._cache = cache
+        inventory._results = {}
+        inventory.incremental_refresh = True
+
+        opts = {
+            'group_prefix': 'proxmox_',
+            'facts_prefix': 'proxmox_',
+            'want_facts': True,
+        }
+
+        session = mocker.MagicMock()
+        session.get = mocker.MagicMock(side_effect=get)
+        inventory._get_auth = mocker.MagicMock(side_effect=get_auth)
+        inventory._get_session = mocker.MagicMock(return_value=session)
+        inventory._get_vm_snapshots = mocker.MagicMock(side_effect=get_vm_snapshots)
+        inventory.get_option = mocker.MagicMock(side_effect=get_option(opts))
+        inventory._can_add_host = mocker.MagicMock(return_value=True)
+        inventory._populate()
+        cache['proxmox'] = inventory._results
+        return inventory, [call[0][0] for call in session.get.call_args_list]
+
+    cache = {}
+    inventory, urls = populate(cache)
+    assert "https://localhost:8006/api2/json/nodes/testnode/qemu/101/config" in urls
+    assert "https://localhost:8006/api2/json/nodes/testnode/lxc/100/config" in urls
+
+    # only the details of the changed guest are fetched again
+    changed_vmid.append("101")
+    inventory, urls = populate(cache)
+    assert "https://localhost:8006/api2/json/nodes/testnode/qemu" in urls
+    assert "https://localhost:8006/api2/json/nodes/testnode/qemu/101/config" in urls
+    assert "https://localhost:8006/api2/json/nodes/testnode/qemu/102/config" not in urls
+    assert "https://localhost:8006/api2/json/nodes/testnode/lxc/100/config" not in urls
+    assert inventory.inventory.get_host('test-lxc').get_vars()['proxmox_tags_parsed'] == ['one', 'two', 'three']
+    assert "https://localhost:8006/api2/json/nodes/testnode/lxc/100/config" in cache['proxmox']
@@ -211,3 +211,25 @@ def test_populate(inventory, mocker):
     # Check that hosts are in their corresponding pool
     assert host_without_ip in storage_lab.hosts
     assert host_with_ip in storage_lab.hosts
+
+
+def test_get_cached_objects(inventory, mocker):
+    inventory._get_objects = mocker.MagicMock(return_value=objects)
+    inventory.get_option = mocker.MagicMock(side_effect=lambda option: option == 'cache' or get_option(option))
+    inventory.cache_key = 'xen_orchestra'
+    inventory._cache = {}
+
+    # the cache is empty, so the objects are queried and cached
+    inventory.use_cache = True
+    assert inventory._get_cached_objects() == objects
+    assert inventory._cache['xen_orchestra'] == objects
+    assert inventory._get_objects.call_count == 1
+
+    # the cache is valid
+    assert inventory._get_cached_objects() == objects
+    assert inventory._get_objects.call_count == 1
+
+    # the cache is refreshed
+    inventory.use_cache = False
+    assert inventory._get_cached_objects() == objects
+    assert inventory._get_objects.call_count == 2
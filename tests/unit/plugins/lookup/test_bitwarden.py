@@ -330,3 +330,18 @@ class TestLookupModule(unittest.TestCase):
         self.lookup.run(None, organization_id=MOCK_ORGANIZATION_ID, result_count=3)
         with self.assertRaises(BitwardenException):
             self.lookup.run(None, organization_id=MOCK_ORGANIZATION_ID, result_count=0)
+
+    def test_bitwarden_plugin_secret_cache(self):
+        bitwarden = MockBitwarden()
+        with patch.object(bitwarden, '_run', wraps=bitwarden._run) as mock_run:
+            with patch('ansible_collections.community.general.plugins.lookup.bitwarden._bitwarden', new=bitwarden):
+                self.assertEqual(set(['b', 'd']),
+                                 set(self.lookup.run(['dupe_name'], field='password', secret_cache='memory', secret_cache_invalidate=True)[0]))
+                self.assertEqual([MOCK_RECORDS[0]['login']['password']],
+                                 self.lookup.run([MOCK_RECORDS[0]['name']], field='password', secret_cache='memory')[0])
+                self.assertEqual([MOCK_RECORDS[0]['login']['password']],
+                                 self.lookup.run([MOCK_RECORDS[0]['id']], field='password', search='id', secret_cache='memory')[0])
+
+        # the items are listed once, and then filtered locally
+        self.assertEqual(mock_run.call_count, 1)
+        self.assertEqual(mock_run.call_args[0][0], ['list', 'items'])
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import errno
+import hashlib
+import os
+import shutil
+import tempfile
+
+from ansible_collections.community.general.tests.unit.compat.unittest import TestCase
+from ansible_collections.community.general.tests.unit.compat.mock import MagicMock, patch
+
+from ansible.parsing.dataloader import DataLoader
+from ansible.plugins.loader import lookup_loader
+
+from ansible_collections.community.general.plugins.lookup import filetree
+
+
+class TestLookupModule(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.first = self.make_tree('first', {'a/b/c.txt': 'c', 'a/d.txt': 'd', 'e.txt': 'e'})
+        self.second = self.make_tree('second', {'a/d.txt': 'other d', 'f.txt': 'f'})
+        os.symlink('a', os.path.join(self.first, 'link'))
+
+        templar = MagicMock()
+        templar._loader = None
+        self.lookup = lookup_loader.get('community.general.filetree', loader=DataLoader(), templar=templar)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def make_tree(self, name, files):
+        root = os.path.join(self.tmpdir, name)
+        for path, content in files.items():
+            path = os.path.join(root, path)
+            if not os.path.isdir(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+            with open(path, 'w') as f:
+                f.write(content)
+        return root
+
+    def expected_paths(self, *roots):
+        # the order and the merging of os.walk() based implementation
+        paths = []
+        for root in roots:
+            for dirpath, dirs, files in os.walk(root):
+                for entry in dirs + files:
+                    relpath = os.path.relpath(os.path.join(dirpath, entry), root)
+                    if relpath not in paths:
+                        paths.append(relpath)
+        return paths
+
+    def test_walk(self):
+        result = self.lookup.run([self.first, self.second], {})
+        self.assertEqual([entry['path'] for entry in result], self.expected_paths(self.first, self.second))
+
+        entries = dict((entry['path'], entry) for entry in result)
+        self.assertEqual(entries['a']['state'], 'directory')
+        self.assertEqual(entries['link']['state'], 'link')
+        self.assertEqual(entries['link']['src'], 'a')
+        self.assertEqual(entries['a/d.txt']['root'], self.first)
+        self.assertEqual(entries['f.txt']['root'], self.second)
+        self.assertNotIn('checksum', entries['e.txt'])
+
+    def test_checksum(self):
+        result = self.lookup.run([self.first], {}, checksum=True)
+        entries = dict((entry['path'], entry) for entry in result)
+        self.assertEqual(entries['e.txt']['checksum'], hashlib.sha1(b'e').hexdigest())
+        self.assertNotIn('checksum', entries['a'])
+        self.assertNotIn('checksum', entries['link'])
+
+    def test_checksum_unreadable_file(self):
+        unreadable = os.path.join(self.first, 'e.txt')
+        real_checksum = filetree.file_checksum
+
+        def file_checksum(path, algorithm):
+            if path == unreadable:
+                raise OSError(errno.EACCES, os.strerror(errno.EACCES), path)
+            return real_checksum(path, algorithm)
+
+        with patch.object(filetree, 'file_checksum', side_effect=file_checksum):
+            with patch.object(filetree, 'display') as display:
+                result = self.lookup.run([self.first], {}, checksum=True)
+        entries = dict((entry['path'], entry) for entry in result)
+        self.assertNotIn('checksum', entries['e.txt'])
+        self.assertEqual(entries['a/d.txt']['checksum'], hashlib.sha1(b'd').hexdigest())
+        display.warning.assert_called_once()
+        self.assertIn(unreadable, display.warning.call_args[0][0])
+
+    def test_cache(self):
+        cache_path = os.path.join(self.tmpdir, 'cache')
+        first = self.lookup.run([self.first], {}, cache_path=cache_path)
+        self.assertEqual(len(os.listdir(cache_path)), 1)
+
+        self.assertEqual(self.lookup.run([self.first], {}, cache_path=cache_path), first)
+
+        # adding a file changes the mtime of its directory
+        with open(os.path.join(self.first, 'a', 'b', 'new.txt'), 'w') as f:
+            f.write('new')
+        result = self.lookup.run([self.first], {}, cache_path=cache_path)
+        self.assertIn('a/b/new.txt', [entry['path'] for entry in result])
+
+    def test_cache_missing_root(self):
+        cache_path = os.path.join(self.tmpdir, 'cache')
+        root = os.path.join(self.tmpdir, 'later')
+        self.assertEqual(self.lookup.run([root], {}, cache_path=cache_path), [])
+        self.assertFalse(os.path.exists(cache_path))
+
+        os.mkdir(root)
+        with open(os.path.join(root, 'new.txt'), 'w') as f:
+            f.write('new')
+        result = self.lookup.run([root], {}, cache_path=cache_path)
+        self.assertEqual([entry['path'] for entry in result], ['new.txt'])
@@ -300,3 +300,31 @@ class TestMergeVariablesLookup(unittest.TestCase):
         results = self.merge_vars_lookup.run(['__merge_var'], variables)
 
         self.assertEqual(results, [['item1', 'item5']])
+
+    @patch.object(AnsiblePlugin, 'set_options')
+    @patch.object(AnsiblePlugin, 'get_option', side_effect=[None, 'ignore', 'regex', ['dummy1']])
+    @patch.object(Templar, 'template', side_effect=[['item1'], ['item2'], ['item3']])
+    def test_merge_list_group_multiple_terms(self, mock_set_options, mock_get_option, mock_template):
+        hostvars = self.HostVarsMock({
+            'host1': {
+                'group_names': ['dummy1'],
+                'inventory_hostname': 'host1',
+                'a__merge_list': ['item1'],
+                'b__other_list': ['item3'],
+            },
+            'host2': {
+                'group_names': ['dummy1'],
+                'inventory_hostname': 'host2',
+                'c__merge_list': ['item2'],
+            }
+        })
+        variables = {
+            'inventory_hostname': 'host1',
+            'hostvars': hostvars
+        }
+
+        with patch.object(self.HostVarsMock, 'raw_get', side_effect=hostvars.raw_get) as mock_raw_get:
+            results = self.merge_vars_lookup.run(['^.+__merge_list$', '^.+__other_list$'], variables)
+
+        self.assertEqual(results, [['item1', 'item2'], ['item3']])
+        self.assertEqual(mock_raw_get.call_count, 2)
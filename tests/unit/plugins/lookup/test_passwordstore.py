@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+
+from ansible.errors import AnsibleError
+from ansible.plugins.loader import lookup_loader
+
+from ansible_collections.community.general.tests.unit.compat.unittest import TestCase
+from ansible_collections.community.general.tests.unit.compat.mock import patch
+from ansible_collections.community.general.plugins.lookup import passwordstore
+from ansible_collections.community.general.plugins.plugin_utils import secret_cache
+
+
+PASS_FILES = {
+    'web/admin': 'admin-password\nuser: admin\nurl: https://example.com\n',
+    'web/backup': 'backup-password\n',
+    'db/root': 'root-password\nuser: root\n',
+}
+
+
+class TestLookupModule(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for passname in list(PASS_FILES) + ['broken']:
+            path = os.path.join(self.directory, f'{passname}.gpg')
+            if not os.path.isdir(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+            open(path, 'w').close()
+
+        self.shown = []
+        self.shown_lock = threading.Lock()
+        patcher = patch.object(passwordstore, 'check_output2', side_effect=self.fake_pass)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        secret_cache._MEMORY.clear()
+
+        self.lookup = lookup_loader.get('community.general.passwordstore')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def fake_pass(self, args, env=None, input=None):
+        if args[1] == '--version':
+            return b'pass: the standard unix password manager\n'
+        if args[1] != 'show':
+            raise AssertionError(f'unexpected pass command {args}')
+        passname = args[2]
+        with self.shown_lock:
+            self.shown.append(passname)
+        if passname == 'broken':
+            raise subprocess.CalledProcessError(2, args, 'gpg: decryption failed: No secret key\n')
+        if passname not in PASS_FILES:
+            raise subprocess.CalledProcessError(1, args, f'Error: {passname} is not in the password store.\n')
+        return PASS_FILES[passname].encode()
+
+    def run_lookup(self, terms, **kwargs):
+        return self.lookup.run(terms, {}, directory=self.directory, **kwargs)
+
+    def test_prefetch_several_terms(self):
+        with patch.object(self.lookup, '_read_pass', wraps=self.lookup._read_pass) as read_pass:
+            result = self.run_lookup(['web/admin', 'web/backup', 'db/root', 'web/admin subkey=user'], workers=4)
+
+        self.assertEqual(result, ['admin-password', 'backup-password', 'root-password', 'admin'])
+        # every pass file was read once, all of them by the batch
+        self.assertEqual(sorted(self.shown), ['db/root', 'web/admin', 'web/backup'])
+        self.assertEqual(read_pass.call_count, 3)
+        self.assertEqual(len(self.lookup._prefetched), 3)
+
+    def test_prefetch_missing_pass_file(self):
+        result = self.run_lookup(['web/admin', 'web/other', 'db/root'], workers=4, missing='empty')
+
+        self.assertEqual(result, ['admin-password', None, 'root-password'])
+        # the batch skips pass files that do not exist, pass is only run for them when their term is processed
+        self.assertEqual(sorted(self.lookup._prefetched), [('pass', self.directory, 'db/root'), ('pass', self.directory, 'web/admin')])
+        self.assertEqual(sorted(self.shown), ['db/root', 'web/admin', 'web/other'])
+
+    def test_subkeys_served_from_shared_cache(self):
+        result = self.run_lookup(['web/admin subkey=user', 'web/admin subkey=url'], secret_cache='memory')
+        self.assertEqual(result, ['admin', 'https://example.com'])
+        self.assertEqual(self.shown, ['web/admin'])
+
+        # a following lookup, for example in another task, does not run pass again
+        result = self.run_lookup(['web/admin', 'web/admin subkey=user'], secret_cache='memory', workers=4)
+        self.assertEqual(result, ['admin-password', 'admin'])
+        self.assertEqual(self.shown, ['web/admin'])
+
+        self.run_lookup(['web/admin'], secret_cache='memory', secret_cache_invalidate=True)
+        self.assertEqual(self.shown, ['web/admin', 'web/admin'])
+
+    def test_failing_show_raises(self):
+        for workers in (1, 4):
+            with self.assertRaises(AnsibleError) as context:
+                self.run_lookup(['web/admin', 'broken', 'db/root'], workers=workers)
+            self.assertIn('decryption failed', str(context.exception))
+
+    def test_failing_show_not_cached(self):
+        with self.assertRaises(AnsibleError):
+            self.run_lookup(['web/admin', 'broken'], workers=4, secret_cache='memory')
+        self.assertIsNone(secret_cache.SecretCache('passwordstore').get(['pass', self.directory, 'broken']))
+        self.assertEqual(secret_cache.SecretCache('passwordstore').get(['pass', self.directory, 'web/admin']), PASS_FILES['web/admin'])
@@ -5,14 +5,20 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+import json
+import os
+import stat
+
 import pytest
 from itertools import count
 
 from ansible_collections.community.general.plugins.module_utils.identity.keycloak.keycloak import (
     get_token,
     KeycloakError,
+    KeycloakTokenCache,
 )
 from ansible.module_utils.six import StringIO
+from ansible.module_utils.six.moves.urllib.parse import parse_qs
 from ansible.module_utils.six.moves.urllib.error import HTTPError
 
 module_params_creds = {
@@ -23,6 +29,7 @@ module_params_creds = {
     'auth_username': 'admin',
     'auth_password': 'admin',
     'client_secret': None,
+    'auth_client_id': 'admin-cli',
 }
 
 
@@ -163,3 +170,83 @@ def test_json_without_token_returned(mock_json_without_token_returned):
         'API did not include access_token field in response from '
         'http://keycloak.url/auth/realms/master/protocol/openid-connect/token'
     )
+
+
+def token_wrapper(access_token, refresh_token, expires_in=300):
+    return create_wrapper(json.dumps({
+        'access_token': access_token,
+        'expires_in': expires_in,
+        'refresh_token': refresh_token,
+        'refresh_expires_in': 1800,
+    }))
+
+
+@pytest.fixture()
+def mock_token_endpoint(mocker):
+    token_response = {
+        'http://keycloak.url/auth/realms/master/protocol/openid-connect/token': [
+            token_wrapper('token1', 'refresh1', expires_in=10),
+            token_wrapper('token2', 'refresh2'),
+            token_wrapper('token3', 'refresh3'),
+        ],
+    }
+    return mocker.patch(
+        'ansible_collections.community.general.plugins.module_utils.identity.keycloak.keycloak.open_url',
+        side_effect=build_mocked_request(count(), token_response),
+        autospec=True
+    )
+
+
+def test_token_cache(mock_token_endpoint, tmp_path):
+    cache = str(tmp_path / 'token_cache')
+    params = dict(module_params_creds, token_cache=cache)
+
+    # The first token expires within the expiry margin and is renewed with its refresh token
+    assert get_token(params)['Authorization'] == 'Bearer token1'
+    assert stat.S_IMODE(os.stat(cache).st_mode) == 0o600
+    assert get_token(params)['Authorization'] == 'Bearer token2'
+    assert get_token(params)['Authorization'] == 'Bearer token2'
+    assert get_token(params)['Authorization'] == 'Bearer token2'
+
+    assert mock_token_endpoint.call_count == 2
+    payloads = [parse_qs(call[1]['data']) for call in mock_token_endpoint.call_args_list]
+    assert payloads[0]['grant_type'] == ['password']
+    assert payloads[1]['grant_type'] == ['refresh_token']
+    assert payloads[1]['refresh_token'] == ['refresh1']
+
+    # A token Keycloak rejected is renewed with the rotated refresh token
+    assert KeycloakTokenCache(params).get_token(rejected_token='token2') == 'token3'
+    assert parse_qs(mock_token_endpoint.call_args[1]['data'])['refresh_token'] == ['refresh2']
+
+    # Other users do not share the cached token
+    assert KeycloakTokenCache(dict(params, auth_username='other')).key != KeycloakTokenCache(params).key
+
+
+def test_token_cache_refuses_file_accessible_by_others(mock_token_endpoint, tmp_path):
+    cache = tmp_path / 'token_cache'
+    cache.write_text(u'{}')
+    cache.chmod(0o644)
+
+    with pytest.raises(KeycloakError, match='Refusing to use token cache file'):
+        get_token(dict(module_params_creds, token_cache=str(cache)))
+    assert mock_token_endpoint.call_count == 0
+
+
+def test_token_cache_refuses_symlinked_lock(mock_token_endpoint, tmp_path):
+    cache = tmp_path / 'token_cache'
+    target = tmp_path / 'target'
+    target.write_text(u'')
+    target.chmod(0o600)
+    (tmp_path / 'token_cache.lock').symlink_to(target)
+
+    with pytest.raises(KeycloakError, match='Cannot open token cache file'):
+        get_token(dict(module_params_creds, token_cache=str(cache)))
+
+
+def test_token_cache_refuses_writable_directory(mock_token_endpoint, tmp_path):
+    directory = tmp_path / 'shared'
+    directory.mkdir()
+    directory.chmod(0o777)
+
+    with pytest.raises(KeycloakError, match='Refusing to use token cache directory'):
+        get_token(dict(module_params_creds, token_cache=str(directory / 'token_cache')))
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) Ansible project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import threading
+
+import pytest
+
+from ansible_collections.community.general.plugins.module_utils import gitlab as gitlab_utils
+from ansible_collections.community.general.tests.unit.compat.mock import MagicMock
+
+
+class FakeGitlabError(Exception):
+    def __init__(self, response_code=None):
+        super(FakeGitlabError, self).__init__('error %s' % response_code)
+        self.response_code = response_code
+
+
+class FakeGitlabCreateError(FakeGitlabError):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def fake_gitlab(monkeypatch):
+    # the tests do not need python-gitlab, only its exception classes
+    fake = MagicMock()
+    fake.exceptions.GitlabError = FakeGitlabError
+    monkeypatch.setattr(gitlab_utils, 'gitlab', fake)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(gitlab_utils.time, 'sleep', sleeps.append)
+    monkeypatch.setattr(gitlab_utils.random, 'uniform', lambda a, b: 0)
+    return sleeps
+
+
+def failing(*codes):
+    """Return a function that fails with the given response codes, one per call, and then succeeds."""
+    codes = list(codes)
+    calls = []
+    lock = threading.Lock()
+
+    def func(item):
+        with lock:
+            calls.append(item)
+            if codes:
+                raise FakeGitlabError(codes.pop(0))
+        return True
+
+    func.calls = calls
+    return func
+
+
+def test_retry_rate_limited_backoff(sleeps):
+    func = failing(429, 429, 429)
+    assert gitlab_utils._retry_rate_limited(func, 'item') is True
+    assert func.calls == ['item'] * 4
+    assert sleeps == [1, 2, 4]
+
+
+def test_retry_rate_limited_gives_up(sleeps):
+    func = failing(*[429] * (gitlab_utils.RATE_LIMIT_RETRIES + 1))
+    with pytest.raises(FakeGitlabError):
+        gitlab_utils._retry_rate_limited(func, 'item')
+    assert len(func.calls) == gitlab_utils.RATE_LIMIT_RETRIES + 1
+    assert len(sleeps) == gitlab_utils.RATE_LIMIT_RETRIES
+
+
+def test_retry_rate_limited_other_errors_not_retried(sleeps):
+    func = failing(500)
+    with pytest.raises(FakeGitlabError):
+        gitlab_utils._retry_rate_limited(func, 'item')
+    assert func.calls == ['item']
+    assert sleeps == []
+
+
+def test_write_variables(sleeps):
+    this_gitlab = MagicMock()
+    this_gitlab.create_variable.side_effect = failing(429)
+    this_gitlab.update_variable.return_value = True
+    this_gitlab.delete_variable.return_value = True
+
+    result = gitlab_utils.write_variables(this_gitlab, added=['a', 'b'], updated=['c'], removed=['d'])
+
+    assert sorted(result['added']) == ['a', 'b']
+    assert result['updated'] == ['c']
+    assert result['removed'] == ['d']
+    assert this_gitlab.create_variable.call_count == 3
+    this_gitlab.update_variable.assert_called_once_with('c')
+    this_gitlab.delete_variable.assert_called_once_with('d')
+    assert sleeps == [1]
+
+
+def test_write_variables_create_falls_back_to_update(sleeps):
+    this_gitlab = MagicMock()
+    this_gitlab.create_variable.side_effect = FakeGitlabCreateError(400)
+    this_gitlab.update_variable.return_value = True
+
+    result = gitlab_utils.write_variables(this_gitlab, added=['a'])
+
+    assert result == dict(added=[], updated=['a'], removed=[])
+    this_gitlab.create_variable.assert_called_once_with('a')
+    this_gitlab.update_variable.assert_called_once_with('a')
+    assert sleeps == []
+
+
+def test_write_variables_unchanged_not_reported():
+    this_gitlab = MagicMock()
+    this_gitlab.update_variable.return_value = False
+    this_gitlab.delete_variable.return_value = True
+
+    result = gitlab_utils.write_variables(this_gitlab, updated=['a'], removed=['b'])
+
+    assert result == dict(added=[], updated=[], removed=['b'])
+
+
+def test_write_variables_error_raised(sleeps):
+    this_gitlab = MagicMock()
+    this_gitlab.delete_variable.side_effect = FakeGitlabError(403)
+
+    with pytest.raises(FakeGitlabError):
+        gitlab_utils.write_variables(this_gitlab, removed=['a', 'b'])
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) Ansible project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import os
+import shutil
+import tempfile
+
+from ansible_collections.community.general.tests.unit.compat import unittest
+from ansible_collections.community.general.plugins.module_utils import redfish_utils
+from ansible_collections.community.general.plugins.module_utils.redfish_utils import MultipartBody, RedfishUtils
+
+
+class TestRedfishUtilsMultipart(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.filepath = os.path.join(self.tempdir, 'fake_firmware.bin')
+        self.file_contents = bytes(bytearray(range(256))) * 5000
+        with open(self.filepath, 'wb') as f:
+            f.write(self.file_contents)
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_prepare_multipart_streams_file(self):
+        fields = {
+            'UpdateParameters': {'content': json.dumps({'Targets': []}), 'mime_type': 'application/json'},
+            'UpdateFile': {'filename': self.filepath, 'mime_type': 'application/octet-stream'},
+            'Oem': {'content': {'a': 'b'}, 'mime_type': 'application/json'},
+        }
+        body, content_type = RedfishUtils._prepare_multipart(fields)
+        boundary = content_type.split('boundary=')[1].encode()
+
+        self.assertIsInstance(body, MultipartBody)
+        self.assertNotIn('content', fields['UpdateFile'])
+
+        chunks = []
+        while True:
+            chunk = body.read(8192)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        data = b''.join(chunks)
+        body.close()
+
+        self.assertEqual(len(data), len(body))
+        self.assertEqual(data, b'\r\n'.join([
+            b'--' + boundary,
+            b'Content-Disposition: form-data; name="UpdateParameters"',
+            b'Content-Type: application/json',
+            b'',
+            b'{"Targets": []}',
+            b'--' + boundary,
+            b'Content-Disposition: form-data; name="UpdateFile"; filename="fake_firmware.bin"',
+            b'Content-Type: application/octet-stream',
+            b'',
+            self.file_contents,
+            b'--' + boundary,
+            b'Content-Disposition: form-data; name="Oem"',
+            b'Content-Type: application/json',
+            b'',
+            b'{"a": "b"}',
+            b'--' + boundary + b'--',
+            b'',
+        ]))
+
+    def test_multipart_body_bounded_reads(self):
+        progress = []
+        body = MultipartBody([b'head', {'filename': self.filepath}, b'tail'], progress=lambda sent, total: progress.append((sent, total)))
+        total = len(self.file_contents) + 8
+
+        self.assertEqual(len(body), total)
+        self.assertEqual(body.read(1000), b'head' + self.file_contents[:996])
+        self.assertEqual(body.read(redfish_utils.MULTIPART_CHUNK_SIZE), self.file_contents[996:996 + redfish_utils.MULTIPART_CHUNK_SIZE])
+        self.assertEqual(body.read() + body.read(), self.file_contents[996 + redfish_utils.MULTIPART_CHUNK_SIZE:] + b'tail')
+        self.assertEqual(progress[-1], (total, total))
+
+
+class TestRedfishUtilsMembers(unittest.TestCase):
+    def setUp(self):
+        self.resources = {
+            '/redfish/v1/': {'ProtocolFeaturesSupported': {'ExpandQuery': {'NoLinks': True, 'Levels': True, 'MaxLevels': 2}}},
+            '/redfish/v1/Things': {'Members': [{'@odata.id': '/redfish/v1/Things/%d' % i} for i in range(5)]},
+        }
+        for i in range(5):
+            self.resources['/redfish/v1/Things/%d' % i] = {'@odata.id': '/redfish/v1/Things/%d' % i, 'Id': str(i)}
+        self.requested = []
+        self.utils = RedfishUtils({'user': 'a_user', 'pswd': 'a_password'}, 'https://bmc', 30, None)
+        self.utils.get_request = self.get_request
+
+    def get_request(self, uri):
+        self.requested.append(uri)
+        path, dummy, query = uri[len('https://bmc'):].partition('?')
+        data = self.resources[path]
+        if query == '$expand=.($levels=1)' and 'Members' in data and self.expand:
+            data = dict(data, Members=[self.resources[m['@odata.id']] for m in data['Members']])
+        return {'ret': True, 'data': data}
+
+    def test_get_members_expand(self):
+        self.expand = True
+        response = self.utils.get_members('/redfish/v1/Things')
+        self.assertEqual([m['Id'] for m in response['members']], ['0', '1', '2', '3', '4'])
+        self.assertEqual(self.requested, ['https://bmc/redfish/v1/', 'https://bmc/redfish/v1/Things?$expand=.($levels=1)'])
+
+    def test_get_members_expand_ignored(self):
+        self.expand = False
+        response = self.utils.get_members('/redfish/v1/Things')
+        self.assertEqual([m['Id'] for m in response['members']], ['0', '1', '2', '3', '4'])
+        self.assertEqual(len(self.requested), 8)
+
+    def test_aggregate_keeps_order(self):
+        self.utils.max_workers = 3
+        result = self.utils.aggregate(lambda uri: {'ret': True, 'entries': [uri]}, ['a', 'b', 'c', 'd'], 'uri')
+        self.assertEqual(result, {'ret': True, 'entries': [({'uri': u}, [u]) for u in ['a', 'b', 'c', 'd']]})
+
+
+class FakeResponse(object):
+    def __init__(self, data, etag):
+        self.status = 200
+        self._body = json.dumps(data).encode()
+        self._headers = {'ETag': etag}
+
+    def info(self):
+        return self._headers
+
+    def read(self):
+        return self._body
+
+
+class TestRedfishUtilsResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.utils = RedfishUtils({'user': 'a_user', 'pswd': 'a_password'}, 'https://bmc', 30, None)
+        self.requests = []
+        self.etag = '"1"'
+        self.utils._connections.request = self.request
+
+    def request(self, method, uri, headers, **kwargs):
+        self.requests.append((uri, headers.get('If-None-Match')))
+        if headers.get('If-None-Match') == self.etag:
+            raise redfish_utils.HTTPError(uri, 304, 'Not Modified', {}, None)
+        return FakeResponse({'Id': uri, 'Etag': self.etag}, self.etag)
+
+    def test_cache_hits(self):
+        self.utils.enable_response_cache()
+        for dummy in range(3):
+            response = self.utils.get_request('https://bmc/redfish/v1/Systems/1')
+            self.assertEqual(response['data']['Id'], 'https://bmc/redfish/v1/Systems/1')
+            response['data']['Id'] = 'modified by the caller'
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(self.utils.response_cache_stats, {'hits': 2, 'misses': 1, 'revalidated': 0})
+
+    def test_cache_revalidate(self):
+        self.utils.enable_response_cache(revalidate=True)
+        self.utils.get_request('https://bmc/redfish/v1/Systems/1')
+        self.utils.get_request('https://bmc/redfish/v1/Systems/1')
+        self.etag = '"2"'
+        response = self.utils.get_request('https://bmc/redfish/v1/Systems/1')
+        self.assertEqual(response['data']['Etag'], '"2"')
+        self.assertEqual(self.requests, [('https://bmc/redfish/v1/Systems/1', None),
+                                         ('https://bmc/redfish/v1/Systems/1', '"1"'),
+                                         ('https://bmc/redfish/v1/Systems/1', '"1"')])
+        self.assertEqual(self.utils.response_cache_stats, {'hits': 0, 'misses': 2, 'revalidated': 1})
+
+    def test_cache_invalidate(self):
+        self.utils.enable_response_cache()
+        for uri in ['/redfish/v1/', '/redfish/v1/Systems', '/redfish/v1/Systems/1', '/redfish/v1/Systems/1/Bios',
+                    '/redfish/v1/Managers/1']:
+            self.utils.get_request('https://bmc' + uri)
+        self.utils._invalidate_cache('https://bmc/redfish/v1/Systems/1/Actions/ComputerSystem.Reset')
+        self.assertEqual(sorted(self.utils._response_cache), ['https://bmc/redfish/v1/Managers/1',
+                                                              'https://bmc/redfish/v1/Systems/1/Bios'])
@@ -35,12 +35,14 @@ class TestArchive(ModuleTestCase):
             module = AnsibleModule(
                 argument_spec=dict(
                     path=dict(type='list', elements='path', required=True),
-                    format=dict(type='str', default='gz', choices=['bz2', 'gz', 'tar', 'xz', 'zip']),
+                    format=dict(type='str', default='gz', choices=['bz2', 'gz', 'tar', 'xz', 'zip', 'zst']),
                     dest=dict(type='path'),
                     exclude_path=dict(type='list', elements='path', default=[]),
                     exclusion_patterns=dict(type='list', elements='path'),
                     force_archive=dict(type='bool', default=False),
                     remove=dict(type='bool', default=False),
+                    threads=dict(type='int', default=0),
+                    manifest=dict(type='bool', default=False),
                 ),
                 add_file_common_args=True,
                 supports_check_mode=True,
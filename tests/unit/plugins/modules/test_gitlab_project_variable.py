@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import threading
+
+import pytest
+
+from ansible_collections.community.general.tests.unit.compat.mock import patch
+from ansible_collections.community.general.plugins.modules.gitlab_project_variable import (
+    GitlabProjectVariables, native_python_main)
+
+
+def _dummy(x):
+    """Dummy function.  Only used as a placeholder for toplevel definitions when the test is going
+    to be skipped anyway"""
+    return x
+
+
+pytestmark = []
+try:
+    from .gitlab import (FakeAnsibleModule, GitlabModuleTestCase, resp_get_project)
+except ImportError:
+    pytestmark.append(pytest.mark.skip("Could not load gitlab module required for testing"))
+    # Need to set these to something so that we don't fail when parsing
+    GitlabModuleTestCase = object
+    resp_get_project = _dummy
+
+# Unit tests requirements
+try:
+    from httmock import HTTMock, response, urlmatch  # noqa
+except ImportError:
+    pytestmark.append(pytest.mark.skip("Could not load httmock module required for testing"))
+    urlmatch = None
+
+
+EXISTING_VARIABLES = [
+    {'key': 'UNCHANGED', 'value': 'same', 'masked': False, 'protected': False, 'raw': False,
+     'variable_type': 'env_var', 'environment_scope': '*'},
+    {'key': 'CHANGED', 'value': 'old', 'masked': False, 'protected': False, 'raw': False,
+     'variable_type': 'env_var', 'environment_scope': 'production'},
+    {'key': 'CHANGED', 'value': 'same', 'masked': False, 'protected': False, 'raw': False,
+     'variable_type': 'env_var', 'environment_scope': 'staging'},
+    {'key': 'OBSOLETE', 'value': 'gone', 'masked': False, 'protected': False, 'raw': False,
+     'variable_type': 'env_var', 'environment_scope': '*'},
+]
+
+
+def requested(name, value, environment_scope='*'):
+    return dict(name=name, value=value, masked=False, protected=False, raw=False,
+                variable_type='env_var', environment_scope=environment_scope)
+
+
+class TestGitlabProjectVariable(GitlabModuleTestCase):
+    def setUp(self):
+        super(TestGitlabProjectVariable, self).setUp()
+        self.requests = []
+        self.lock = threading.Lock()
+        self.rate_limited = set()
+
+    def gitlab_variables_api(self):
+        @urlmatch(scheme="http", netloc="localhost", path="/api/v4/projects/1/variables.*")
+        def resp_variables(url, request):
+            headers = {'content-type': 'application/json'}
+            with self.lock:
+                self.requests.append((request.method, url.path, url.query, request.body))
+                # Reject the first write of every variable with HTTP 429
+                if request.method != 'GET' and (url.path, url.query) not in self.rate_limited:
+                    self.rate_limited.add((url.path, url.query))
+                    return response(429, b'{"message": "Retry later"}', headers, None, 5, request)
+            if request.method == 'GET':
+                return response(200, json.dumps(EXISTING_VARIABLES).encode(), headers, None, 5, request)
+            if request.method == 'DELETE':
+                return response(204, b'', headers, None, 5, request)
+            return response(200, request.body, headers, None, 5, request)
+        return resp_variables
+
+    def run_module(self, variables, purge=False, state='present'):
+        module = FakeAnsibleModule({'project': 1})
+        with HTTMock(self.gitlab_variables_api(), resp_get_project):
+            with patch('ansible_collections.community.general.plugins.module_utils.gitlab.time.sleep') as mock_sleep:
+                this_gitlab = GitlabProjectVariables(module=module, gitlab_instance=self.gitlab_instance)
+                result = native_python_main(this_gitlab, purge, variables, state, module)
+        return result, mock_sleep
+
+    def test_update_in_place_and_purge(self):
+        variables = [
+            requested('UNCHANGED', 'same'),
+            requested('CHANGED', 'new', 'production'),
+            requested('CHANGED', 'same', 'staging'),
+            requested('ADDED', 'value'),
+        ]
+        (change, return_value, before, after), mock_sleep = self.run_module(variables, purge=True)
+
+        self.assertTrue(change)
+        self.assertEqual([x['key'] for x in return_value['added']], ['ADDED'])
+        self.assertEqual([(x['key'], x['environment_scope']) for x in return_value['updated']], [('CHANGED', 'production')])
+        self.assertEqual([x['key'] for x in return_value['removed']], ['OBSOLETE'])
+
+        writes = sorted((method, path, query) for method, path, query, body in self.requests if method != 'GET')
+        # Every write was rate limited once and retried
+        self.assertEqual(mock_sleep.call_count, 3)
+        self.assertEqual(writes, sorted([
+            ('POST', '/api/v4/projects/1/variables', ''),
+            ('POST', '/api/v4/projects/1/variables', ''),
+            ('PUT', '/api/v4/projects/1/variables/CHANGED', 'filter%5Benvironment_scope%5D=production'),
+            ('PUT', '/api/v4/projects/1/variables/CHANGED', 'filter%5Benvironment_scope%5D=production'),
+            ('DELETE', '/api/v4/projects/1/variables/OBSOLETE', 'filter%5Benvironment_scope%5D=%2A'),
+            ('DELETE', '/api/v4/projects/1/variables/OBSOLETE', 'filter%5Benvironment_scope%5D=%2A'),
+        ]))
+        # Only the listings before and after the changes
+        self.assertEqual(len([r for r in self.requests if r[0] == 'GET' and r[1] == '/api/v4/projects/1/variables']), 2)
+
+    def test_absent(self):
+        variables = [requested('CHANGED', None, 'staging'), requested('MISSING', None)]
+        (change, return_value, before, after), mock_sleep = self.run_module(variables, state='absent')
+
+        self.assertTrue(change)
+        self.assertEqual([(x['key'], x['environment_scope']) for x in return_value['removed']], [('CHANGED', 'staging')])
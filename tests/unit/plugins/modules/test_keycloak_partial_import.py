@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+from contextlib import contextmanager
+
+from ansible_collections.community.general.tests.unit.compat import unittest
+from ansible_collections.community.general.tests.unit.compat.mock import patch
+from ansible_collections.community.general.tests.unit.plugins.modules.utils import AnsibleExitJson, AnsibleFailJson, ModuleTestCase, set_module_args
+
+from ansible_collections.community.general.plugins.modules import keycloak_partial_import
+
+from itertools import count
+
+from ansible.module_utils.six import StringIO
+
+
+@contextmanager
+def patch_keycloak_api(export_realm=None, get_users=None, partial_import_realm=None, get_user_memberships=None):
+    obj = keycloak_partial_import.KeycloakAPI
+    with patch.object(obj, 'export_realm', side_effect=export_realm) as mock_export_realm:
+        with patch.object(obj, 'get_users', side_effect=get_users) as mock_get_users:
+            with patch.object(obj, 'partial_import_realm', side_effect=partial_import_realm) as mock_partial_import_realm:
+                with patch.object(obj, 'get_user_memberships', side_effect=get_user_memberships):
+                    yield mock_export_realm, mock_get_users, mock_partial_import_realm
+
+
+def get_response(object_with_future_response, method, get_id_call_count):
+    if callable(object_with_future_response):
+        return object_with_future_response()
+    if isinstance(object_with_future_response, dict):
+        return get_response(
+            object_with_future_response[method], method, get_id_call_count)
+    if isinstance(object_with_future_response, list):
+        call_number = next(get_id_call_count)
+        return get_response(
+            object_with_future_response[call_number], method, get_id_call_count)
+    return object_with_future_response
+
+
+def build_mocked_request(get_id_user_count, response_dict):
+    def _mocked_requests(*args, **kwargs):
+        url = args[0]
+        method = kwargs['method']
+        future_response = response_dict.get(url, None)
+        return get_response(future_response, method, get_id_user_count)
+    return _mocked_requests
+
+
+def create_wrapper(text_as_string):
+    """Allow to mock many times a call to one address.
+    Without this function, the StringIO is empty for the second call.
+    """
+    def _create_wrapper():
+        return StringIO(text_as_string)
+    return _create_wrapper
+
+
+def mock_good_connection():
+    token_response = {
+        'http://keycloak.url/auth/realms/master/protocol/openid-connect/token': create_wrapper('{"access_token": "alongtoken"}'), }
+    return patch(
+        'ansible_collections.community.general.plugins.module_utils.identity.keycloak.keycloak.open_url',
+        side_effect=build_mocked_request(count(), token_response),
+        autospec=True
+    )
+
+
+class TestKeycloakPartialImport(ModuleTestCase):
+    def setUp(self):
+        super(TestKeycloakPartialImport, self).setUp()
+        self.module = keycloak_partial_import
+
+    module_args = {
+        'auth_keycloak_url': 'http://keycloak.url/auth',
+        'auth_password': 'admin',
+        'auth_realm': 'master',
+        'auth_username': 'admin',
+        'auth_client_id': 'admin-cli',
+        'validate_certs': True,
+        'realm': 'realm-name',
+        'clients': [
+            {'clientId': 'existing-client', 'redirectUris': ['https://app.example.com/*']},
+            {'clientId': 'new-client'},
+        ],
+        'realm_roles': [
+            {'name': 'reader'},
+            {'name': 'writer', 'description': 'New description'},
+        ],
+        'client_roles': {
+            'new-client': [{'name': 'admin'}],
+        },
+        'users': [
+            {'username': 'Alice', 'enabled': True, 'credentials': [{'type': 'password', 'value': 'secret'}]},
+        ],
+    }
+
+    export = {
+        'clients': [
+            {'id': 'c1', 'clientId': 'existing-client', 'redirectUris': ['https://app.example.com/*'], 'secret': '**********'},
+        ],
+        'roles': {
+            'realm': [
+                {'id': 'r1', 'name': 'reader', 'composite': False},
+                {'id': 'r2', 'name': 'writer', 'description': 'Old description', 'composite': False},
+            ],
+            'client': {},
+        },
+        'groups': [],
+    }
+
+    def run_module(self, module_args, import_response=None):
+        with set_module_args(module_args):
+            with mock_good_connection():
+                with patch_keycloak_api(export_realm=[self.export], get_users=[[]],
+                                        partial_import_realm=[import_response]) as mocks:
+                    with self.assertRaises(AnsibleExitJson) as exec_info:
+                        self.module.main()
+        return exec_info.exception.args[0], mocks
+
+    def test_skip_existing(self):
+        """Only the missing objects are imported"""
+        import_response = {
+            'added': 3, 'overwritten': 0, 'skipped': 0,
+            'results': [
+                {'action': 'ADDED', 'resourceType': 'CLIENT', 'resourceName': 'new-client', 'id': 'c2'},
+                {'action': 'ADDED', 'resourceType': 'CLIENT_ROLE', 'resourceName': 'admin', 'id': 'r3'},
+                {'action': 'ADDED', 'resourceType': 'USER', 'resourceName': 'alice', 'id': 'u1'},
+            ],
+        }
+        result, (mock_export_realm, mock_get_users, mock_partial_import_realm) = self.run_module(self.module_args, import_response)
+
+        self.assertTrue(result['changed'])
+        self.assertEqual(mock_export_realm.call_count, 1)
+        self.assertEqual(mock_get_users.call_count, 1)
+        self.assertEqual(mock_partial_import_realm.call_count, 1)
+        import_rep = mock_partial_import_realm.call_args[0][0]
+        self.assertEqual(import_rep, {
+            'clients': [{'clientId': 'new-client'}],
+            'roles': {'client': {'new-client': [{'name': 'admin'}]}},
+            'users': [{'username': 'alice', 'enabled': True, 'credentials': [{'type': 'password', 'value': 'secret'}]}],
+            'ifResourceExists': 'SKIP',
+        })
+        self.assertEqual([(r['resource_name'], r['action'], r['changed'], r.get('id')) for r in result['results']], [
+            ('existing-client', 'UNCHANGED', False, 'c1'),
+            ('new-client', 'ADDED', True, 'c2'),
+            ('reader', 'UNCHANGED', False, 'r1'),
+            ('writer', 'SKIPPED', False, 'r2'),
+            ('admin', 'ADDED', True, 'r3'),
+            ('alice', 'ADDED', True, 'u1'),
+        ])
+
+    def test_overwrite_check_mode(self):
+        """Differing objects are overwritten with their IDs kept, nothing is imported in check mode"""
+        module_args = dict(self.module_args, if_resource_exists='overwrite', _ansible_check_mode=True, _ansible_diff=True,
+                           clients=[{'clientId': 'existing-client', 'redirectUris': ['https://other.example.com/*']}], users=[], client_roles={})
+        result, (mock_export_realm, mock_get_users, mock_partial_import_realm) = self.run_module(module_args)
+
+        self.assertTrue(result['changed'])
+        self.assertEqual(mock_get_users.call_count, 0)
+        self.assertEqual(mock_partial_import_realm.call_count, 0)
+        self.assertEqual([(r['resource_name'], r['action']) for r in result['results']], [
+            ('existing-client', 'OVERWRITTEN'), ('reader', 'UNCHANGED'), ('writer', 'OVERWRITTEN'),
+        ])
+        self.assertEqual(result['results'][0]['diff']['after'], {'id': 'c1', 'clientId': 'existing-client', 'redirectUris': ['https://other.example.com/*']})
+        self.assertEqual(result['results'][2]['diff']['after']['description'], 'New description')
+        self.assertEqual(len(result['diff']), 2)
+
+    def test_user_memberships_idempotent(self):
+        """A user given with groups and roles is unchanged on the second run"""
+        user = {'username': 'bob', 'enabled': True, 'groups': ['editors'], 'realmRoles': ['writer'],
+                'clientRoles': {'my-app': ['admin']}}
+        module_args = dict(self.module_args, if_resource_exists='overwrite', clients=[], realm_roles=[], client_roles={}, users=[user])
+        memberships = {'groups': ['/editors', '/readers'], 'realmRoles': ['default-roles-realm-name', 'writer'],
+                       'clientRoles': {'my-app': ['admin']}}
+
+        # The first run adds the user
+        import_response = {'results': [{'action': 'ADDED', 'resourceType': 'USER', 'resourceName': 'bob', 'id': 'u2'}]}
+        result, (mock_export_realm, mock_get_users, mock_partial_import_realm) = self.run_module(module_args, import_response)
+        self.assertTrue(result['changed'])
+        self.assertEqual(mock_partial_import_realm.call_args[0][0]['users'], [user])
+
+        # The second run finds the user with its memberships and does not recreate it
+        with set_module_args(module_args):
+            with mock_good_connection():
+                with patch_keycloak_api(export_realm=[self.export], get_users=[[{'id': 'u2', 'username': 'bob', 'enabled': True}]],
+                                        get_user_memberships=[memberships]) \
+                        as (mock_export_realm, mock_get_users, mock_partial_import_realm):
+                    with self.assertRaises(AnsibleExitJson) as exec_info:
+                        self.module.main()
+
+        result = exec_info.exception.args[0]
+        self.assertFalse(result['changed'])
+        self.assertEqual(mock_partial_import_realm.call_count, 0)
+        self.assertEqual([(r['resource_name'], r['action']) for r in result['results']], [('bob', 'UNCHANGED')])
+
+    def test_fail_existing(self):
+        """Differing objects make the module fail with if_resource_exists=fail"""
+        module_args = dict(self.module_args, if_resource_exists='fail')
+        with set_module_args(module_args):
+            with mock_good_connection():
+                with patch_keycloak_api(export_realm=[self.export], get_users=[[]]) \
+                        as (mock_export_realm, mock_get_users, mock_partial_import_realm):
+                    with self.assertRaises(AnsibleFailJson) as exec_info:
+                        self.module.main()
+
+        self.assertEqual(mock_partial_import_realm.call_count, 0)
+        self.assertIn('REALM_ROLE writer', exec_info.exception.args[0]['msg'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import gzip
+import itertools
+import threading
+
+import pytest
+
+from ansible_collections.community.general.plugins.plugin_utils import event_sender
+from ansible_collections.community.general.plugins.plugin_utils.event_sender import BatchEventSender, gzip_body
+
+
+def test_batches_by_size_and_group():
+    posted = []
+    sender = BatchEventSender(lambda group, events: posted.append((group, list(events))), batch_size=2, flush_interval=60)
+    for event in ('a', 'b', 'c'):
+        assert sender.submit(event, group='host1')
+    sender.submit('d', group='host2')
+    sender.close()
+
+    assert posted == [('host1', ['a', 'b']), ('host1', ['c']), ('host2', ['d'])]
+    assert sender.sent == 4
+    assert sender.dropped == 0
+
+
+def test_flush_interval():
+    posted = []
+    sender = BatchEventSender(lambda group, events: posted.append(list(events)), batch_size=100, flush_interval=0)
+    sender.submit('a')
+    sender.submit('b')
+    sender.close()
+
+    assert sum(posted, []) == ['a', 'b']
+    assert sender.sent == 2
+
+
+def test_flush_interval_under_sustained_load(monkeypatch):
+    posted = []
+    clock = itertools.count()
+    monkeypatch.setattr(event_sender.time, 'monotonic', lambda: next(clock))
+    sender = BatchEventSender(lambda group, events: posted.append(list(events)), batch_size=1000, flush_interval=5)
+    # the queue never runs empty before the end of the run
+    for i in range(20):
+        sender._queue.put(('host1', i))
+    sender._queue.put(event_sender._STOP)
+    sender._run()
+
+    assert len(posted) > 1
+    assert sum(posted, []) == list(range(20))
+
+
+def test_queue_size_must_be_positive():
+    with pytest.raises(ValueError, match='queue_size must be at least 1'):
+        BatchEventSender(lambda group, events: None, queue_size=0)
+
+
+def test_retry_and_drop():
+    calls = []
+
+    def post(group, events):
+        calls.append(events)
+        raise ValueError('collector unavailable')
+
+    sender = BatchEventSender(post, batch_size=1, retries=2, retry_delay=0)
+    sender.submit('a')
+    sender.close()
+
+    assert len(calls) == 3
+    assert sender.sent == 0
+    assert sender.dropped == 1
+    assert str(sender.last_error) == 'collector unavailable'
+    assert sender.drop_summary() == 'dropped 1 events: 1 because sending them failed (last error: collector unavailable)'
+
+
+def test_close_timeout_stops_retrying():
+    calls = []
+
+    def post(group, events):
+        calls.append(events)
+        raise ValueError('collector unavailable')
+
+    sender = BatchEventSender(post, batch_size=1, retries=5, retry_delay=60)
+    sender.submit('a')
+    sender.close(timeout=0.1)
+
+    assert len(calls) <= 2
+    assert sender.sent == 0
+    assert sender.dropped == 1
+
+
+def test_close_timeout_counts_unsent_events():
+    release = threading.Event()
+    sender = BatchEventSender(lambda group, events: release.wait(), batch_size=1)
+    for event in ('a', 'b', 'c'):
+        sender.submit(event)
+    sender.close(timeout=0.1)
+
+    assert sender.sent == 0
+    assert sender.unsent == 3
+    assert sender.drop_summary() == 'dropped 3 events: 3 because they were not sent before the close timeout'
+    # the thread left behind does not count the events again
+    release.set()
+    assert sender.dropped == 3
+
+
+def test_queue_full():
+    sender = BatchEventSender(lambda group, events: None, queue_size=1)
+    # the background thread is not started before the first event is queued
+    sender._thread = object()
+    assert sender.submit('a')
+    assert not sender.submit('b')
+    assert sender.dropped == 1
+    assert sender.drop_summary() == 'dropped 1 events: 1 because the queue was full'
+
+
+def test_gzip_body():
+    body, headers = gzip_body(u'{"event": "a"}')
+    assert gzip.decompress(body) == b'{"event": "a"}'
+    assert headers == {'Content-Encoding': 'gzip'}
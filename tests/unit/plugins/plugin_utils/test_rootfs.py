@@ -0,0 +1,97 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import stat
+
+import pytest
+
+from ansible.errors import AnsibleError
+
+from ansible_collections.community.general.plugins.plugin_utils import rootfs
+
+
+@pytest.fixture
+def root(tmp_path):
+    root = tmp_path / 'root'
+    (root / 'etc').mkdir(parents=True)
+    (root / 'tmp').mkdir()
+    (root / 'etc' / 'passwd').write_text(u'root:x:0:0::/root:/bin/sh\nansible:x:1000:1001::/home/ansible:/bin/sh\n')
+    # links leading outside of the root on the host, but not in the chroot
+    os.symlink('/etc', str(root / 'abs'))
+    os.symlink('../../..', str(root / 'tmp' / 'up'))
+    os.symlink('/etc/passwd', str(root / 'tmp' / 'passwd'))
+    os.symlink('loop2', str(root / 'loop1'))
+    os.symlink('loop1', str(root / 'loop2'))
+    return str(root)
+
+
+@pytest.fixture
+def payload(tmp_path):
+    path = tmp_path / 'payload'
+    path.write_bytes(b'x' * 100000)
+    return str(path)
+
+
+def test_put_and_fetch(root, payload, tmp_path):
+    rootfs.put_file_in_root(root, payload, '/tmp/payload')
+    with open(os.path.join(root, 'tmp', 'payload'), 'rb') as f:
+        assert f.read() == b'x' * 100000
+
+    out = str(tmp_path / 'fetched')
+    rootfs.fetch_file_from_root(root, '/tmp/payload', out)
+    with open(out, 'rb') as f:
+        assert f.read() == b'x' * 100000
+
+
+def test_put_existing_file_keeps_mode(root, payload):
+    target = os.path.join(root, 'tmp', 'existing')
+    with open(target, 'wb') as f:
+        f.write(b'y' * 200000)
+    os.chmod(target, 0o640)
+
+    rootfs.put_file_in_root(root, payload, '/tmp/existing')
+    assert os.path.getsize(target) == 100000
+    assert stat.S_IMODE(os.stat(target).st_mode) == 0o640
+
+
+@pytest.mark.parametrize('path', ['/abs/passwd', '/tmp/up/etc/passwd', '/../../etc/passwd', '/tmp/passwd'])
+def test_symlinks_stay_in_root(root, tmp_path, path):
+    out = str(tmp_path / 'fetched')
+    rootfs.fetch_file_from_root(root, path, out)
+    with open(out, 'rb') as f:
+        assert f.read().startswith(b'root:x:0:0::/root:/bin/sh\nansible:')
+
+
+def test_symlink_loop(root, payload):
+    with pytest.raises(AnsibleError, match='failed to transfer file'):
+        rootfs.put_file_in_root(root, payload, '/loop1')
+
+
+def test_put_through_symlink_writes_in_root(root, payload):
+    rootfs.put_file_in_root(root, payload, '/abs/new')
+    assert os.path.getsize(os.path.join(root, 'etc', 'new')) == 100000
+
+
+def test_owner(root, payload, mocker):
+    assert rootfs.read_owner(root, 'ansible') == (1000, 1001)
+    with pytest.raises(AnsibleError, match='user missing not found'):
+        rootfs.read_owner(root, 'missing')
+
+    fchown = mocker.patch('os.fchown')
+    rootfs.put_file_in_root(root, payload, '/tmp/owned', owner=(1000, 1001))
+    assert fchown.call_args[0][1:] == (1000, 1001)
+    # existing files keep their owner
+    rootfs.put_file_in_root(root, payload, '/tmp/owned', owner=(1000, 1001))
+    assert fchown.call_count == 1
+
+
+def test_copy_fallback(root, payload, mocker):
+    mocker.patch.object(rootfs.os, 'copy_file_range', side_effect=OSError(18, 'EXDEV'), create=True)
+    mocker.patch.object(rootfs.os, 'sendfile', side_effect=OSError(22, 'EINVAL'), create=True)
+    rootfs.put_file_in_root(root, payload, '/tmp/payload')
+    assert os.path.getsize(os.path.join(root, 'tmp', 'payload')) == 100000
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from ansible.errors import AnsibleError
+
+from ansible_collections.community.general.tests.unit.compat import unittest
+from ansible_collections.community.general.tests.unit.compat.mock import MagicMock, patch
+from ansible_collections.community.general.plugins.plugin_utils import secret_cache
+from ansible_collections.community.general.plugins.plugin_utils.secret_cache import SecretCache
+
+pytest.importorskip('cryptography')
+
+
+class TestSecretCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_memory(self):
+        cache = SecretCache('test', mode='memory', ttl=60)
+        cache.invalidate()
+        self.assertIsNone(cache.get(['a']))
+        cache.set(['a'], {'password': 'secret'})
+        self.assertEqual(SecretCache('test', mode='memory').get(['a']), {'password': 'secret'})
+        self.assertIsNone(SecretCache('other', mode='memory').get(['a']))
+        cache.invalidate(['a'])
+        self.assertIsNone(cache.get(['a']))
+
+    def test_memory_ttl(self):
+        cache = SecretCache('test', mode='memory', ttl=-1)
+        cache.set(['a'], 'secret')
+        self.assertIsNone(cache.get(['a']))
+
+    def test_file(self):
+        cache = SecretCache('test', mode='file', ttl=60, directory=self.tmpdir)
+        cache.set(['a'], 'secret')
+
+        # a second cache of the same run can read the value
+        self.assertEqual(SecretCache('test', mode='file', ttl=60, directory=self.tmpdir).get(['a']), 'secret')
+
+        run_dirs = os.listdir(self.tmpdir)
+        self.assertEqual(len(run_dirs), 1)
+        files = [os.path.join(self.tmpdir, run_dirs[0], name) for name in os.listdir(os.path.join(self.tmpdir, run_dirs[0]))]
+        # only the value is stored, the key is not
+        self.assertEqual(len(files), 1)
+        self.assertEqual(os.lstat(os.path.dirname(files[0])).st_mode & 0o777, 0o700)
+        for path in files:
+            self.assertEqual(os.stat(path).st_mode & 0o777, 0o600)
+            with open(path, 'rb') as f:
+                self.assertNotIn(b'secret', f.read())
+
+        cache.invalidate()
+        self.assertIsNone(cache.get(['a']))
+
+    def test_file_ttl(self):
+        SecretCache('test', mode='file', directory=self.tmpdir).set(['a'], 'secret')
+        self.assertIsNone(SecretCache('test', mode='file', ttl=-1, directory=self.tmpdir).get(['a']))
+
+    def test_file_remove_stale(self):
+        stale = os.path.join(self.tmpdir, f'{secret_cache.DIR_PREFIX}{os.getuid()}-999999999-1-abcdef')
+        os.mkdir(stale)
+        with patch.object(secret_cache, 'run_id', return_value='1-2'):
+            SecretCache('test', mode='file', directory=self.tmpdir)
+        self.assertFalse(os.path.exists(stale))
+
+    @staticmethod
+    def _other_run():
+        return patch.object(secret_cache.multiprocessing, 'current_process', return_value=MagicMock(authkey=os.urandom(32)))
+
+    def test_file_other_run_cannot_read(self):
+        SecretCache('test', mode='file', ttl=60, directory=self.tmpdir).set(['a'], 'secret')
+        with self._other_run():
+            other = SecretCache('test', mode='file', ttl=60, directory=self.tmpdir)
+        self.assertIsNone(other.get(['a']))
+
+    def test_file_directory_name_not_predictable(self):
+        SecretCache('test', mode='file', directory=self.tmpdir)
+        with self._other_run():
+            SecretCache('test', mode='file', directory=self.tmpdir)
+        self.assertEqual(len(os.listdir(self.tmpdir)), 2)
+
+    def _run_dir(self):
+        with patch.object(secret_cache.SecretCache, '_open_directory'):
+            return SecretCache('test', mode='file', directory=self.tmpdir)._path
+
+    def test_file_refuses_symlink(self):
+        target = os.path.join(self.tmpdir, 'target')
+        os.mkdir(target, 0o700)
+        os.symlink(target, self._run_dir())
+        self.assertRaises(AnsibleError, SecretCache, 'test', mode='file', directory=self.tmpdir)
+
+    def test_file_refuses_open_directory(self):
+        path = self._run_dir()
+        os.mkdir(path)
+        os.chmod(path, 0o777)
+        self.assertRaises(AnsibleError, SecretCache, 'test', mode='file', directory=self.tmpdir)
+
+    def test_file_refuses_directory_of_other_user(self):
+        path = self._run_dir()
+        os.mkdir(path, 0o700)
+        with patch.object(secret_cache.os, 'getuid', return_value=os.getuid() + 1):
+            self.assertRaises(AnsibleError, SecretCache, 'test', mode='file', directory=self.tmpdir)